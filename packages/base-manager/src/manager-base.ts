@@ -24,6 +24,7 @@ import {
   reject,
   uuid,
   PROTOCOL_VERSION,
+  PROTOCOL_CAPABILITIES,
   IWidgetManager,
   IModelOptions,
   IWidgetOptions,
@@ -44,7 +45,7 @@ export const CONTROL_COMM_TARGET = 'jupyter.widget.control';
 /**
  * The supported version for the control comm channel.
  */
-export const CONTROL_COMM_PROTOCOL_VERSION = '1.0.0';
+export const CONTROL_COMM_PROTOCOL_VERSION = '1.1.0';
 
 /**
  * Time (in ms) after which we consider the control comm target not responding.
@@ -260,6 +261,38 @@ export abstract class ManagerBase implements IWidgetManager {
     ).catch(reject('Could not create a model.', true));
   }
 
+  /**
+   * Handle when the kernel opens a control comm.
+   *
+   * #### Notes
+   * The kernel opens a control comm to request the protocol capabilities of
+   * the frontends, e.g. when the widgets library is imported after this
+   * frontend connected. The comm is kept open until the kernel closes it.
+   */
+  handle_control_comm_open(
+    comm: IClassicComm,
+    msg: services.KernelMessage.ICommOpenMsg
+  ): void {
+    const protocolVersion = ((msg.metadata || {})['version'] as string) || '';
+    if (
+      protocolVersion.split('.', 1)[0] !==
+      CONTROL_COMM_PROTOCOL_VERSION.split('.', 1)[0]
+    ) {
+      console.error(
+        `Wrong control protocol version: received protocol version '${protocolVersion}', but was expecting version '${CONTROL_COMM_PROTOCOL_VERSION}'`
+      );
+      comm.close();
+      return;
+    }
+    const data = msg.content.data as JSONObject;
+    if (data.method === 'request_capabilities') {
+      comm.send({
+        method: 'capabilities',
+        capabilities: PROTOCOL_CAPABILITIES,
+      });
+    }
+  }
+
   /**
    * Create a comm and new widget model.
    * @param  options - same options as new_model but comm is not
@@ -388,7 +421,10 @@ export abstract class ManagerBase implements IWidgetManager {
         CONTROL_COMM_TARGET,
         uuid(),
         {},
-        { version: CONTROL_COMM_PROTOCOL_VERSION }
+        {
+          version: CONTROL_COMM_PROTOCOL_VERSION,
+          capabilities: PROTOCOL_CAPABILITIES,
+        }
       );
 
       await new Promise((resolve, reject) => {
@@ -486,7 +522,18 @@ export abstract class ManagerBase implements IWidgetManager {
             const deserializedState = await (
               model.constructor as typeof WidgetModel
             )._deserialize_state(state.state, this);
-            model!.set_state(deserializedState);
+            if (state.drop_defaults) {
+              // The kernel left out the values equal to the defaults
+              const defaults = model.defaults;
+              model!.set_state({
+                ...(typeof defaults === 'function'
+                  ? defaults.call(model)
+                  : defaults),
+                ...deserializedState,
+              });
+            } else {
+              model!.set_state(deserializedState);
+            }
           }
         } catch (error) {
           // Failed to create a widget model, we continue creating other models so that
@@ -4,3 +4,9 @@
 export const JUPYTER_WIDGETS_VERSION = '2.0.0';
 
 export const PROTOCOL_VERSION = '2.1.0';
+
+/**
+ * The optional protocol capabilities supported by this package, which are
+ * announced to the kernel when opening the control comm.
+ */
+export const PROTOCOL_CAPABILITIES = ['patch', 'drop_defaults'];
@@ -93,6 +93,132 @@ export function pack_models(
   }
 }
 
+/**
+ * A patch op replacing `remove` elements of an array at `index` by the
+ * `insert` elements, which inserts, removes or replaces elements.
+ */
+export interface ISpliceOp {
+  op: 'splice';
+  index: number;
+  remove: number;
+  insert: any[];
+}
+
+/**
+ * A patch op setting the value of an object key.
+ */
+export interface ISetOp {
+  op: 'set';
+  key: string;
+  value: any;
+}
+
+/**
+ * A patch op deleting an object key.
+ */
+export interface IDeleteOp {
+  op: 'delete';
+  key: string;
+}
+
+/**
+ * A patch op appending text to the string value of an object key.
+ */
+export interface IAppendOp {
+  op: 'append';
+  key: string;
+  value: string;
+}
+
+/**
+ * A patch op applying nested ops to the element of an array at `index`.
+ */
+export interface INestedPatchOp {
+  op: 'patch';
+  index: number;
+  ops: PatchOp[];
+}
+
+export type PatchOp =
+  | ISpliceOp
+  | ISetOp
+  | IDeleteOp
+  | IAppendOp
+  | INestedPatchOp;
+
+/**
+ * A patch of an attribute value sent by the kernel, which turns the value
+ * with the `base` version into the value with the new `version`.
+ */
+export interface IStatePatch {
+  base: number;
+  version: number;
+  ops: PatchOp[];
+}
+
+/**
+ * Apply patch ops to a deserialized attribute value, returning a new value.
+ *
+ * The deserializer of the attribute is applied to the array of inserted
+ * elements, or to an object with the set entry, so it must handle elements
+ * independently of each other, like `unpack_models` does.
+ */
+export async function apply_patch(
+  value: any,
+  ops: PatchOp[],
+  deserialize?: (value?: any, manager?: IWidgetManager) => any,
+  manager?: IWidgetManager
+): Promise<any> {
+  const decode = (serialized: any): Promise<any> =>
+    Promise.resolve(
+      deserialize ? deserialize(serialized, manager) : serialized
+    );
+  if (Array.isArray(value)) {
+    let result = value;
+    for (const op of ops) {
+      if (op.op === 'splice') {
+        const inserted = await decode(op.insert);
+        result = result
+          .slice(0, op.index)
+          .concat(inserted, result.slice(op.index + op.remove));
+      } else if (op.op === 'patch') {
+        // Only the patched element is copied, the others keep their identity
+        // so that views can tell which elements changed.
+        result = result.slice();
+        result[op.index] = await apply_patch(
+          result[op.index],
+          op.ops,
+          deserialize,
+          manager
+        );
+      } else {
+        throw new Error(`Cannot apply a ${op.op} op to an array`);
+      }
+    }
+    return result === value ? value.slice() : result;
+  } else if (value instanceof Object) {
+    const result = { ...value };
+    for (const op of ops) {
+      if (op.op === 'delete') {
+        delete result[op.key];
+      } else if (op.op === 'set') {
+        result[op.key] = (await decode({ [op.key]: op.value }))[op.key];
+      } else if (op.op === 'append') {
+        if (typeof result[op.key] !== 'string') {
+          throw new Error(`Cannot append text to the value of ${op.key}`);
+        }
+        result[op.key] += op.value;
+      } else {
+        throw new Error(`Cannot apply a ${op.op} op to an object`);
+      }
+    }
+    return result;
+  }
+  throw new Error(
+    'Cannot apply a patch to a value which is not an array or object'
+  );
+}
+
 /**
  * Type declaration for general widget serializers.
  */
@@ -154,6 +280,8 @@ export class WidgetModel extends Backbone.Model {
   ): void {
     this._expectedEchoMsgIds = new Map<string, string>();
     this._attrsToUpdate = new Set<string>();
+    this._patchVersions = new Map<string, number>();
+    this._fullStateRequested = false;
 
     super.initialize(attributes, options);
 
@@ -305,8 +433,10 @@ export class WidgetModel extends Backbone.Model {
               this.widget_manager
             );
           })
-          .then((state) => {
-            this.set_state(state);
+          .then(async (state) => {
+            const patched = await this._apply_patches(data.patches ?? {});
+            this.set_state({ ...patched, ...state });
+            this._set_patch_versions(data.versions ?? {}, state);
           })
           .catch(
             utils.reject(
@@ -322,6 +452,61 @@ export class WidgetModel extends Backbone.Model {
     return Promise.resolve();
   }
 
+  /**
+   * Apply patches sent by the kernel to the current attribute values.
+   *
+   * Returns the patched values. A patch that is not based on the version of
+   * the current value is dropped, and the full state is requested instead.
+   */
+  async _apply_patches(patches: Dict<IStatePatch>): Promise<Dict<unknown>> {
+    const serializers =
+      (this.constructor as typeof WidgetModel).serializers ||
+      JSONExt.emptyObject;
+    const patched: Dict<unknown> = {};
+    for (const key of Object.keys(patches)) {
+      const patch = patches[key];
+      if (this._patchVersions.get(key) === patch.base) {
+        try {
+          patched[key] = await apply_patch(
+            this.get(key),
+            patch.ops,
+            serializers[key]?.deserialize,
+            this.widget_manager
+          );
+          this._patchVersions.set(key, patch.version);
+          continue;
+        } catch (e) {
+          console.error(`Could not apply patch to attribute ${key}`, e);
+        }
+      }
+      this._patchVersions.delete(key);
+      this._request_full_state();
+    }
+    return patched;
+  }
+
+  /**
+   * Remember the versions of the patchable values that were set in full.
+   */
+  _set_patch_versions(versions: Dict<number>, state: Dict<unknown>): void {
+    for (const key of Object.keys(versions)) {
+      if (Object.prototype.hasOwnProperty.call(state, key)) {
+        this._patchVersions.set(key, versions[key]);
+        this._fullStateRequested = false;
+      }
+    }
+  }
+
+  /**
+   * Request the full state from the kernel, unless it is already requested.
+   */
+  _request_full_state(): void {
+    if (this.comm !== undefined && !this._fullStateRequested) {
+      this._fullStateRequested = true;
+      this.comm.send({ method: 'request_state' }, this.callbacks());
+    }
+  }
+
   /**
    * Handle when a widget is updated from the backend.
    *
@@ -503,6 +688,8 @@ export class WidgetModel extends Backbone.Model {
 
     Object.keys(attrs).forEach((attrName: string) => {
       this._attrsToUpdate.add(attrName);
+      // The kernel can't patch our value until it echoes it with a version.
+      this._patchVersions.delete(attrName);
     });
 
     const msgState = this.serialize(attrs);
@@ -739,6 +926,9 @@ export class WidgetModel extends Backbone.Model {
   private _expectedEchoMsgIds: Map<string, string>;
   // because we don't know the attrs in _handle_status, we keep track of what we will send
   private _attrsToUpdate: Set<string>;
+  // the version of the values the kernel may send patches against
+  private _patchVersions: Map<string, number>;
+  private _fullStateRequested: boolean;
 }
 
 export class DOMWidgetModel extends WidgetModel {
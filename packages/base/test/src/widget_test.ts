@@ -485,6 +485,157 @@ describe('WidgetModel', function () {
 
       expect(this.widget.get('a')).to.equal('other client update 2');
     });
+
+    it('applies patches to the versioned value', async function () {
+      await this.widget._handle_comm_msg({
+        content: {
+          data: {
+            method: 'update',
+            state: { a: [1, 2, 3], b: { x: 1, y: 2 } },
+            versions: { a: 1, b: 1 },
+          },
+        },
+      });
+      await this.widget._handle_comm_msg({
+        content: {
+          data: {
+            method: 'update',
+            state: {},
+            patches: {
+              a: {
+                base: 1,
+                version: 2,
+                ops: [{ op: 'splice', index: 1, remove: 1, insert: [4, 5] }],
+              },
+              b: {
+                base: 1,
+                version: 2,
+                ops: [
+                  { op: 'delete', key: 'x' },
+                  { op: 'set', key: 'z', value: 3 },
+                ],
+              },
+            },
+          },
+        },
+      });
+      expect(this.widget.get('a')).to.deep.equal([1, 4, 5, 3]);
+      expect(this.widget.get('b')).to.deep.equal({ y: 2, z: 3 });
+      expect(this.comm.send).to.not.be.called;
+    });
+
+    it('appends text to nested elements', async function () {
+      await this.widget._handle_comm_msg({
+        content: {
+          data: {
+            method: 'update',
+            state: {
+              a: [
+                { name: 'stdout', text: 'a' },
+                { name: 'stderr', text: 'b' },
+              ],
+            },
+            versions: { a: 1 },
+          },
+        },
+      });
+      const outputs = this.widget.get('a');
+      await this.widget._handle_comm_msg({
+        content: {
+          data: {
+            method: 'update',
+            state: {},
+            patches: {
+              a: {
+                base: 1,
+                version: 2,
+                ops: [
+                  {
+                    op: 'patch',
+                    index: 1,
+                    ops: [{ op: 'append', key: 'text', value: 'c' }],
+                  },
+                ],
+              },
+            },
+          },
+        },
+      });
+      const patched = this.widget.get('a');
+      expect(patched).to.deep.equal([
+        { name: 'stdout', text: 'a' },
+        { name: 'stderr', text: 'bc' },
+      ]);
+      expect(patched[0]).to.equal(outputs[0]);
+      expect(outputs[1].text).to.equal('b');
+    });
+
+    it('deserializes inserted values', async function () {
+      this.widget.constructor.serializers.doubled = {
+        deserialize: (value: number[], manager: any): number[] => {
+          return value.map((x) => x * 2);
+        },
+      };
+      await this.widget._handle_comm_msg({
+        content: {
+          data: {
+            method: 'update',
+            state: { doubled: [1] },
+            versions: { doubled: 1 },
+          },
+        },
+      });
+      await this.widget._handle_comm_msg({
+        content: {
+          data: {
+            method: 'update',
+            state: {},
+            patches: {
+              doubled: {
+                base: 1,
+                version: 2,
+                ops: [{ op: 'splice', index: 1, remove: 0, insert: [2, 3] }],
+              },
+            },
+          },
+        },
+      });
+      expect(this.widget.get('doubled')).to.deep.equal([2, 4, 6]);
+    });
+
+    it('requests the full state when a patch is not based on its value', async function () {
+      await this.widget._handle_comm_msg({
+        content: {
+          data: {
+            method: 'update',
+            state: { a: [1, 2, 3] },
+            versions: { a: 1 },
+          },
+        },
+      });
+      const patch = {
+        content: {
+          data: {
+            method: 'update',
+            state: {},
+            patches: {
+              a: {
+                base: 2,
+                version: 3,
+                ops: [{ op: 'splice', index: 0, remove: 1, insert: [] }],
+              },
+            },
+          },
+        },
+      };
+      await this.widget._handle_comm_msg(patch);
+      await this.widget._handle_comm_msg(patch);
+      expect(this.widget.get('a')).to.deep.equal([1, 2, 3]);
+      expect(this.comm.send).to.be.calledOnce;
+      expect(this.comm.send.args[0][0]).to.deep.equal({
+        method: 'request_state',
+      });
+    });
   });
 
   describe('_deserialize_state', function () {
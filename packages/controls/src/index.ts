@@ -4,6 +4,7 @@
 export * from './utils';
 export * from './version';
 export * from './widget_link';
+export * from './widget_precomputed';
 export * from './widget_bool';
 export * from './widget_button';
 export * from './widget_box';
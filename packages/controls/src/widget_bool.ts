@@ -38,37 +38,37 @@ export class ToggleButtonStyleModel extends DescriptionStyleModel {
     font_family: {
       selector: '',
       attribute: 'font-family',
-      default: '',
+      default: null as any,
     },
     font_size: {
       selector: '',
       attribute: 'font-size',
-      default: '',
+      default: null as any,
     },
     font_style: {
       selector: '',
       attribute: 'font-style',
-      default: '',
+      default: null as any,
     },
     font_variant: {
       selector: '',
       attribute: 'font-variant',
-      default: '',
+      default: null as any,
     },
     font_weight: {
       selector: '',
       attribute: 'font-weight',
-      default: '',
+      default: null as any,
     },
     text_color: {
       selector: '',
       attribute: 'color',
-      default: '',
+      default: null as any,
     },
     text_decoration: {
       selector: '',
       attribute: 'text-decoration',
-      default: '',
+      default: null as any,
     },
   };
 }
@@ -88,6 +88,8 @@ export class CheckboxModel extends CoreDescriptionModel {
   defaults(): Backbone.ObjectHash {
     return {
       ...super.defaults(),
+      value: false,
+      disabled: false,
       indent: true,
       style: null,
       _view_name: 'CheckboxView',
@@ -247,7 +249,7 @@ export class ToggleButtonModel extends BoolModel {
       ...super.defaults(),
       _view_name: 'ToggleButtonView',
       _model_name: 'ToggleButtonModel',
-      tooltip: '',
+      tooltip: null,
       icon: '',
       button_style: '',
       style: null,
@@ -294,7 +296,12 @@ export class ToggleButtonView extends DOMWidgetView {
     if (options === undefined || options.updated_view !== this) {
       this.el.disabled = this.model.get('disabled');
       this.el.setAttribute('tabbable', this.model.get('tabbable'));
-      this.el.setAttribute('title', this.model.get('tooltip'));
+      const tooltip = this.model.get('tooltip');
+      if (tooltip) {
+        this.el.setAttribute('title', tooltip);
+      } else {
+        this.el.removeAttribute('title');
+      }
 
       const description = this.model.get('description');
       const icon = this.model.get('icon');
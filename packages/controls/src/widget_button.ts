@@ -26,37 +26,37 @@ export class ButtonStyleModel extends StyleModel {
     font_family: {
       selector: '',
       attribute: 'font-family',
-      default: '',
+      default: null as any,
     },
     font_size: {
       selector: '',
       attribute: 'font-size',
-      default: '',
+      default: null as any,
     },
     font_style: {
       selector: '',
       attribute: 'font-style',
-      default: '',
+      default: null as any,
     },
     font_variant: {
       selector: '',
       attribute: 'font-variant',
-      default: '',
+      default: null as any,
     },
     font_weight: {
       selector: '',
       attribute: 'font-weight',
-      default: '',
+      default: null as any,
     },
     text_color: {
       selector: '',
       attribute: 'color',
-      default: '',
+      default: null as any,
     },
     text_decoration: {
       selector: '',
       attribute: 'text-decoration',
-      default: '',
+      default: null as any,
     },
   };
 }
@@ -66,7 +66,7 @@ export class ButtonModel extends CoreDOMWidgetModel {
     return {
       ...super.defaults(),
       description: '',
-      tooltip: '',
+      tooltip: null,
       disabled: false,
       icon: '',
       button_style: '',
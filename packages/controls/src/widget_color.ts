@@ -163,6 +163,7 @@ export class ColorPickerModel extends CoreDescriptionModel {
       ...super.defaults(),
       value: 'black',
       concise: false,
+      disabled: false,
       _model_name: 'ColorPickerModel',
       _view_name: 'ColorPickerView',
     };
@@ -60,6 +60,9 @@ export class DatePickerModel extends CoreDescriptionModel {
     return {
       ...super.defaults(),
       value: null,
+      disabled: false,
+      min: null,
+      max: null,
       _model_name: 'DatePickerModel',
       _view_name: 'DatePickerView',
     };
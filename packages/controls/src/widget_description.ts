@@ -25,7 +25,7 @@ export class DescriptionStyleModel extends StyleModel {
     description_width: {
       selector: '.widget-label',
       attribute: 'width',
-      default: null as any,
+      default: '',
     },
   };
 }
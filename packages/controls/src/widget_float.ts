@@ -41,7 +41,7 @@ export class FloatSliderModel extends BoundedFloatModel {
       ...super.defaults(),
       _model_name: 'FloatSliderModel',
       _view_name: 'FloatSliderView',
-      step: 1.0,
+      step: 0.1,
       orientation: 'horizontal',
       _range: false,
       readout: true,
@@ -49,6 +49,7 @@ export class FloatSliderModel extends BoundedFloatModel {
       slider_color: null,
       continuous_update: true,
       disabled: false,
+      behavior: 'drag-tap',
     };
   }
   initialize(
@@ -81,6 +82,7 @@ export class FloatLogSliderModel extends BoundedFloatModel {
       slider_color: null,
       continuous_update: true,
       disabled: false,
+      behavior: 'drag-tap',
       base: 10,
       value: 1.0,
       min: 0,
@@ -318,6 +320,7 @@ export class FloatTextModel extends FloatModel {
       _view_name: 'FloatTextView',
       disabled: false,
       continuous_update: false,
+      step: null,
     };
   }
 }
@@ -330,7 +333,7 @@ export class BoundedFloatTextModel extends BoundedFloatModel {
       _view_name: 'FloatTextView',
       disabled: false,
       continuous_update: false,
-      step: 0.1,
+      step: null,
     };
   }
 }
@@ -18,6 +18,37 @@ export class ImageModel extends CoreDOMWidgetModel {
     };
   }
 
+  initialize(attributes: any, options: any): void {
+    super.initialize(attributes, options);
+    this._frame = null;
+    this.on('msg:custom', this._handle_frame_msg, this);
+    this.on('change:value', () => {
+      this._frame = null;
+    });
+  }
+
+  /**
+   * The last frame pushed by the kernel, shown instead of the value.
+   */
+  get frame(): ArrayBuffer | ArrayBufferView | null {
+    return this._frame;
+  }
+
+  private _handle_frame_msg(
+    content: any,
+    buffers: (ArrayBuffer | ArrayBufferView)[]
+  ): void {
+    if (content.event === 'frame') {
+      this._frame = buffers[0];
+      this.trigger('frame');
+      // Acknowledge the frame once it is painted, so that the kernel drops
+      // frames when the browser can't keep up (or the page is hidden).
+      requestAnimationFrame(() => {
+        this.send({ event: 'frame_ack', id: content.id });
+      });
+    }
+  }
+
   static serializers = {
     ...CoreDOMWidgetModel.serializers,
     value: {
@@ -26,6 +57,8 @@ export class ImageModel extends CoreDOMWidgetModel {
       },
     },
   };
+
+  private _frame: ArrayBuffer | ArrayBufferView | null;
 }
 
 export class ImageView extends DOMWidgetView {
@@ -36,6 +69,7 @@ export class ImageView extends DOMWidgetView {
     super.render();
     this.luminoWidget.addClass('jupyter-widgets');
     this.luminoWidget.addClass('widget-image');
+    this.listenTo(this.model, 'frame', this._updateSource);
     this.update(); // Set defaults.
   }
 
@@ -47,9 +81,31 @@ export class ImageView extends DOMWidgetView {
      * changed by another view or by a state update from the back-end.
      */
 
+    this._updateSource();
+
+    const width = this.model.get('width');
+    if (width !== undefined && width.length > 0) {
+      this.el.setAttribute('width', width);
+    } else {
+      this.el.removeAttribute('width');
+    }
+
+    const height = this.model.get('height');
+    if (height !== undefined && height.length > 0) {
+      this.el.setAttribute('height', height);
+    } else {
+      this.el.removeAttribute('height');
+    }
+    return super.update();
+  }
+
+  /**
+   * Show the last pushed frame, or the value.
+   */
+  _updateSource(): void {
     let url;
     const format = this.model.get('format');
-    const value = this.model.get('value');
+    const value = this.model.frame ?? this.model.get('value');
     if (format !== 'url') {
       const blob = new Blob([value], {
         type: `image/${this.model.get('format')}`,
@@ -65,21 +121,6 @@ export class ImageView extends DOMWidgetView {
     if (oldurl) {
       URL.revokeObjectURL(oldurl);
     }
-
-    const width = this.model.get('width');
-    if (width !== undefined && width.length > 0) {
-      this.el.setAttribute('width', width);
-    } else {
-      this.el.removeAttribute('width');
-    }
-
-    const height = this.model.get('height');
-    if (height !== undefined && height.length > 0) {
-      this.el.setAttribute('height', height);
-    } else {
-      this.el.removeAttribute('height');
-    }
-    return super.update();
   }
 
   remove(): void {
@@ -95,4 +136,161 @@ export class ImageView extends DOMWidgetView {
   }
 
   el: HTMLImageElement;
+  model: ImageModel;
+}
+
+/**
+ * A rectangle of pixels: x, y, width and height.
+ */
+type Rect = [number, number, number, number];
+
+export class TiledImageModel extends CoreDOMWidgetModel {
+  defaults(): Backbone.ObjectHash {
+    return {
+      ...super.defaults(),
+      _model_name: 'TiledImageModel',
+      _view_name: 'TiledImageView',
+      width: '',
+      height: '',
+      shape: [0, 0],
+    };
+  }
+
+  initialize(attributes: any, options: any): void {
+    super.initialize(attributes, options);
+    this._canvas = document.createElement('canvas');
+    this._drawing = Promise.resolve();
+    this.on('msg:custom', this._handle_tiles_msg, this);
+    // Get all the tiles of the current image
+    this.send({ event: 'request_tiles' });
+  }
+
+  /**
+   * The canvas holding the whole image, which views copy.
+   */
+  get canvas(): HTMLCanvasElement {
+    return this._canvas;
+  }
+
+  private _handle_tiles_msg(
+    content: any,
+    buffers: (ArrayBuffer | ArrayBufferView)[]
+  ): void {
+    if (content.event === 'tiles') {
+      // Decoding tiles is asynchronous, draw the messages in order
+      this._drawing = this._drawing
+        .then(() => this._drawTiles(content, buffers))
+        .catch((e) => console.error('Could not draw image tiles', e));
+    }
+  }
+
+  private async _drawTiles(
+    content: any,
+    buffers: (ArrayBuffer | ArrayBufferView)[]
+  ): Promise<void> {
+    const [height, width] = content.shape;
+    if (this._canvas.width !== width || this._canvas.height !== height) {
+      this._canvas.width = width;
+      this._canvas.height = height;
+    }
+    const context = this._canvas.getContext('2d')!;
+    const tiles: Rect[] = content.tiles;
+    for (let i = 0; i < tiles.length; i++) {
+      const [x, y, w, h] = tiles[i];
+      if (content.encoding === 'raw') {
+        context.putImageData(
+          toImageData(buffers[i], w, h, content.channels),
+          x,
+          y
+        );
+      } else {
+        const blob = new Blob([buffers[i]], {
+          type: `image/${content.encoding}`,
+        });
+        const bitmap = await createImageBitmap(blob);
+        context.drawImage(bitmap, x, y);
+        bitmap.close();
+      }
+    }
+    this.trigger('tiles', tiles);
+  }
+
+  private _canvas: HTMLCanvasElement;
+  private _drawing: Promise<void>;
+}
+
+/**
+ * Convert raw pixels with 1 (grayscale), 3 (RGB) or 4 (RGBA) channels to
+ * image data.
+ */
+function toImageData(
+  buffer: ArrayBuffer | ArrayBufferView,
+  width: number,
+  height: number,
+  channels: number
+): ImageData {
+  const pixels = ArrayBuffer.isView(buffer)
+    ? new Uint8Array(buffer.buffer, buffer.byteOffset, buffer.byteLength)
+    : new Uint8Array(buffer);
+  if (channels === 4) {
+    return new ImageData(new Uint8ClampedArray(pixels), width, height);
+  }
+  const data = new Uint8ClampedArray(width * height * 4);
+  for (let i = 0, j = 0; i < data.length; i += 4, j += channels) {
+    data[i] = pixels[j];
+    data[i + 1] = pixels[channels === 1 ? j : j + 1];
+    data[i + 2] = pixels[channels === 1 ? j : j + 2];
+    data[i + 3] = 255;
+  }
+  return new ImageData(data, width, height);
+}
+
+export class TiledImageView extends DOMWidgetView {
+  render(): void {
+    super.render();
+    this.luminoWidget.addClass('jupyter-widgets');
+    this.luminoWidget.addClass('widget-image');
+    this.listenTo(this.model, 'tiles', this._drawTiles);
+    this._drawTiles();
+    this.update();
+  }
+
+  update(): void {
+    const width = this.model.get('width');
+    this.el.style.width = width ? `${width}px` : '';
+    const height = this.model.get('height');
+    this.el.style.height = height ? `${height}px` : '';
+    return super.update();
+  }
+
+  /**
+   * Copy tiles of the model canvas, or the whole image.
+   */
+  _drawTiles(tiles?: Rect[]): void {
+    const source = this.model.canvas;
+    if (
+      !tiles ||
+      this.el.width !== source.width ||
+      this.el.height !== source.height
+    ) {
+      this.el.width = source.width;
+      this.el.height = source.height;
+      tiles = [[0, 0, source.width, source.height]];
+    }
+    const context = this.el.getContext('2d')!;
+    for (const [x, y, w, h] of tiles) {
+      if (w > 0 && h > 0) {
+        context.clearRect(x, y, w, h);
+        context.drawImage(source, x, y, w, h, x, y, w, h);
+      }
+    }
+  }
+
+  preinitialize() {
+    // Must set this before the initialize method creates the element
+    this.tagName = 'canvas';
+  }
+
+  el: HTMLCanvasElement;
+  model: TiledImageModel;
 }
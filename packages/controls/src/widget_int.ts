@@ -62,6 +62,7 @@ export class IntSliderModel extends BoundedIntModel {
       continuous_update: true,
       style: null,
       disabled: false,
+      behavior: 'drag-tap',
     };
   }
   initialize(
@@ -542,6 +543,7 @@ export class IntTextModel extends IntModel {
       _view_name: 'IntTextView',
       disabled: false,
       continuous_update: false,
+      step: 1,
     };
   }
 }
@@ -0,0 +1,103 @@
+// Copyright (c) Jupyter Development Team.
+// Distributed under the terms of the Modified BSD License.
+
+import { WidgetModel, unpack_models } from '@jupyter-widgets/base';
+
+import { CoreWidgetModel } from './widget_core';
+
+/**
+ * Find the position of a value in the domain of a control.
+ *
+ * Numbers are compared with a tolerance, since the values of float sliders
+ * are rounded by the front-end.
+ */
+function domainIndex(domain: any[], value: any): number {
+  return domain.findIndex(
+    (candidate) =>
+      candidate === value ||
+      (typeof candidate === 'number' &&
+        typeof value === 'number' &&
+        Math.abs(candidate - value) <=
+          1e-9 * Math.max(1, Math.abs(candidate)))
+  );
+}
+
+/**
+ * Show the outputs computed ahead of time by the kernel for the values of
+ * some controls in an output widget.
+ *
+ * This only acts without a kernel, e.g. in embedded widgets, since the
+ * kernel shows the outputs otherwise.
+ */
+export class PrecomputedOutputsModel extends CoreWidgetModel {
+  static serializers = {
+    ...CoreWidgetModel.serializers,
+    controls: { deserialize: unpack_models },
+    output: { deserialize: unpack_models },
+  };
+
+  defaults(): Backbone.ObjectHash {
+    return {
+      ...super.defaults(),
+      _model_name: 'PrecomputedOutputsModel',
+      controls: [],
+      control_traits: [],
+      domains: [],
+      output: null,
+      outputs: [],
+    };
+  }
+
+  initialize(
+    attributes: Backbone.ObjectHash,
+    options: { model_id: string; comm: any; widget_manager: any }
+  ): void {
+    super.initialize(attributes, options);
+    this._controls = [];
+    this.on('change', this.updateBindings, this);
+    this.updateBindings();
+  }
+
+  /**
+   * Show the outputs for the current values of the controls.
+   */
+  updateOutput(): void {
+    const output: WidgetModel | null = this.get('output');
+    if (this.comm_live || !output) {
+      return;
+    }
+    const traits: string[] = this.get('control_traits');
+    const domains: any[][] = this.get('domains');
+    let index = 0;
+    for (const [i, control] of this._controls.entries()) {
+      const position = domainIndex(domains[i], control.get(traits[i]));
+      if (position < 0) {
+        return;
+      }
+      index = index * domains[i].length + position;
+    }
+    const outputs = this.get('outputs')[index];
+    if (outputs) {
+      output.set('outputs', outputs);
+    }
+  }
+
+  updateBindings(): void {
+    this.cleanup();
+    const traits: string[] = this.get('control_traits');
+    this._controls = this.get('controls');
+    for (const [i, control] of this._controls.entries()) {
+      this.listenTo(control, 'change:' + traits[i], this.updateOutput);
+    }
+    this.updateOutput();
+  }
+
+  cleanup(): void {
+    // Stop listening to the 'change' events of the controls
+    for (const control of this._controls) {
+      this.stopListening(control);
+    }
+  }
+
+  private _controls: WidgetModel[];
+}
@@ -12,19 +12,154 @@ import { uuid } from './utils';
 import noUiSlider from 'nouislider';
 import * as utils from './utils';
 
+/**
+ * The options matching a search, see SelectionModel.search.
+ */
+export interface ISearchResults {
+  indices: number[];
+  labels: string[];
+}
+
 export class SelectionModel extends CoreDescriptionModel {
   defaults(): Backbone.ObjectHash {
     return {
       ...super.defaults(),
       _model_name: 'SelectionModel',
-      index: '',
+      index: null,
       _options_labels: [],
+      _options_length: 0,
+      page_size: 0,
+      searchable: false,
       disabled: false,
     };
   }
+
+  initialize(
+    attributes: any,
+    options: { model_id: string; comm?: any; widget_manager: any }
+  ): void {
+    super.initialize(attributes, options);
+    this._labels = new Map<number, string>();
+    this._pendingPages = new Set<number>();
+    this._searchId = 0;
+    this._searchResolve = null;
+    this.on('msg:custom', this._handle_labels_msg, this);
+  }
+
+  /**
+   * Whether the option labels are requested from the kernel in pages
+   * instead of being synced with the state.
+   */
+  isPaged(): boolean {
+    return this.get('page_size') > 0;
+  }
+
+  /**
+   * The number of options.
+   */
+  optionsLength(): number {
+    return this.isPaged()
+      ? this.get('_options_length')
+      : this.get('_options_labels').length;
+  }
+
+  /**
+   * Get the labels of the options from start to end.
+   *
+   * For a paged model, labels which are not loaded yet are null. They are
+   * requested from the kernel, and a 'labels:loaded' event is triggered
+   * when they arrive.
+   */
+  getLabels(start: number, end: number): (string | null)[] {
+    if (!this.isPaged()) {
+      return this.get('_options_labels').slice(start, end);
+    }
+    const pageSize = this.get('page_size');
+    const labels: (string | null)[] = [];
+    for (let i = start; i < end; i++) {
+      const label = this._labels.get(i);
+      if (label === undefined) {
+        const offset = i - (i % pageSize);
+        if (!this._pendingPages.has(offset)) {
+          this._pendingPages.add(offset);
+          this.send({ event: 'request_labels', offset, limit: pageSize });
+        }
+        labels.push(null);
+      } else {
+        labels.push(label);
+      }
+    }
+    return labels;
+  }
+
+  /**
+   * Search the option labels in the kernel.
+   *
+   * Resolves with null when a newer search is started before the results
+   * arrive.
+   */
+  search(query: string): Promise<ISearchResults | null> {
+    if (this._searchResolve) {
+      this._searchResolve(null);
+    }
+    const id = ++this._searchId;
+    return new Promise((resolve) => {
+      this._searchResolve = resolve;
+      this.send({ event: 'search', query, id });
+    });
+  }
+
+  /**
+   * Handle the labels or search results sent by the kernel.
+   */
+  private _handle_labels_msg(content: any): void {
+    if (content.event === 'search_results') {
+      this._handle_search_results(content);
+      return;
+    }
+    if (content.event !== 'labels') {
+      return;
+    }
+    if (content.reset) {
+      this._labels.clear();
+      this._pendingPages.clear();
+    }
+    const labels: string[] = content.labels;
+    for (let i = 0; i < labels.length; i++) {
+      this._labels.set(content.offset + i, labels[i]);
+    }
+    this._pendingPages.delete(content.offset);
+    this.trigger('labels:loaded');
+  }
+
+  private _handle_search_results(content: any): void {
+    if (content.id !== this._searchId || !this._searchResolve) {
+      return; // stale results
+    }
+    const results = { indices: content.indices, labels: content.labels };
+    if (this.isPaged()) {
+      for (let i = 0; i < results.indices.length; i++) {
+        this._labels.set(results.indices[i], results.labels[i]);
+      }
+    }
+    this._searchResolve(results);
+    this._searchResolve = null;
+  }
+
+  private _labels: Map<number, string>;
+  private _pendingPages: Set<number>;
+  private _searchId: number;
+  private _searchResolve: ((results: ISearchResults | null) => void) | null;
 }
 
 export class SelectionView extends DescriptionView {
+  initialize(parameters: WidgetView.IInitializeParameters): void {
+    super.initialize(parameters);
+    this._windowStart = 0;
+    this._results = null;
+    this.listenTo(this.model, 'labels:loaded', this._labelsLoaded);
+  }
+
   /**
    * Called when view is rendered.
    */
@@ -47,6 +182,16 @@ export class SelectionView extends DescriptionView {
     if (this.listbox) {
       this.listbox.disabled = this.model.get('disabled');
     }
+    if (this.searchbox) {
+      this.searchbox.disabled = this.model.get('disabled');
+      this.searchbox.style.display = this.model.get('searchable')
+        ? ''
+        : 'none';
+      if (!this.model.get('searchable') && this._results !== null) {
+        this.searchbox.value = '';
+        this._handle_search();
+      }
+    }
 
     // Set tabindex
     this.updateTabindex();
@@ -77,7 +222,167 @@ export class SelectionView extends DescriptionView {
     }
   }
 
+  /**
+   * Create the search box, which is shown when the model is searchable.
+   */
+  _renderSearchbox(): void {
+    this.searchbox = document.createElement('input');
+    this.searchbox.type = 'search';
+    this.searchbox.classList.add('widget-selection-search');
+    this.searchbox.addEventListener('input', this._handle_search.bind(this));
+    this.el.appendChild(this.searchbox);
+  }
+
+  /**
+   * Show the options matching the query of the search box.
+   */
+  _handle_search(): void {
+    const query = this.searchbox.value;
+    if (!query) {
+      this._results = null;
+      this._updateOptions();
+      this.updateSelection();
+      return;
+    }
+    (this.model as SelectionModel).search(query).then((results) => {
+      if (results === null || this.searchbox.value !== query) {
+        return;
+      }
+      this._results = results;
+      this._updateOptions();
+      this.updateSelection();
+    });
+  }
+
+  /**
+   * Fill the listbox with the options.
+   *
+   * Only the search results are rendered during a search. Otherwise, for a
+   * paged model only the window of options starting at _windowStart is
+   * rendered.
+   */
+  _updateOptions(): void {
+    const model = this.model as SelectionModel;
+    const length = model.optionsLength();
+    if (this._results !== null) {
+      this._renderItems(this._results.labels);
+      return;
+    }
+    if (model.isPaged()) {
+      const size = this._windowSize();
+      this._windowStart = Math.max(
+        0,
+        Math.min(this._windowStart, length - size)
+      );
+    } else {
+      this._windowStart = 0;
+    }
+    this._renderItems(
+      model.getLabels(
+        this._windowStart,
+        Math.min(length, this._windowStart + this._windowSize())
+      )
+    );
+  }
+
+  _renderItems(items: (string | null)[]): void {
+    this.listbox.textContent = '';
+    for (let i = 0; i < items.length; i++) {
+      const item = items[i];
+      const option = document.createElement('option');
+      if (item === null) {
+        option.textContent = '\u2026';
+        option.value = '';
+      } else {
+        option.textContent = item.replace(/ /g, '\xa0'); // space -> &nbsp;
+        option.setAttribute('data-value', encodeURIComponent(item));
+        option.value = item;
+      }
+      this.listbox.appendChild(option);
+    }
+  }
+
+  /**
+   * The number of options rendered at a time for a paged model.
+   */
+  _windowSize(): number {
+    const model = this.model as SelectionModel;
+    return model.isPaged() ? 2 * this.model.get('page_size') : Infinity;
+  }
+
+  /**
+   * Move the window of rendered options so that it contains an index.
+   *
+   * Returns whether the window moved.
+   */
+  _showIndex(index: number | null): boolean {
+    const size = this._windowSize();
+    if (
+      this._results !== null ||
+      index === null ||
+      index < 0 ||
+      (index >= this._windowStart && index < this._windowStart + size)
+    ) {
+      return false;
+    }
+    this._windowStart = Math.max(0, index - Math.floor(size / 4));
+    return true;
+  }
+
+  /**
+   * The first selected index, which is kept in the rendered window.
+   */
+  _firstIndex(): number | null {
+    return this.model.get('index');
+  }
+
+  /**
+   * The position in the listbox of an option index, or -1.
+   */
+  _toListboxIndex(index: number | null): number {
+    if (index === null) {
+      return -1;
+    }
+    if (this._results !== null) {
+      return this._results.indices.indexOf(index);
+    }
+    const i = index - this._windowStart;
+    return i >= 0 && i < this.listbox.options.length ? i : -1;
+  }
+
+  /**
+   * The option index of a position in the listbox.
+   */
+  _fromListboxIndex(i: number): number {
+    if (i === -1) {
+      return -1;
+    }
+    return this._results !== null
+      ? this._results.indices[i]
+      : this._windowStart + i;
+  }
+
+  /**
+   * Render the labels which were requested from the kernel.
+   */
+  _labelsLoaded(): void {
+    if (!this.listbox) {
+      return;
+    }
+    const scrollTop = this.listbox.scrollTop;
+    this._updateOptions();
+    this.updateSelection();
+    this.listbox.scrollTop = scrollTop;
+  }
+
+  updateSelection(): void {
+    this.listbox.selectedIndex = this._toListboxIndex(this.model.get('index'));
+  }
+
   listbox: HTMLSelectElement;
+  searchbox: HTMLInputElement;
+  _windowStart: number;
+  _results: ISearchResults | null;
 }
 
 export class DropdownModel extends SelectionModel {
@@ -107,9 +412,11 @@ export class DropdownView extends SelectionView {
 
     this.el.classList.add('widget-dropdown');
 
+    this._renderSearchbox();
     this.listbox = document.createElement('select');
     this.listbox.id = this.label.htmlFor = uuid();
     this.el.appendChild(this.listbox);
+    this._showIndex(this._firstIndex());
     this._updateOptions();
     this.update();
   }
@@ -120,31 +427,20 @@ export class DropdownView extends SelectionView {
   update(options?: { updated_view?: DropdownView }): void {
     // Debounce set calls from ourselves:
     if (options?.updated_view !== this) {
-      const optsChanged = this.model.hasChanged('_options_labels');
-      if (optsChanged) {
+      const optsChanged =
+        this.model.hasChanged('_options_labels') ||
+        this.model.hasChanged('_options_length') ||
+        this.model.hasChanged('page_size');
+      if (this._showIndex(this._firstIndex()) || optsChanged) {
         // Need to update options:
         this._updateOptions();
       }
     }
     // Select the correct element
-    const index = this.model.get('index');
-    this.listbox.selectedIndex = index === null ? -1 : index;
+    this.updateSelection();
     return super.update();
   }
 
-  _updateOptions(): void {
-    this.listbox.textContent = '';
-    const items = this.model.get('_options_labels');
-    for (let i = 0; i < items.length; i++) {
-      const item = items[i];
-      const option = document.createElement('option');
-      option.textContent = item.replace(/ /g, '\xa0'); // space -> &nbsp;
-      option.setAttribute('data-value', encodeURIComponent(item));
-      option.value = item;
-      this.listbox.appendChild(option);
-    }
-  }
-
   events(): { [e: string]: string } {
     return {
       'change select': '_handle_change',
@@ -157,7 +453,9 @@ export class DropdownView extends SelectionView {
   _handle_change(): void {
     this.model.set(
       'index',
-      this.listbox.selectedIndex === -1 ? null : this.listbox.selectedIndex,
+      this.listbox.selectedIndex === -1
+        ? null
+        : this._fromListboxIndex(this.listbox.selectedIndex),
       { updated_view: this }
     );
     this.touch();
@@ -203,8 +501,12 @@ export class SelectView extends SelectionView {
     super.render();
     this.el.classList.add('widget-select');
 
+    this._renderSearchbox();
     this.listbox.id = this.label.htmlFor = uuid();
     this.el.appendChild(this.listbox);
+    // scroll events do not bubble, so they cannot be delegated in events()
+    this.listbox.addEventListener('scroll', this._handle_scroll.bind(this));
+    this._showIndex(this._firstIndex());
     this._updateOptions();
     this.update();
     this.updateSelection();
@@ -216,15 +518,16 @@ export class SelectView extends SelectionView {
   update(options?: { updated_view?: WidgetView }): void {
     // Don't update options/index on set calls from ourselves:
     if (options?.updated_view !== this) {
-      const optsChange = this.model.hasChanged('_options_labels');
+      const optsChange =
+        this.model.hasChanged('_options_labels') ||
+        this.model.hasChanged('_options_length') ||
+        this.model.hasChanged('page_size');
       const idxChange = this.model.hasChanged('index');
       if (optsChange || idxChange) {
-        // Stash the index to guard against change events
-        const idx = this.model.get('index');
-        if (optsChange) {
+        if (this._showIndex(this._firstIndex()) || optsChange) {
           this._updateOptions();
         }
-        this.updateSelection(idx);
+        this.updateSelection();
       }
     }
     super.update();
@@ -235,22 +538,36 @@ export class SelectView extends SelectionView {
     this.listbox.setAttribute('size', rows);
   }
 
-  updateSelection(index?: null | number): void {
-    index = index || (this.model.get('index') as null | number);
-    this.listbox.selectedIndex = index === null ? -1 : index;
-  }
-
-  _updateOptions(): void {
-    this.listbox.textContent = '';
-    const items = this.model.get('_options_labels');
-    for (let i = 0; i < items.length; i++) {
-      const item = items[i];
-      const option = document.createElement('option');
-      option.textContent = item.replace(/ /g, '\xa0'); // space -> &nbsp;
-      option.setAttribute('data-value', encodeURIComponent(item));
-      option.value = item;
-      this.listbox.appendChild(option);
+  /**
+   * Move the window of a paged listbox when it is scrolled to an end.
+   */
+  _handle_scroll(): void {
+    const model = this.model as SelectionModel;
+    const listbox = this.listbox;
+    const count = listbox.options.length;
+    if (!model.isPaged() || this._results !== null || count === 0) {
+      return;
+    }
+    const pageSize = this.model.get('page_size');
+    const optionHeight = listbox.scrollHeight / count;
+    const end = this._windowStart + count;
+    let shift = 0;
+    if (
+      listbox.scrollTop + listbox.clientHeight >=
+      listbox.scrollHeight - optionHeight
+    ) {
+      shift = Math.min(pageSize, model.optionsLength() - end);
+    } else if (listbox.scrollTop <= optionHeight) {
+      shift = -Math.min(pageSize, this._windowStart);
+    }
+    if (shift === 0) {
+      return;
     }
+    const scrollTop = listbox.scrollTop;
+    this._windowStart += shift;
+    this._updateOptions();
+    this.updateSelection();
+    listbox.scrollTop = scrollTop - shift * optionHeight;
   }
 
   events(): { [e: string]: string } {
@@ -263,7 +580,11 @@ export class SelectView extends SelectionView {
    * Handle when a new value is selected.
    */
   _handle_change(): void {
-    this.model.set('index', this.listbox.selectedIndex, { updated_view: this });
+    this.model.set(
+      'index',
+      this._fromListboxIndex(this.listbox.selectedIndex),
+      { updated_view: this }
+    );
     this.touch();
   }
 
@@ -452,7 +773,7 @@ export class ToggleButtonsStyleModel extends DescriptionStyleModel {
     button_width: {
       selector: '.widget-toggle-button',
       attribute: 'width',
-      default: null as any,
+      default: '',
     },
     font_weight: {
       selector: '.widget-toggle-button',
@@ -468,6 +789,7 @@ export class ToggleButtonsModel extends SelectionModel {
       ...super.defaults(),
       _model_name: 'ToggleButtonsModel',
       _view_name: 'ToggleButtonsView',
+      button_style: '',
     };
   }
 }
@@ -659,9 +981,11 @@ export class SelectionSliderModel extends SelectionModel {
       ...super.defaults(),
       _model_name: 'SelectionSliderModel',
       _view_name: 'SelectionSliderView',
+      index: 0,
       orientation: 'horizontal',
       readout: true,
       continuous_update: true,
+      behavior: 'drag-tap',
     };
   }
 }
@@ -887,7 +1211,7 @@ export class SelectMultipleModel extends MultipleSelectionModel {
       ...super.defaults(),
       _model_name: 'SelectMultipleModel',
       _view_name: 'SelectMultipleView',
-      rows: null,
+      rows: 5,
     };
   }
 }
@@ -916,18 +1240,34 @@ export class SelectMultipleView extends SelectView {
     this.listbox.selectedIndex = -1;
     // Select the appropriate options
     selected.forEach((i: number) => {
-      listboxOptions[i].selected = true;
+      const j = this._toListboxIndex(i);
+      if (j !== -1) {
+        listboxOptions[j].selected = true;
+      }
     });
   }
 
+  _firstIndex(): number | null {
+    const selected = this.model.get('index') || [];
+    return selected.length > 0 ? selected[0] : null;
+  }
+
   /**
    * Handle when a new value is selected.
    */
   _handle_change(): void {
-    const index = Array.prototype.map.call(
+    // Keep the selected options which are not rendered.
+    const rendered = new Set<number>();
+    for (let i = 0; i < this.listbox.options.length; i++) {
+      rendered.add(this._fromListboxIndex(i));
+    }
+    const index = (this.model.get('index') || []).filter(
+      (i: number) => !rendered.has(i)
+    );
+    Array.prototype.forEach.call(
       this.listbox.selectedOptions || [],
-      function (option: HTMLOptionElement) {
-        return option.index;
+      (option: HTMLOptionElement) => {
+        index.push(this._fromListboxIndex(option.index));
       }
     );
     this.model.set('index', index, { updated_view: this });
@@ -944,6 +1284,7 @@ export class SelectionRangeSliderModel extends MultipleSelectionModel {
       orientation: 'horizontal',
       readout: true,
       continuous_update: true,
+      behavior: 'drag-tap',
     };
   }
 }
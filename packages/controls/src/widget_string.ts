@@ -34,12 +34,12 @@ class StringStyleModel extends DescriptionStyleModel {
     font_size: {
       selector: '',
       attribute: 'font-size',
-      default: '',
+      default: null as any,
     },
     text_color: {
       selector: '',
       attribute: 'color',
-      default: '',
+      default: null as any,
     },
   };
 }
@@ -89,27 +89,27 @@ export class LabelStyleModel extends StringStyleModel {
     font_family: {
       selector: '',
       attribute: 'font-family',
-      default: '',
+      default: null as any,
     },
     font_style: {
       selector: '',
       attribute: 'font-style',
-      default: '',
+      default: null as any,
     },
     font_variant: {
       selector: '',
       attribute: 'font-variant',
-      default: '',
+      default: null as any,
     },
     font_weight: {
       selector: '',
       attribute: 'font-weight',
-      default: '',
+      default: null as any,
     },
     text_decoration: {
       selector: '',
       attribute: 'text-decoration',
-      default: '',
+      default: null as any,
     },
   };
 }
@@ -134,12 +134,12 @@ export class TextStyleModel extends DescriptionStyleModel {
     font_size: {
       selector: '.widget-input',
       attribute: 'font-size',
-      default: '',
+      default: null as any,
     },
     text_color: {
       selector: '.widget-input',
       attribute: 'color',
-      default: '',
+      default: null as any,
     },
   };
 }
@@ -624,7 +624,7 @@ export class ComboboxModel extends TextModel {
       _model_name: 'ComboboxModel',
       _view_name: 'ComboboxView',
       options: [],
-      ensure_options: false,
+      ensure_option: false,
     };
   }
 }
@@ -82,6 +82,8 @@ class TagsInputBaseModel extends CoreDOMWidgetModel {
     return {
       ...super.defaults(),
       value: [],
+      description: '',
+      description_allow_html: false,
       placeholder: '\u200b',
       allowed_tags: null,
       allow_duplicates: true,
@@ -5,13 +5,43 @@ import { CoreDOMWidgetModel } from './widget_core';
 import { DOMWidgetView } from '@jupyter-widgets/base';
 
 interface IFileUploaded {
-  content: ArrayBuffer;
+  // Files whose content the kernel already holds have a digest instead
+  content?: ArrayBuffer;
+  digest?: string;
   name: string;
   size: number;
   type: string;
   last_modified: number;
 }
 
+/**
+ * Compute the digest identifying the content of a file for the kernel.
+ *
+ * This is the SHA-256 hash of the SHA-256 hashes of the chunks of the file,
+ * so that the file is not read into memory at once, prefixed with the size of
+ * the chunks. Returns null if the Web Crypto API is not available, which is
+ * the case outside of secure contexts.
+ */
+export async function digestFile(
+  file: Blob,
+  chunkSize: number
+): Promise<string | null> {
+  if (typeof crypto === 'undefined' || !crypto.subtle) {
+    return null;
+  }
+  const hashes = new Uint8Array(Math.ceil(file.size / chunkSize) * 32);
+  for (let offset = 0; offset < file.size; offset += chunkSize) {
+    const chunk = await file.slice(offset, offset + chunkSize).arrayBuffer();
+    const hash = await crypto.subtle.digest('SHA-256', chunk);
+    hashes.set(new Uint8Array(hash), (offset / chunkSize) * 32);
+  }
+  const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', hashes));
+  const hex = Array.from(digest, (byte) =>
+    byte.toString(16).padStart(2, '0')
+  ).join('');
+  return `${chunkSize}:${hex}`;
+}
+
 export class FileUploadModel extends CoreDOMWidgetModel {
   defaults(): Backbone.ObjectHash {
     return {
@@ -20,6 +50,7 @@ export class FileUploadModel extends CoreDOMWidgetModel {
       _view_name: 'FileUploadView',
       accept: '',
       description: 'Upload',
+      description_allow_html: false,
       disabled: false,
       icon: 'upload',
       button_style: '',
@@ -27,9 +58,123 @@ export class FileUploadModel extends CoreDOMWidgetModel {
       value: [], // has type Array<IFileUploaded>
       error: '',
       style: null,
+      chunked: false,
+      chunk_size: 1024 * 1024,
+      // Kernels which do not answer lookups do not set it
+      dedupe: false,
     };
   }
 
+  initialize(attributes: any, options: any): void {
+    super.initialize(attributes, options);
+    this._acks = new Map();
+    this._lookups = [];
+    this.on('msg:custom', this._handle_upload_msg, this);
+  }
+
+  /**
+   * Find the files whose content the kernel already holds.
+   *
+   * Resolves to the digests of the files the kernel holds, and null for the
+   * other files, which have to be sent.
+   */
+  async lookup(files: File[]): Promise<Array<string | null>> {
+    if (!this.get('dedupe') || files.length === 0) {
+      return files.map(() => null);
+    }
+    const chunkSize: number = this.get('chunk_size');
+    const digests = await Promise.all(
+      files.map((file) => digestFile(file, chunkSize))
+    );
+    if (digests.includes(null)) {
+      return files.map(() => null);
+    }
+    const known = await new Promise<boolean[]>((resolve) => {
+      this._lookups.push(resolve);
+      this.send({ event: 'lookup', digests });
+    });
+    return digests.map((digest, i) => (known[i] ? digest : null));
+  }
+
+  /**
+   * Upload files to the kernel in chunks sent as custom messages.
+   *
+   * A chunk is sent once the kernel acknowledged the previous one, so that
+   * only a couple of chunks are held in memory. The `upload:progress` event
+   * is triggered with the fraction of the files received by the kernel.
+   * The files the kernel already holds are not sent.
+   */
+  async uploadChunked(files: File[]): Promise<void> {
+    const chunkSize: number = this.get('chunk_size');
+    const digests = await this.lookup(files);
+    const total = files.reduce(
+      (size, file, id) => (digests[id] ? size : size + file.size),
+      0
+    );
+    let received = 0;
+    this.send({
+      event: 'upload_start',
+      files: files.map((file, id) => ({
+        id,
+        name: file.name,
+        type: file.type,
+        size: file.size,
+        last_modified: file.lastModified,
+        ...(digests[id] ? { digest: digests[id] } : {}),
+      })),
+    });
+    for (const [id, file] of files.entries()) {
+      if (digests[id]) {
+        continue;
+      }
+      const read = (offset: number): Promise<ArrayBuffer> =>
+        file.slice(offset, offset + chunkSize).arrayBuffer();
+      let next = read(0);
+      for (let offset = 0; offset < file.size; offset += chunkSize) {
+        const chunk = await next;
+        // Read the next chunk while this one is sent
+        next = read(offset + chunkSize);
+        const ack = new Promise<void>((resolve, reject) => {
+          this._acks.set(id, { resolve, reject });
+        });
+        this.send({ event: 'upload_chunk', id, offset }, [chunk]);
+        await ack;
+        received += chunk.byteLength;
+        this.trigger('upload:progress', total ? received / total : 1);
+      }
+    }
+    this.send({ event: 'upload_end' });
+  }
+
+  private _handle_upload_msg(content: any): void {
+    if (content.event === 'lookup_result') {
+      this._lookups.shift()?.(content.known);
+      return;
+    }
+    if (content.event === 'upload_error' && content.digest !== undefined) {
+      // The kernel evicted a content after the lookup of the upload
+      this.trigger('upload:evicted', content.digest);
+      return;
+    }
+    const ack = this._acks.get(content.id);
+    if (!ack) {
+      return;
+    }
+    if (content.event === 'upload_ack') {
+      this._acks.delete(content.id);
+      ack.resolve();
+    } else if (content.event === 'upload_error') {
+      this._acks.delete(content.id);
+      ack.reject(new Error(content.message));
+    }
+  }
+
+  private _acks: Map<
+    number,
+    { resolve: () => void; reject: (error: Error) => void }
+  >;
+  private _lookups: Array<(known: boolean[]) => void>;
+
   static serializers = {
     ...CoreDOMWidgetModel.serializers,
     // use a dummy serializer for value to circumvent the default serializer.
@@ -40,6 +185,7 @@ export class FileUploadModel extends CoreDOMWidgetModel {
 export class FileUploadView extends DOMWidgetView {
   el: HTMLButtonElement;
   fileInput: HTMLInputElement;
+  model: FileUploadModel;
 
   preinitialize() {
     // Must set this before the initialize method creates the element
@@ -53,6 +199,7 @@ export class FileUploadView extends DOMWidgetView {
     this.el.classList.add('widget-upload');
     this.el.classList.add('jupyter-button');
 
+    this._progress = null;
     this.fileInput = document.createElement('input');
     this.fileInput.type = 'file';
     this.fileInput.style.display = 'none';
@@ -66,53 +213,114 @@ export class FileUploadView extends DOMWidgetView {
     });
 
     this.fileInput.addEventListener('change', () => {
-      const promisesFile: Array<Promise<IFileUploaded>> = [];
+      if (this.model.get('chunked')) {
+        this._uploadChunked();
+      } else {
+        this._upload();
+      }
+    });
 
-      Array.from(this.fileInput.files ?? []).forEach((file: File) => {
+    this.listenTo(this.model, 'change:button_style', this.update_button_style);
+    this.listenTo(this.model, 'upload:evicted', () => {
+      // Send the contents of the files again
+      this._upload(false);
+    });
+    this.listenTo(this.model, 'upload:progress', (progress: number) => {
+      this._progress = progress;
+      this.update();
+    });
+    this.set_button_style();
+    this.update(); // Set defaults.
+  }
+
+  /**
+   * Upload the selected files in the value.
+   *
+   * @param dedupe - whether to skip the contents the kernel holds.
+   */
+  private async _upload(dedupe = true): Promise<void> {
+    const files = Array.from(this.fileInput.files ?? []);
+    const promisesFile: Array<Promise<IFileUploaded>> = [];
+    let digests: Array<string | null> = files.map(() => null);
+    if (dedupe) {
+      try {
+        digests = await this.model.lookup(files);
+      } catch (err) {
+        // Send all the contents
+      }
+    }
+
+    files.forEach((file: File, i: number) => {
+      const digest = digests[i];
+      if (digest) {
         promisesFile.push(
-          new Promise((resolve, reject) => {
-            const fileReader = new FileReader();
-            fileReader.onload = (): void => {
-              // We know we can read the result as an array buffer since
-              // we use the `.readAsArrayBuffer` method
-              const content: ArrayBuffer = fileReader.result as ArrayBuffer;
-              resolve({
-                content,
-                name: file.name,
-                type: file.type,
-                size: file.size,
-                last_modified: file.lastModified,
-              });
-            };
-            fileReader.onerror = (): void => {
-              reject();
-            };
-            fileReader.onabort = fileReader.onerror;
-            fileReader.readAsArrayBuffer(file);
+          Promise.resolve({
+            digest,
+            name: file.name,
+            type: file.type,
+            size: file.size,
+            last_modified: file.lastModified,
           })
         );
-      });
-
-      Promise.all(promisesFile)
-        .then((files: Array<IFileUploaded>) => {
-          this.model.set({
-            value: files,
-            error: '',
-          });
-          this.touch();
+        return;
+      }
+      promisesFile.push(
+        new Promise((resolve, reject) => {
+          const fileReader = new FileReader();
+          fileReader.onload = (): void => {
+            // We know we can read the result as an array buffer since
+            // we use the `.readAsArrayBuffer` method
+            const content: ArrayBuffer = fileReader.result as ArrayBuffer;
+            resolve({
+              content,
+              name: file.name,
+              type: file.type,
+              size: file.size,
+              last_modified: file.lastModified,
+            });
+          };
+          fileReader.onerror = (): void => {
+            reject();
+          };
+          fileReader.onabort = fileReader.onerror;
+          fileReader.readAsArrayBuffer(file);
         })
-        .catch((err) => {
-          console.error('error in file upload: %o', err);
-          this.model.set({
-            error: err,
-          });
-          this.touch();
-        });
+      );
     });
 
-    this.listenTo(this.model, 'change:button_style', this.update_button_style);
-    this.set_button_style();
-    this.update(); // Set defaults.
+    Promise.all(promisesFile)
+      .then((files: Array<IFileUploaded>) => {
+        this.model.set({
+          value: files,
+          error: '',
+        });
+        this.touch();
+      })
+      .catch((err) => {
+        console.error('error in file upload: %o', err);
+        this.model.set({
+          error: err,
+        });
+        this.touch();
+      });
+  }
+
+  /**
+   * Upload the selected files in chunks.
+   */
+  private async _uploadChunked(): Promise<void> {
+    this._progress = 0;
+    this.update();
+    try {
+      await this.model.uploadChunked(Array.from(this.fileInput.files ?? []));
+      this.model.set('error', '');
+    } catch (err) {
+      console.error('error in file upload: %o', err);
+      this.model.set('error', String(err));
+    }
+    this._progress = null;
+    this.touch();
+    this.update();
   }
 
   update(): void {
@@ -120,7 +328,11 @@ export class FileUploadView extends DOMWidgetView {
     this.el.setAttribute('title', this.model.get('tooltip'));
 
     const value: [] = this.model.get('value');
-    const description = `${this.model.get('description')} (${value.length})`;
+    const count =
+      this._progress === null
+        ? `${value.length}`
+        : `${Math.floor(this._progress * 100)}%`;
+    const description = `${this.model.get('description')} (${count})`;
     const icon = this.model.get('icon');
 
     if (description.length || icon.length) {
@@ -162,4 +374,7 @@ export class FileUploadView extends DOMWidgetView {
     warning: ['mod-warning'],
     danger: ['mod-danger'],
   };
+
+  // The progress of a chunked upload, or null
+  private _progress: number | null;
 }
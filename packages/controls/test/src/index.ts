@@ -7,4 +7,5 @@ import './widget_time_test';
 import './widget_selection_test';
 import './widget_string_test';
 import './widget_upload_test';
+import './widget_precomputed_test';
 import './lumino/currentselection_test';
@@ -0,0 +1,52 @@
+// Copyright (c) Jupyter Development Team.
+// Distributed under the terms of the Modified BSD License.
+
+import { expect } from 'chai';
+
+import { WidgetModel } from '@jupyter-widgets/base';
+
+import { createTestModel } from './utils';
+
+import {
+  DropdownModel,
+  FloatSliderModel,
+  PrecomputedOutputsModel,
+} from '../../lib';
+
+function stream(text: string): any {
+  return { output_type: 'stream', name: 'stdout', text };
+}
+
+describe('PrecomputedOutputsModel', () => {
+  it('should show the outputs of the values of the controls', () => {
+    const slider = createTestModel(FloatSliderModel, { value: 0 });
+    const dropdown = createTestModel(DropdownModel, { index: 0 });
+    const output = createTestModel(WidgetModel, { outputs: [] });
+    const outputs: any[] = [];
+    for (const x of [0, 0.1, 0.2]) {
+      for (const choice of ['a', 'b']) {
+        outputs.push([stream(`${x} ${choice}`)]);
+      }
+    }
+    createTestModel(PrecomputedOutputsModel, {
+      controls: [slider, dropdown],
+      control_traits: ['value', 'index'],
+      domains: [
+        [0, 0.1, 0.2],
+        [0, 1],
+      ],
+      output,
+      outputs,
+    });
+    expect(output.get('outputs')).to.deep.equal([stream('0 a')]);
+
+    // Float values are compared with a tolerance
+    slider.set('value', 0.1 + 0.2 - 0.1);
+    dropdown.set('index', 1);
+    expect(output.get('outputs')).to.deep.equal([stream('0.2 b')]);
+
+    // Values without outputs leave the outputs unchanged
+    slider.set('value', 0.5);
+    expect(output.get('outputs')).to.deep.equal([stream('0.2 b')]);
+  });
+});
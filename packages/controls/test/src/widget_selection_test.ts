@@ -3,6 +3,8 @@
 
 import { expect } from 'chai';
 
+import { spy } from 'sinon';
+
 import { createTestModel, createTestView } from './utils';
 
 import {
@@ -91,6 +93,53 @@ describe('Select', () => {
       model.set_state({ index: 1, _options_labels: ['A', 'B', 'C'] });
       expect(view.listbox.selectedIndex).to.equal(1, 'order 2 failed');
     });
+
+    it('should render a window of a paged model', async () => {
+      const state = { page_size: 2, _options_length: 10, index: 5 };
+      const model = createTestModel(SelectModel, state);
+      const send = spy(model, 'send');
+      const view = await createTestView(model, SelectView);
+      // The window of two pages contains the selected index.
+      expect(view.listbox.options.length).to.equal(4);
+      expect(view.listbox.selectedIndex).to.equal(1);
+      expect(send.args.map((args) => args[0])).to.eql([
+        { event: 'request_labels', offset: 4, limit: 2 },
+        { event: 'request_labels', offset: 6, limit: 2 },
+      ]);
+      model.trigger('msg:custom', {
+        event: 'labels',
+        offset: 4,
+        labels: ['E', 'F'],
+      });
+      expect(view.listbox.options[1].value).to.equal('F');
+      expect(view.listbox.selectedIndex).to.equal(1);
+
+      view.listbox.selectedIndex = 3;
+      view._handle_change();
+      expect(model.get('index')).to.equal(7);
+    });
+
+    it('should show the results of the latest search', async () => {
+      const state = { _options_labels: ['A', 'B', 'AB'], searchable: true };
+      const model = createTestModel(SelectModel, state);
+      const view = await createTestView(model, SelectView);
+      const first = model.search('A');
+      const second = model.search('AB');
+      model.trigger('msg:custom', {
+        event: 'search_results',
+        id: 2,
+        indices: [2],
+        labels: ['AB'],
+      });
+      expect(await first).to.equal(null);
+      expect(await second).to.eql({ indices: [2], labels: ['AB'] });
+
+      view._results = await second;
+      view._updateOptions();
+      view.listbox.selectedIndex = 0;
+      view._handle_change();
+      expect(model.get('index')).to.equal(2);
+    });
   });
 });
 
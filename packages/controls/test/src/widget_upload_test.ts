@@ -142,4 +142,72 @@ describe('FileUploadView', function () {
       done();
     }, 100);
   });
+
+  it('uploads files in chunks', function (done) {
+    this.model.set({ chunked: true, chunk_size: 4 });
+    const sent: any[] = [];
+    this.model.send = (content: any, buffers?: ArrayBuffer[]): void => {
+      sent.push({ ...content, size: buffers ? buffers[0].byteLength : 0 });
+      if (content.event === 'upload_chunk') {
+        setTimeout(() => {
+          this.model.trigger('msg:custom', {
+            event: 'upload_ack',
+            id: content.id,
+          });
+        }, 0);
+      }
+    };
+    const fileInput = fileInputForModel(this.model);
+    const uploadedFile = new File(['0123456789'], 'some-name', {
+      type: 'text/plain',
+    });
+
+    simulateUpload(fileInput, [uploadedFile]);
+    setTimeout(() => {
+      const events = sent.map((msg) => [msg.event, msg.offset, msg.size]);
+      expect(events).to.deep.equal([
+        ['upload_start', undefined, 0],
+        ['upload_chunk', 0, 4],
+        ['upload_chunk', 4, 4],
+        ['upload_chunk', 8, 2],
+        ['upload_end', undefined, 0],
+      ]);
+      expect(sent[0].files[0].name).to.equal('some-name');
+      expect(sent[0].files[0].size).to.equal(10);
+      done();
+    }, 100);
+  });
+
+  it('does not send files the kernel holds', function (done) {
+    this.model.set({ dedupe: true, chunk_size: 4 });
+    const sent: any[] = [];
+    this.model.send = (content: any): void => {
+      sent.push(content);
+      if (content.event === 'lookup') {
+        setTimeout(() => {
+          this.model.trigger('msg:custom', {
+            event: 'lookup_result',
+            known: [true, false],
+          });
+        }, 0);
+      }
+    };
+    const fileInput = fileInputForModel(this.model);
+    const heldFile = new File(['0123456789'], 'held', { type: 'text/plain' });
+    const newFile = new File(['new'], 'new', { type: 'text/plain' });
+
+    simulateUpload(fileInput, [heldFile, newFile]);
+    setTimeout(async () => {
+      const digest = await widgets.digestFile(heldFile, 4);
+      expect(digest).to.match(/^4:[0-9a-f]{64}$/);
+      expect(sent[0].digests[0]).to.equal(digest);
+      const [held, uploaded] = this.model.get('value');
+      expect(held.digest).to.equal(digest);
+      expect(held.content).to.be.undefined;
+      expect(held.size).to.equal(10);
+      expect(uploaded.digest).to.be.undefined;
+      expect(uploaded.content.byteLength).to.equal(3);
+      done();
+    }, 100);
+  });
 });
@@ -38,7 +38,20 @@ export class OutputModel extends outputBase.OutputModel {
   }
 
   setOutputs(model?: any, value?: any, options?: any): void {
-    if (!(options && options.newMessage)) {
+    if (options && options.newMessage) {
+      return;
+    }
+    const previous = this.previous('outputs');
+    const added =
+      model && previous && previous.length === this._outputs.length
+        ? outputBase.appendedOutputs(previous, value)
+        : null;
+    if (added) {
+      // Only render the new outputs, e.g. text appended to a stream
+      for (const output of added) {
+        this._outputs.add(JSON.parse(JSON.stringify(output)));
+      }
+    } else {
       // fromJSON does not clear the existing output
       this.clear_output();
       // fromJSON does not copy the message, so we make a deep copy
@@ -12,8 +12,96 @@ export class OutputModel extends DOMWidgetModel {
       _view_module: '@jupyter-widgets/output',
       _model_module_version: OUTPUT_WIDGET_VERSION,
       _view_module_version: OUTPUT_WIDGET_VERSION,
+      msg_id: '',
+      _spilled_count: 0,
     };
   }
+
+  initialize(attributes: any, options: any): void {
+    super.initialize(attributes, options);
+    this._spilledRequests = new Map();
+    this._spilledResolves = new Map();
+    this.on('msg:custom', this._handle_spilled_msg, this);
+  }
+
+  /**
+   * Request outputs evicted by the kernel to its spill file, the oldest
+   * evicted output having index 0.
+   */
+  requestSpilled(offset: number, limit: number): Promise<any[]> {
+    let request = this._spilledRequests.get(offset);
+    if (!request) {
+      request = new Promise<any[]>((resolve) => {
+        this._spilledResolves.set(offset, resolve);
+      });
+      this._spilledRequests.set(offset, request);
+      this.send({ event: 'request_spilled', offset, limit });
+    }
+    return request;
+  }
+
+  private _handle_spilled_msg(content: any): void {
+    if (content.event === 'spilled') {
+      const resolve = this._spilledResolves.get(content.offset);
+      this._spilledRequests.delete(content.offset);
+      this._spilledResolves.delete(content.offset);
+      if (resolve) {
+        resolve(content.outputs);
+      }
+    }
+  }
+
+  private _spilledRequests: Map<number, Promise<any[]>>;
+  private _spilledResolves: Map<number, (outputs: any[]) => void>;
 }
 
 export class OutputView extends DOMWidgetView {}
+
+/**
+ * Compute the outputs to add to an output area holding the `previous`
+ * outputs, so that it holds the `current` outputs.
+ *
+ * This is possible when `current` only appends outputs to `previous`, or
+ * appends text to its last stream output. Output areas merge consecutive
+ * stream outputs of the same name, so the appended text is returned as a
+ * stream output. Unchanged outputs are compared by identity, which patches
+ * sent by the kernel preserve.
+ *
+ * Returns null when the output area must be reset to `current` instead.
+ */
+export function appendedOutputs(previous: any, current: any): any[] | null {
+  if (
+    !Array.isArray(previous) ||
+    !Array.isArray(current) ||
+    current.length < previous.length
+  ) {
+    return null;
+  }
+  const last = previous.length - 1;
+  for (let i = 0; i < last; i++) {
+    if (current[i] !== previous[i]) {
+      return null;
+    }
+  }
+  const added = current.slice(previous.length);
+  if (last >= 0 && current[last] !== previous[last]) {
+    const before = previous[last];
+    const after = current[last];
+    if (
+      before.output_type !== 'stream' ||
+      after.output_type !== 'stream' ||
+      before.name !== after.name ||
+      typeof before.text !== 'string' ||
+      typeof after.text !== 'string' ||
+      !after.text.startsWith(before.text)
+    ) {
+      return null;
+    }
+    added.unshift({
+      output_type: 'stream',
+      name: after.name,
+      text: after.text.slice(before.text.length),
+    });
+  }
+  return added;
+}
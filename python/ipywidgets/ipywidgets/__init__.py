@@ -43,6 +43,10 @@ def register_comm_target(kernel=None):
         return
     comm_manager.register_target('jupyter.widget', Widget.handle_comm_opened)
     comm_manager.register_target('jupyter.widget.control', Widget.handle_control_comm_opened)
+    if getattr(get_ipython(), 'kernel', None) is not None:
+        # The frontends connected before the import could not announce their
+        # capabilities on a control comm
+        Widget._request_capabilities()
 
 def _handle_ipython():
     """Register with the comm target at import if running in Jupyter"""
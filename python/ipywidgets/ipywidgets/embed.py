@@ -14,6 +14,7 @@ import json
 import re
 from .widgets import Widget, DOMWidget, widget as widget_module
 from .widgets.widget_link import Link
+from .widgets.widget_precomputed import PrecomputedOutputs
 from .widgets.docutils import doc_subst
 from ._version import __html_manager_version__
 
@@ -98,9 +99,11 @@ def _find_widget_refs_by_state(widget, state):
     keys = tuple(state.keys())
     for key in keys:
         value = getattr(widget, key)
-        # Trivial case: Direct references to other widgets:
+        # Trivial case: Direct references to other widgets, unless they are
+        # left out of the state because their comm is not open yet:
         if isinstance(value, Widget):
-            yield value
+            if state[key] is not None:
+                yield value
         # Also check for buried references in known, JSON-able structures
         # Note: This might miss references buried in more esoteric structures
         elif isinstance(value, (list, tuple)):
@@ -135,6 +138,15 @@ def add_resolved_links(store, drop_defaults):
                 store[widget.model_id] = widget._get_embed_state(drop_defaults=drop_defaults)
 
 
+def add_precomputed_outputs(store, drop_defaults):
+    """Adds the state of any precomputed outputs of the models in store"""
+    for widget_id, widget in widget_module._instances.items():
+        if isinstance(widget, PrecomputedOutputs) and widget_id not in store:
+            models = (widget.output,) + widget.controls
+            if all(model is not None and model.model_id in store for model in models):
+                store[widget.model_id] = widget._get_embed_state(drop_defaults=drop_defaults)
+
+
 def dependency_state(widgets, drop_defaults=True):
     """Get the state of all widgets specified, and their dependencies.
 
@@ -143,6 +155,7 @@ def dependency_state(widgets, drop_defaults=True):
      - any widget in a list/tuple attribute in the state of an included widget
      - any widget in a dict attribute in the state of an included widget
      - any jslink/jsdlink between two included widgets
+     - the precomputed outputs of an included interact
     What this alogorithm does not do:
      - Find widget references in nested list/dict structures
      - Find widget references in other types of attributes
@@ -178,6 +191,7 @@ def dependency_state(widgets, drop_defaults=True):
             _get_recursive_state(widget, state, drop_defaults)
         # Add any links between included widgets:
         add_resolved_links(state, drop_defaults)
+        add_precomputed_outputs(state, drop_defaults)
     return state
 
 
@@ -9,7 +9,7 @@ import shutil
 
 import traitlets
 
-from ..widgets import IntSlider, IntText, Text, Widget, jslink, HBox, widget_serialization, widget as widget_module
+from ..widgets import IntSlider, IntText, Text, Widget, jslink, HBox, interactive, widget_serialization, widget as widget_module
 from ..embed import embed_data, embed_snippet, embed_minimal_html, dependency_state
 
 
@@ -40,12 +40,23 @@ class TestEmbed:
         state = data['manager_state']['state']
         views = data['view_specs']
 
-        assert len(state) == 3
+        assert len(state) == 1
         assert len(views) == 1
 
         model_names = [s['model_name'] for s in state.values()]
         assert 'IntTextModel' in model_names
 
+    def test_embed_data_custom_layout(self):
+        w = IntText(4)
+        w.layout.width = '100px'
+        state = dependency_state(w, drop_defaults=True)
+        data = embed_data(views=w, drop_defaults=True, state=state)
+
+        state = data['manager_state']['state']
+        assert len(state) == 2
+        model_names = [s['model_name'] for s in state.values()]
+        assert 'LayoutModel' in model_names
+
     def test_cors(self):
         w = IntText(4)
         code = embed_snippet(w)
@@ -89,7 +100,7 @@ class TestEmbed:
         state = data['manager_state']['state']
         views = data['view_specs']
 
-        assert len(state) == 7
+        assert len(state) == 3
         assert len(views) == 2
 
         model_names = [s['model_name'] for s in state.values()]
@@ -116,7 +127,7 @@ class TestEmbed:
 
         state = dependency_state(w3)
 
-        assert len(state) == 9
+        assert len(state) == 5
 
         model_names = [s['model_name'] for s in state.values()]
         assert 'IntTextModel' in model_names
@@ -134,6 +145,17 @@ class TestEmbed:
         views = data['view_specs']
         assert len(views) == 1
 
+    def test_embed_data_precomputed(self):
+        w = interactive(lambda x: print(x), x=(0, 2))
+        w.precompute(processes=0)
+        state = dependency_state(w)
+
+        model_names = [s['model_name'] for s in state.values()]
+        assert 'PrecomputedOutputsModel' in model_names
+        [precomputed] = [s['state'] for s in state.values()
+                         if s['model_name'] == 'PrecomputedOutputsModel']
+        assert precomputed['outputs'][1] == [
+            {'output_type': 'stream', 'name': 'stdout', 'text': '1\n'}]
 
     def test_snippet(self):
 
@@ -156,7 +178,7 @@ class TestEmbed:
             def handle_data(self, data):
                 if self.state == 'widget-state':
                     manager_state = json.loads(data)['state']
-                    assert len(manager_state) == 3
+                    assert len(manager_state) == 1
                     self.states.append('check-widget-state')
                 elif self.state == 'widget-view':
                     view = json.loads(data)
@@ -22,10 +22,10 @@ from .widget_selection import RadioButtons, ToggleButtons, ToggleButtonsStyle, D
 from .widget_selectioncontainer import Tab, Accordion, Stack
 from .widget_string import HTML, HTMLMath, Label, Text, Textarea, Password, Combobox
 from .widget_controller import Controller
-from .interaction import interact, interactive, fixed, interact_manual, interactive_output
+from .interaction import interact, interactive, fixed, interact_manual, interactive_output, InteractCache
 from .widget_link import jslink, jsdlink
 from .widget_layout import Layout
-from .widget_media import Image, Video, Audio
+from .widget_media import Image, TiledImage, Video, Audio
 from .widget_tagsinput import TagsInput, ColorsInput, FloatsInput, IntsInput
 from .widget_style import Style
 from .widget_templates import TwoByTwoLayout, AppLayout, GridspecLayout
@@ -3,19 +3,37 @@
 
 """Interact with functions using widgets."""
 
+import asyncio
+from collections import OrderedDict
 from collections.abc import Iterable, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import itertools
 from enum import EnumMeta as EnumType
-from inspect import signature, Parameter
+from inspect import signature, iscoroutinefunction, Parameter
 from inspect import getcallargs
 from inspect import getfullargspec as check_argspec
+import hashlib
+import io
+import math
 import sys
+import threading
+import time
+import traceback
 
 from IPython import get_ipython
 from . import (Widget, ValueWidget, Text,
     FloatSlider, FloatText, IntSlider, IntText, Checkbox,
     Dropdown, VBox, Button, DOMWidget, Output)
+from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import display, clear_output
-from traitlets import HasTraits, Any, Unicode, observe
+from traitlets import HasTraits, Any, Bool, Unicode, observe
+from .widget_float import _BoundedFloat
+from .widget_int import _BoundedInt
+from .widget_media import Image
+from .widget_precomputed import PrecomputedOutputs
+from .widget_selection import _Selection
+from .widget_output import (_call_on_io_loop, _install_routing, _output_size, _output_stack,
+                            _uninstall_routing)
 from numbers import Real, Integral
 from warnings import warn
 
@@ -50,26 +68,345 @@ def show_inline_matplotlib_plots():
         flush_figures()
 
 
-def interactive_output(f, controls):
+class _UpdateScheduler:
+    """Call a function for the changes of the controls of an interact.
+
+    Parameters
+    ----------
+    callback : function
+        The function to call.
+    debounce : float
+        Wait until the controls did not change for this many milliseconds.
+    throttle : float
+        Call at most once every this many milliseconds. With ``debounce``,
+        this is the maximum time a change waits for.
+    latest_only : bool
+        Call from the event loop, skipping the calls superseded by changes
+        made before they run.
+
+    Calls are delayed with the asyncio event loop of the kernel. Without an
+    event loop running, or without any of these options, the function is
+    called right away.
+    """
+    def __init__(self, callback, debounce=0, throttle=0, latest_only=False):
+        self.callback = callback
+        self.debounce = debounce
+        self.throttle = throttle
+        self.latest_only = latest_only
+        self._handle = None
+        self._pending_since = None
+        self._last_call = -float('inf')
+
+    def __call__(self, *args):
+        now = time.monotonic()
+        if self._handle is not None:
+            # Skip the call superseded by this change
+            self._handle.cancel()
+            self._handle = None
+        if self._pending_since is None:
+            self._pending_since = now
+        delay = self.debounce / 1000
+        if self.throttle:
+            if self.debounce:
+                delay = min(delay, self._pending_since + self.throttle / 1000 - now)
+            else:
+                delay = self._last_call + self.throttle / 1000 - now
+        delay = max(delay, 0)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or not (delay or self.latest_only):
+            self._call()
+        else:
+            self._handle = loop.call_later(delay, self._call)
+
+    def _call(self):
+        self._handle = None
+        self._pending_since = None
+        self._last_call = time.monotonic()
+        self.callback()
+
+
+class _CapturedOutputs:
+    """Collect the outputs of a run of an interact function.
+
+    This is entered as a routed context of the output stack, like an
+    `Output` widget used in a thread, which collects the stdout and stderr
+    writes and the displayed outputs of the run.
+    """
+    def __init__(self):
+        self.outputs = []
+
+    def _write_routed(self, stream_name, text):
+        if self.outputs and self.outputs[-1].get('name') == stream_name:
+            self.outputs[-1]['text'] += text
+        else:
+            self.outputs.append({'output_type': 'stream', 'name': stream_name, 'text': text})
+
+    def _display_routed(self, data, metadata):
+        self.outputs.append({'output_type': 'display_data', 'data': data, 'metadata': metadata})
+
+    def _clear_routed(self, wait):
+        self.outputs.clear()
+
+
+def _run_captured(f, kwargs, show_plots=False):
+    """Call f, returning its result, outputs and traceback.
+
+    The stdout and stderr writes and the displayed outputs of f are
+    captured, and its matplotlib plots too with ``show_plots``, which only
+    works in the main thread.
+    """
+    captured = _CapturedOutputs()
+    _install_routing()
+    token = _output_stack.set(_output_stack.get() + ((captured, True),))
+    try:
+        result = f(**kwargs)
+        if show_plots:
+            show_inline_matplotlib_plots()
+        return result, captured.outputs, None
+    except Exception:
+        return None, captured.outputs, traceback.format_exc()
+    finally:
+        _output_stack.reset(token)
+        _uninstall_routing()
+
+
+async def _run_captured_async(f, kwargs):
+    """Await the coroutine function f, like `_run_captured` with show_plots.
+
+    The output stack is a context variable, so the outputs of the task
+    running f are captured, but not those of the other tasks. Cancelling
+    the task cancels f.
+    """
+    captured = _CapturedOutputs()
+    _install_routing()
+    token = _output_stack.set(_output_stack.get() + ((captured, True),))
+    try:
+        result = await f(**kwargs)
+        show_inline_matplotlib_plots()
+        return result, captured.outputs, None
+    except Exception:
+        return None, captured.outputs, traceback.format_exc()
+    finally:
+        _output_stack.reset(token)
+        _uninstall_routing()
+
+
+def _hash_array(array):
+    if array.dtype.hasobject:
+        raise TypeError('unhashable array of objects')
+    contiguous = sys.modules['numpy'].ascontiguousarray(array)
+    return ('ndarray', array.dtype.str, array.shape,
+            hashlib.blake2b(memoryview(contiguous).cast('B')).digest())
+
+
+def _hash_pandas(obj):
+    pd = sys.modules['pandas']
+    hashes = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+    columns = tuple(getattr(obj, 'columns', ()))
+    dtypes = str(getattr(obj, 'dtypes', getattr(obj, 'dtype', None)))
+    return (type(obj).__name__, columns, dtypes, hashlib.blake2b(hashes.tobytes()).digest())
+
+
+def _value_size(value):
+    """Approximate size of a result in bytes."""
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class InteractCache:
+    """A least recently used cache of the runs of an interact function.
+
+    An entry holds the result and the outputs of a call of the function, so
+    that calling it again with the same arguments replays them instead.
+
+    Parameters
+    ----------
+    max_entries : int
+        The maximum number of entries.
+    max_bytes : int
+        The maximum total size of the results and outputs of the entries,
+        approximately.
+    hashers : dict, optional
+        A dict mapping types to functions returning a hashable key for the
+        arguments of these types. NumPy arrays and pandas objects are hashed
+        by content, and other arguments must be hashable.
+    """
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024, hashers=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hashers = dict(hashers or {})
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _hash(self, value):
+        for cls in type(value).__mro__:
+            if cls in self.hashers:
+                return self.hashers[cls](value)
+        if 'numpy' in sys.modules and isinstance(value, sys.modules['numpy'].ndarray):
+            return _hash_array(value)
+        if 'pandas' in sys.modules and isinstance(
+                value, (sys.modules['pandas'].DataFrame, sys.modules['pandas'].Series,
+                        sys.modules['pandas'].Index)):
+            return _hash_pandas(value)
+        if isinstance(value, (list, tuple)):
+            return (type(value).__name__,) + tuple(self._hash(v) for v in value)
+        if isinstance(value, dict):
+            return ('dict',) + tuple((self._hash(k), self._hash(v)) for k, v in value.items())
+        hash(value)
+        # 1, 1.0 and True are equal but give different outputs
+        return (type(value), value)
+
+    def _key(self, kwargs):
+        """The key of the given arguments, raising TypeError if they are not hashable."""
+        return frozenset((name, self._hash(value)) for name, value in kwargs.items())
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[:2]
+
+    def _put(self, key, result, outputs):
+        size = _value_size(result) + _output_size(outputs)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[2]
+            self._entries[key] = (result, outputs, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def invalidate(self, **kwargs):
+        """Remove the entries of calls with the given arguments.
+
+        Without arguments, all the entries are removed. Otherwise, the
+        entries whose arguments include the given ones are removed.
+        """
+        items = {(name, self._hash(value)) for name, value in kwargs.items()}
+        with self._lock:
+            for key in [key for key in self._entries if items <= key]:
+                self.size -= self._entries.pop(key)[2]
+
+    def clear(self):
+        """Remove all the entries."""
+        self.invalidate()
+
+
+def _run_cached(cache, f, kwargs):
+    """Call f in the main thread, unless the cache holds the result of the call."""
+    try:
+        key = cache._key(kwargs)
+    except TypeError:
+        # Arguments which cannot be hashed are not cached
+        key = None
+    entry = cache._get(key) if key is not None else None
+    if entry is not None:
+        return entry + (None,)
+    show_inline_matplotlib_plots()
+    result, outputs, error = _run_captured(f, kwargs, show_plots=True)
+    if key is not None and error is None:
+        cache._put(key, result, outputs)
+    return result, outputs, error
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(executor):
+    """Return the executor for the executor option of interact."""
+    if isinstance(executor, Executor):
+        return executor
+    with _executors_lock:
+        if executor not in _executors:
+            cls = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}[executor]
+            _executors[executor] = cls()
+        return _executors[executor]
+
+
+def _finite_domain(widget):
+    """Return the synced trait of a control and the values it can take.
+
+    The values are (trait value, interact value) pairs. A ValueError is
+    raised for controls which can take an infinite number of values.
+    """
+    if isinstance(widget, _Selection):
+        return 'index', list(enumerate(widget._options_values))
+    if isinstance(widget.traits().get('value'), Bool):
+        return 'value', [(False, False), (True, True)]
+    if isinstance(widget, _BoundedInt):
+        step = getattr(widget, 'step', 1)
+        return 'value', [(v, v) for v in range(widget.min, widget.max + 1, step)]
+    if isinstance(widget, _BoundedFloat) and getattr(widget, 'step', None):
+        count = math.floor((widget.max - widget.min) / widget.step + 1e-9) + 1
+        values = [round(widget.min + i * widget.step, 12) for i in range(count)]
+        return 'value', [(v, v) for v in values]
+    raise ValueError("{!r} cannot take a finite number of values".format(widget))
+
+
+def _precompute_run(f, kwargs, auto_display):
+    """Return the outputs of a call of an interact function for precompute."""
+    if get_ipython() is None:
+        # Capture displayed outputs in processes without a shell
+        InteractiveShell.instance()
+    if iscoroutinefunction(f):
+        result, outputs, error = asyncio.run(_run_captured_async(f, kwargs))
+    else:
+        result, outputs, error = _run_captured(f, kwargs, show_plots=True)
+    if error is not None:
+        outputs.append({'output_type': 'stream', 'name': 'stderr', 'text': error})
+    elif auto_display and result is not None:
+        data, metadata = get_ipython().display_formatter.format(result)
+        outputs.append({'output_type': 'display_data', 'data': data, 'metadata': metadata})
+    return outputs
+
+
+def interactive_output(f, controls, debounce=0, throttle=0, latest_only=False, cache=None):
     """Connect widget controls to a function.
 
     This function does not generate a user interface for the widgets (unlike `interact`).
     This enables customisation of the widget user interface layout.
     The user interface layout must be defined and displayed manually.
+
+    The ``debounce``, ``throttle`` and ``latest_only`` options delay and skip
+    the calls of the function while the controls change, like the options of
+    the same names of `interact`. With an `InteractCache` as ``cache``, the
+    calls with the same arguments replay the outputs of the first one.
     """
 
     out = Output()
-    def observer(change):
+    def observer():
         kwargs = {k:v.value for k,v in controls.items()}
+        if cache is not None:
+            _, outputs, error = _run_cached(cache, f, kwargs)
+            out.outputs = tuple(outputs)
+            if error is not None:
+                out.append_stderr(error)
+            return
         show_inline_matplotlib_plots()
         with out:
             clear_output(wait=True)
             f(**kwargs)
             show_inline_matplotlib_plots()
+    scheduler = _UpdateScheduler(observer, debounce, throttle, latest_only)
     for k,w in controls.items():
-        w.observe(observer, 'value')
+        w.observe(scheduler, 'value')
     show_inline_matplotlib_plots()
-    observer(None)
+    observer()
     return out
 
 
@@ -147,11 +484,37 @@ class interactive(VBox):
     ----------
     __interact_f : function
         The function to which the interactive widgets are tied. The `**kwargs`
-        should match the function signature.
+        should match the function signature. Coroutine functions run as tasks
+        of the running event loop, and the task of a run is cancelled when
+        the controls change before it finishes.
     __options : dict
-        A dict of options. Currently, the only supported keys are
-        ``"manual"`` (defaults to ``False``), ``"manual_name"`` (defaults
-        to ``"Run Interact"``) and ``"auto_display"`` (defaults to ``False``).
+        A dict of options, with the keys:
+
+        * ``"manual"`` (defaults to ``False``): only call the function when
+          a button is clicked.
+        * ``"manual_name"`` (defaults to ``"Run Interact"``): the
+          description of the button.
+        * ``"auto_display"`` (defaults to ``False``): display the result of
+          the function.
+        * ``"debounce"`` (in milliseconds, defaults to ``0``): call the
+          function once the controls did not change for this time.
+        * ``"throttle"`` (in milliseconds, defaults to ``0``): call the
+          function at most once in this time. With ``"debounce"``, this is
+          the maximum time a change waits for.
+        * ``"latest_only"`` (defaults to ``False``): call the function from
+          the event loop, skipping the calls superseded by changes made
+          before they run.
+        * ``"executor"`` (defaults to ``None``): run the function in a
+          ``"thread"`` or ``"process"`` pool, or in a given
+          `concurrent.futures.Executor`. Its displayed outputs are
+          captured, but its matplotlib figures are not shown and must be
+          displayed with ``display(fig)``.
+        * ``"cache"`` (defaults to ``False``): replay the results and
+          outputs of the calls with the same arguments from an
+          `InteractCache`, or a new one if ``True``.
+        * ``"figure"`` (defaults to ``None``): a matplotlib figure which the
+          function updates, shown in an `Image` widget whose PNG value is
+          replaced after each call.
     **kwargs : various, optional
         An interactive widget is created for each keyword argument that is a
         valid widget abbreviation.
@@ -171,6 +534,31 @@ class interactive(VBox):
         self.manual = __options.get("manual", False)
         self.manual_name = __options.get("manual_name", "Run Interact")
         self.auto_display = __options.get("auto_display", False)
+        self.debounce = __options.get("debounce", 0)
+        self.throttle = __options.get("throttle", 0)
+        self.latest_only = __options.get("latest_only", False)
+        self.executor = __options.get("executor", None)
+        if not (self.executor is None or isinstance(self.executor, Executor)
+                or self.executor in ('thread', 'process')):
+            raise ValueError("invalid executor {!r}".format(self.executor))
+        if self.executor is not None and iscoroutinefunction(f):
+            raise ValueError("coroutine functions run in the event loop, not an executor")
+        self._future = None
+        self.cache = __options.get("cache", False)
+        if self.cache is True:
+            self.cache = InteractCache()
+        elif self.cache is False:
+            self.cache = None
+        self.figure = __options.get("figure", None)
+        if self.figure is not None:
+            if not hasattr(self.figure, 'savefig'):
+                raise ValueError("figure must be a matplotlib figure, not {!r}".format(self.figure))
+            if self.executor is not None or self.cache is not None:
+                raise ValueError("figure cannot be used with the executor or cache options")
+            if 'matplotlib.pyplot' in sys.modules:
+                # The figure is shown by the interact, not by the inline backend
+                sys.modules['matplotlib.pyplot'].close(self.figure)
+        self.precomputed = None
 
         new_kwargs = self.find_abbreviations(kwargs)
         # Before we proceed, let's make sure that the user has passed a set of args+kwargs
@@ -196,6 +584,12 @@ class interactive(VBox):
             self.manual_button = Button(description=self.manual_name)
             c.append(self.manual_button)
 
+        # The figure is drawn in the same image widget after each call, so
+        # that only the PNG bytes are sent for the changes of the controls
+        if self.figure is not None:
+            self.image = Image(format='png')
+            c.append(self.image)
+
         self.out = Output()
         c.append(self.out)
         self.children = c
@@ -214,8 +608,10 @@ class interactive(VBox):
                     w.continuous_update = False
                     w.observe(self.update, names='value')
         else:
+            self._scheduler = _UpdateScheduler(self.update, self.debounce,
+                                               self.throttle, self.latest_only)
             for widget in self.kwargs_widgets:
-                widget.observe(self.update, names='value')
+                widget.observe(self._scheduler, names='value')
             self.update()
 
     # Callback function
@@ -232,8 +628,24 @@ class interactive(VBox):
         self.kwargs = {}
         if self.manual:
             self.manual_button.disabled = True
+        if (self.executor is not None or self.cache is not None
+                or self.precomputed is not None or iscoroutinefunction(self.f)):
+            for widget in self.kwargs_widgets:
+                self.kwargs[widget._kwarg] = widget.get_interact_value()
+            outputs = self.precomputed.lookup() if self.precomputed is not None else None
+            if outputs is not None:
+                self._show(None, outputs, None)
+                return
+            elif self.executor is not None or iscoroutinefunction(self.f):
+                self._submit()
+                return
+            elif self.cache is not None:
+                self._show(*_run_cached(self.cache, self.f, self.kwargs))
+                return
+            # Values without precomputed outputs are run as usual
         try:
-            show_inline_matplotlib_plots()
+            if self.figure is None:
+                show_inline_matplotlib_plots()
             with self.out:
                 if self.clear_output:
                     clear_output(wait=True)
@@ -241,7 +653,10 @@ class interactive(VBox):
                     value = widget.get_interact_value()
                     self.kwargs[widget._kwarg] = value
                 self.result = self.f(**self.kwargs)
-                show_inline_matplotlib_plots()
+                if self.figure is None:
+                    show_inline_matplotlib_plots()
+                else:
+                    self._draw_figure()
                 if self.auto_display and self.result is not None:
                     display(self.result)
         except Exception as e:
@@ -254,6 +669,146 @@ class interactive(VBox):
             if self.manual:
                 self.manual_button.disabled = False
 
+    def _submit(self):
+        """Run the interact function in the executor.
+
+        The previous run is superseded: it is cancelled if it did not start,
+        and its result is discarded otherwise. Coroutine functions run as a
+        task of the running event loop instead, and the task of the previous
+        run is cancelled, which raises `asyncio.CancelledError` at the await
+        it is waiting on.
+        """
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        key = None
+        if self.cache is not None:
+            try:
+                key = self.cache._key(self.kwargs)
+            except TypeError:
+                pass
+            entry = self.cache._get(key) if key is not None else None
+            if entry is not None:
+                self._show(*entry, None)
+                return
+        if iscoroutinefunction(self.f):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Without an event loop running, run the coroutine to completion
+                self._future = future = Future()
+                future.set_result(asyncio.run(_run_captured_async(self.f, dict(self.kwargs))))
+                self._show_run(future, key)
+                return
+            self._future = future = loop.create_task(
+                _run_captured_async(self.f, dict(self.kwargs)))
+            future.add_done_callback(lambda future: self._show_run(future, key))
+            return
+        executor = _get_executor(self.executor)
+        self._future = future = executor.submit(_run_captured, self.f, dict(self.kwargs))
+        future.add_done_callback(
+            lambda future: _call_on_io_loop(lambda: self._show_run(future, key)))
+
+    def _show_run(self, future, key=None):
+        """Show the result of a run in the executor, unless superseded."""
+        if future is not self._future:
+            return
+        self._future = None
+        if future.cancelled():
+            if self.manual:
+                self.manual_button.disabled = False
+            return
+        try:
+            result, outputs, error = future.result()
+        except Exception:
+            # The function or its arguments could not be sent to the executor
+            result, outputs, error = None, [], traceback.format_exc()
+        if key is not None and error is None:
+            self.cache._put(key, result, outputs)
+        self._show(result, outputs, error)
+
+    def _show(self, result, outputs, error):
+        """Update the output widget with the result and outputs of a run."""
+        self.result = result
+        outputs = tuple(outputs)
+        self.out.outputs = outputs if self.clear_output else self.out.outputs + outputs
+        if error is not None:
+            self.out.append_stderr(error)
+        if self.auto_display and self.result is not None:
+            self.out.append_display_data(self.result)
+        if self.figure is not None:
+            self._draw_figure()
+        if self.manual:
+            self.manual_button.disabled = False
+
+    def _draw_figure(self):
+        """Draw the figure of the interact in its image widget.
+
+        Setting the value only sends the new PNG bytes, as a binary buffer,
+        and nothing if the figure did not change.
+        """
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format='png')
+        self.image.value = buffer.getvalue()
+
+    def precompute(self, processes=None, max_outputs=1000):
+        """Compute the outputs for all the values the controls can take.
+
+        This works when each control can take a finite number of values,
+        like checkboxes, selection widgets, and sliders with a step. The
+        function is called for each combination of values in a pool of
+        processes, and the outputs are then shown without calling it again,
+        also in the front-end alone. The interact can then be embedded in a
+        static HTML page, e.g. with `ipywidgets.embed.embed_minimal_html`.
+
+        Parameters
+        ----------
+        processes : int or None
+            The number of processes to use, or 0 to call the function in the
+            kernel. Defaults to the number of CPUs. The function and its
+            arguments must be picklable to use processes.
+        max_outputs : int
+            The maximum number of combinations of values to compute.
+
+        Returns
+        -------
+        The `PrecomputedOutputs` widget switching between the outputs.
+        """
+        if self.figure is not None:
+            raise ValueError("the figure of an interact cannot be precomputed")
+        controls, traits, domains = [], [], []
+        names, choices = [], []
+        for widget in self.kwargs_widgets:
+            names.append(widget._kwarg)
+            if isinstance(widget, fixed):
+                choices.append([widget.get_interact_value()])
+                continue
+            trait, domain = _finite_domain(widget)
+            controls.append(widget)
+            traits.append(trait)
+            domains.append([state for state, _ in domain])
+            choices.append([value for _, value in domain])
+        count = 1
+        for values in choices:
+            count *= len(values)
+        if count > max_outputs:
+            raise ValueError("The controls can take {} combinations of values, "
+                             "more than max_outputs={}".format(count, max_outputs))
+        calls = [dict(zip(names, values)) for values in itertools.product(*choices)]
+        if processes == 0:
+            outputs = [_precompute_run(self.f, kwargs, self.auto_display) for kwargs in calls]
+        else:
+            with ProcessPoolExecutor(processes) as executor:
+                outputs = list(executor.map(
+                    _precompute_run, itertools.repeat(self.f), calls,
+                    itertools.repeat(self.auto_display)))
+        if self.precomputed is not None:
+            self.precomputed.close()
+        self.precomputed = PrecomputedOutputs(
+            controls=controls, control_traits=traits, domains=domains, output=self.out,
+            outputs=outputs)
+        return self.precomputed
+
     # Find abbreviations
     def signature(self):
         return signature(self.f)
@@ -403,7 +958,9 @@ class interactive(VBox):
     # Return a factory for interactive functions
     @classmethod
     def factory(cls):
-        options = dict(manual=False, auto_display=True, manual_name="Run Interact")
+        options = dict(manual=False, auto_display=True, manual_name="Run Interact",
+                       debounce=0, throttle=0, latest_only=False, executor=None,
+                       cache=False, figure=None)
         return _InteractFactory(cls, options)
 
 
@@ -0,0 +1,193 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+"""Check that the default values left out of the comm_open state are the
+defaults of the frontend models, read from the TypeScript sources."""
+
+import pathlib
+import re
+
+import pytest
+
+from ..widget import Widget, _registry
+from ..widget_int import IntSlider
+from ..widget_link import Link
+from ..widget_selection import SelectionRangeSlider, SelectionSlider
+
+PACKAGES = pathlib.Path(__file__).resolve().parents[5] / 'packages'
+SOURCES = [PACKAGES / name / 'src' for name in ('base', 'controls', 'output')]
+
+JS_NAMES = {
+    'null': None,
+    'true': True,
+    'false': False,
+    'undefined': None,
+    'JUPYTER_WIDGETS_VERSION': '2.0.0',
+    'JUPYTER_CONTROLS_VERSION': '2.0.0',
+}
+
+# A value which cannot be read from the sources, e.g. `new DataView(...)`
+UNKNOWN = object()
+
+
+def _block(text, start, open='{', close='}'):
+    """The text between the bracket at start and its matching bracket."""
+    depth, quote = 0, None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '\'"`':
+            quote = ch
+        elif ch == open:
+            depth += 1
+        elif ch == close:
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i]
+    raise ValueError('unbalanced brackets')
+
+
+def _split(text):
+    """Split a list of arguments or object entries at top level commas."""
+    parts, depth, quote, current = [], 0, None, ''
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '\'"`':
+            quote = ch
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        current += ch
+    parts.append(current.strip())
+    return [part for part in parts if part]
+
+
+def _evaluate(expression):
+    expression = re.sub(r'\s+as\s+[\w\s|]+$', '', expression.strip())
+    try:
+        return eval(expression, {'__builtins__': {}}, dict(JS_NAMES))
+    except Exception:
+        return UNKNOWN
+
+
+class _Sources:
+    """The defaults of the models defined in the TypeScript sources."""
+
+    def __init__(self):
+        self.classes = {}
+        self.constants = {}
+        for directory in SOURCES:
+            for path in sorted(directory.glob('*.ts')):
+                text = re.sub(r'/\*.*?\*/', '', path.read_text(), flags=re.S)
+                text = re.sub(r'(?m)(^|[^:\'"])//.*$', r'\1', text)
+                for match in re.finditer(r'(?m)^(?:export )?(?:abstract )?class (\w+) extends (\w+)', text):
+                    body = _block(text, text.index('{', match.end()))
+                    self.classes[match.group(1)] = (match.group(2), body)
+                for match in re.finditer(r'(?m)^const (\w+)[^=\n]*= \{', text):
+                    self.constants[match.group(1)] = _block(text, match.end() - 1)
+
+    def _object(self, text, name, derived):
+        """The entries of an object literal in the defaults of a class."""
+        values = {}
+        for entry in _split(text):
+            if entry == '...super.defaults()':
+                values.update(self.defaults(self.classes[name][0], derived))
+            elif not entry.startswith('...'):
+                key, _, expression = entry.partition(':')
+                values[key.strip()] = _evaluate(expression)
+        return values
+
+    def style_defaults(self, name):
+        if name not in self.classes:
+            return {}
+        parent, body = self.classes[name]
+        match = re.search(r'static styleProperties\b[^=]*= \{', body)
+        if match is None:
+            return self.style_defaults(parent)
+        values = {}
+        for entry in _split(_block(body, match.end() - 1)):
+            spread = re.match(r'\.\.\.(\w+)\.styleProperties$', entry)
+            if spread:
+                values.update(self.style_defaults(spread.group(1)))
+            else:
+                key, _, prop = entry.partition(':')
+                prop = self._object(prop.strip()[1:-1], name, name)
+                values[key.strip()] = prop.get('default', UNKNOWN)
+        return values
+
+    def defaults(self, name, derived=None):
+        """The defaults of a model class, the style properties being those
+        of the derived class."""
+        derived = derived or name
+        if name not in self.classes:
+            return {}
+        parent, body = self.classes[name]
+        match = re.search(r'\bdefaults\(\)[^{]*\{[^{}]*?\breturn\s*', body)
+        if match is None:
+            return self.defaults(parent, derived)
+        if body[match.end()] == '{':
+            return self._object(_block(body, match.end()), name, derived)
+        call = re.match(r'(?:utils\.)?assign\(', body[match.end():])
+        values = {}
+        for argument in _split(_block(body, match.end() + call.end() - 1, '(', ')')):
+            if argument == 'super.defaults()':
+                values.update(self.defaults(parent, derived))
+            elif argument.startswith('{'):
+                values.update(self._object(argument[1:-1], name, derived))
+            elif argument in self.constants:
+                values.update(self._object(self.constants[argument], name, derived))
+            elif 'styleProperties' in argument:
+                values.update(self.style_defaults(derived))
+            else:
+                raise ValueError('unknown defaults of %s: %s' % (name, argument))
+        return values
+
+
+def _widgets():
+    for key, cls in sorted(_registry.items(), key=lambda item: item[0]):
+        if cls.__name__.startswith('_'):
+            continue
+        if issubclass(cls, Link):
+            yield cls(*[(IntSlider(), 'value') for _ in range(2)])
+        elif issubclass(cls, (SelectionRangeSlider, SelectionSlider)):
+            yield cls(options=[1])
+        else:
+            yield cls()
+
+
+def _same(a, b):
+    # JSON has a single number type, but booleans are not numbers
+    return a == b and isinstance(a, bool) == isinstance(b, bool)
+
+
+@pytest.mark.skipif(not PACKAGES.is_dir(), reason='requires the TypeScript sources')
+def test_dropped_defaults_match_frontend(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'drop_defaults'})
+    sources = _Sources()
+    mismatches = []
+    for w in _widgets():
+        if not w._drops_open_defaults():
+            continue
+        ts = sources.defaults(w._model_name)
+        state = w._get_open_state()
+        for key in w.keys:
+            if key in state:
+                continue
+            value = w.get_state(key)[key]
+            if key not in ts:
+                mismatches.append('%s.%s: %r, not in the frontend defaults'
+                                  % (w._model_name, key, value))
+            elif ts[key] is not UNKNOWN and not _same(ts[key], value):
+                mismatches.append('%s.%s: %r, frontend default %r'
+                                  % (w._model_name, key, value, ts[key]))
+    assert mismatches == []
+
@@ -3,9 +3,13 @@
 
 """Test interact and interactive."""
 
+from concurrent.futures import Executor, Future
 from unittest.mock import patch
 
+import asyncio
 import os
+import threading
+import time
 from enum import Enum
 from collections import OrderedDict
 import pytest
@@ -13,8 +17,8 @@ import pytest
 import ipywidgets as widgets
 
 from traitlets import TraitError, Float
-from ipywidgets import (interact, interact_manual, interactive,
-                        interaction, Output, Widget)
+from ipywidgets import (interact, interact_manual, interactive, fixed,
+                        interactive_output, interaction, Output, Widget)
 
 #-----------------------------------------------------------------------------
 # Utility stuff
@@ -658,3 +662,367 @@ def test_type_hints():
         },
     )
 
+
+
+def _run_changes(slider, values, pause=0):
+    """Change the value of slider in an event loop, pausing between changes."""
+    async def changes():
+        for value in values:
+            slider.value = value
+            await asyncio.sleep(pause)
+        await asyncio.sleep(0.1)
+    asyncio.run(changes())
+
+
+def test_interact_debounce():
+    calls = []
+    slider = widgets.IntSlider(value=0)
+    w = interact.options(debounce=50)(lambda x: calls.append(x), x=slider).widget
+    assert w.debounce == 50
+    calls.clear()
+    _run_changes(slider, [1, 2, 3, 4])
+    assert calls == [4]
+
+
+def test_interact_throttle():
+    calls = []
+    slider = widgets.IntSlider(value=0)
+    interact.options(throttle=40)(lambda x: calls.append(x), x=slider)
+    calls.clear()
+    # The first change is run right away, and the last one once the
+    # throttling period is over
+    _run_changes(slider, [1, 2, 3, 4])
+    assert calls == [1, 4]
+
+
+def test_interact_latest_only():
+    calls = []
+    slider = widgets.IntSlider(value=0)
+    interact.options(latest_only=True)(lambda x: calls.append(x), x=slider)
+    calls.clear()
+    _run_changes(slider, [1, 2, 3])
+    assert calls == [3]
+    # Without an event loop, the function is called right away
+    slider.value = 4
+    assert calls == [3, 4]
+
+
+def test_interactive_output_debounce():
+    calls = []
+    slider = widgets.IntSlider(value=0)
+    interactive_output(lambda x: calls.append(x), {'x': slider}, debounce=50)
+    _run_changes(slider, [1, 2], pause=0.01)
+    assert calls == [0, 2]
+
+
+class _InlineExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def test_interact_executor():
+    def square(x):
+        print('square of', x)
+        if x < 0:
+            raise ValueError('negative')
+        return x * x
+    slider = widgets.IntSlider(value=2, min=-5)
+    w = interact.options(executor=_InlineExecutor())(square, x=slider).widget
+    assert w.result == 4
+    assert w.out.outputs[0] == {'output_type': 'stream', 'name': 'stdout',
+                                'text': 'square of 2\n'}
+    assert w.out.outputs[1]['data']['text/plain'] == '4'
+
+    slider.value = -1
+    assert w.result is None
+    assert w.out.outputs[0]['text'] == 'square of -1\n'
+    assert w.out.outputs[1]['name'] == 'stderr'
+    assert 'ValueError: negative' in w.out.outputs[1]['text']
+
+
+def test_interact_executor_superseded():
+    started = threading.Event()
+    release = threading.Event()
+    def f(x):
+        if x == 1:
+            started.set()
+            release.wait(5)
+        return x
+    slider = widgets.IntSlider(value=1)
+    w = interact.options(executor='thread')(f, x=slider).widget
+    started.wait(5)
+    slider.value = 2
+    slider.value = 3
+    release.set()
+    deadline = time.monotonic() + 5
+    while w._future is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Only the result of the newest run is shown
+    assert w.result == 3
+    assert [o['data']['text/plain'] for o in w.out.outputs] == ['3']
+
+
+def test_interact_executor_display():
+    from IPython.core.interactiveshell import InteractiveShell
+    from IPython.display import HTML, clear_output, display
+    ip = InteractiveShell.instance()
+    display_pub = ip.display_pub
+    published = []
+    def f(x):
+        display(HTML('<b>lost</b>'))
+        clear_output()
+        display(HTML('<b>%d</b>' % x))
+    slider = widgets.IntSlider(value=1)
+    def publish(data, *args, **kwargs):
+        published.append(data)
+    with patch.object(display_pub, 'publish', publish):
+        w = interact.options(executor='thread')(f, x=slider).widget
+        deadline = time.monotonic() + 5
+        while w._future is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+    # The displayed outputs of the run are shown by the interact only
+    assert not any('<b>' in data.get('text/html', '') for data in published)
+    assert [o['data']['text/html'] for o in w.out.outputs] == ['<b>1</b>']
+    assert ip.display_pub is display_pub
+
+
+def test_interact_executor_bad():
+    with pytest.raises(ValueError):
+        interactive(f, {'executor': 'fiber'})
+    async def g(x):
+        return x
+    with pytest.raises(ValueError):
+        interactive(g, {'executor': 'thread'}, x=1)
+
+
+def test_interact_async():
+    async def square(x):
+        await asyncio.sleep(0)
+        print('square of', x)
+        return x * x
+    # Without an event loop, the coroutine is run to completion
+    slider = widgets.IntSlider(value=2)
+    w = interact(square, x=slider).widget
+    assert w.result == 4
+    assert w.out.outputs[0] == {'output_type': 'stream', 'name': 'stdout',
+                                'text': 'square of 2\n'}
+    assert w.out.outputs[1]['data']['text/plain'] == '4'
+
+    precomputed = interactive(square, x=(0, 2)).precompute(processes=0)
+    assert [o[0]['text'] for o in precomputed.outputs] == [
+        'square of 0\n', 'square of 1\n', 'square of 2\n']
+
+
+def test_interact_async_cancelled():
+    cancelled = []
+    async def f(x):
+        try:
+            await asyncio.sleep(1 if x == 1 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(x)
+            raise
+        print('x is', x)
+        return x
+    slider = widgets.IntSlider(value=0)
+    async def changes():
+        w = interactive(f, x=slider)
+        await asyncio.sleep(0.01)
+        slider.value = 1
+        await asyncio.sleep(0.01)
+        slider.value = 2
+        await asyncio.sleep(0.05)
+        return w
+    w = asyncio.run(changes())
+    # The run for 1 is cancelled at its await
+    assert cancelled == [1]
+    assert w.result == 2
+    assert w.out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': 'x is 2\n'},)
+
+
+def test_interact_async_overlap():
+    async def f(x):
+        print('before', x)
+        await asyncio.sleep(0.02)
+        print('after', x)
+        return x
+    async def runs():
+        first = interactive(f, x=widgets.IntSlider(value=1))
+        second = interactive(f, x=widgets.IntSlider(value=2))
+        # Both runs are awaiting at once
+        assert not first._future.done() and not second._future.done()
+        await asyncio.sleep(0.05)
+        return first, second
+    first, second = asyncio.run(runs())
+    # The writes of each task are captured separately
+    assert first.out.outputs == ({'output_type': 'stream', 'name': 'stdout',
+                                  'text': 'before 1\nafter 1\n'},)
+    assert second.out.outputs == ({'output_type': 'stream', 'name': 'stdout',
+                                   'text': 'before 2\nafter 2\n'},)
+
+
+def test_interact_figure():
+    mfigure = pytest.importorskip('matplotlib.figure')
+    fig = mfigure.Figure()
+    line, = fig.subplots().plot([0, 1], [0, 1])
+    def f(slope):
+        line.set_ydata([0, slope])
+    slider = widgets.FloatSlider(value=1)
+    w = interact.options(figure=fig)(f, slope=slider).widget
+    assert w.children[1] is w.image
+    first = bytes(w.image.value)
+    assert first.startswith(b'\x89PNG')
+    assert w.out.outputs == ()
+
+    slider.value = 2
+    assert bytes(w.image.value).startswith(b'\x89PNG')
+    assert bytes(w.image.value) != first
+    with pytest.raises(ValueError):
+        w.precompute(processes=0)
+    with pytest.raises(ValueError):
+        interactive(f, {'figure': fig, 'cache': True}, slope=1)
+
+
+def test_interact_figure_bad():
+    with pytest.raises(ValueError):
+        interactive(f, {'figure': object()})
+
+
+def test_interact_cache():
+    calls = []
+    def f(x, data):
+        calls.append(x)
+        print('x is', x)
+        return x * 2
+    slider = widgets.IntSlider(value=1)
+    w = interact.options(cache=True)(f, x=slider, data=fixed([1, 2])).widget
+    assert isinstance(w.cache, interaction.InteractCache)
+    outputs = w.out.outputs
+    assert outputs[0] == {'output_type': 'stream', 'name': 'stdout', 'text': 'x is 1\n'}
+    assert outputs[1]['data']['text/plain'] == '2'
+
+    slider.value = 2
+    slider.value = 1
+    # The first call is replayed from the cache
+    assert calls == [1, 2]
+    assert w.result == 2
+    assert w.out.outputs == outputs
+
+    w.cache.invalidate(x=1)
+    assert len(w.cache) == 1
+    slider.value = 2
+    slider.value = 1
+    assert calls == [1, 2, 1]
+    w.cache.clear()
+    assert len(w.cache) == 0
+
+
+def test_interact_cache_bounds():
+    cache = interaction.InteractCache(max_entries=2, max_bytes=1000)
+    slider = widgets.IntSlider(value=0)
+    interact.options(cache=cache)(lambda x: 'a' * 400 * x, x=slider)
+    slider.value = 1
+    assert len(cache) == 2
+    # The entries of 0 and 1 are evicted to make room for the one of 2
+    slider.value = 2
+    assert len(cache) == 1
+    slider.value = 0
+    slider.value = 1
+    assert len(cache) == 2
+    assert cache.size <= 1000
+    # The entry of 3 is too big to be cached
+    slider.value = 3
+    assert len(cache) == 2
+
+
+def test_interact_cache_hashers():
+    np = pytest.importorskip('numpy')
+    calls = []
+    hashed = []
+    cache = interaction.InteractCache(
+        hashers={Color: lambda color: hashed.append(color) or color.value})
+    w = interactive(lambda a, c: calls.append(c), {'cache': cache},
+                    a=fixed(np.arange(3)), c=fixed(Color.red))
+    # Equal arrays hit the cache
+    w.kwargs_widgets[0].value = np.arange(3)
+    assert calls == [Color.red]
+    w.kwargs_widgets[0].value = np.arange(4)
+    assert calls == [Color.red, Color.red]
+    assert hashed == [Color.red] * 3
+
+
+def test_interactive_output_cache():
+    calls = []
+    slider = widgets.IntSlider(value=0)
+    out = interactive_output(lambda x: calls.append(print(x)), {'x': slider},
+                             cache=interaction.InteractCache())
+    slider.value = 1
+    slider.value = 0
+    assert calls == [None, None]
+    assert out.outputs == ({'output_type': 'stream', 'name': 'stdout', 'text': '0\n'},)
+
+
+def test_interact_precompute():
+    calls = []
+    def f(x, flag, choice, c):
+        calls.append((x, flag, choice))
+        print(x, flag, choice, c)
+    w = interactive(f, x=(0, 2), flag=False, choice=['a', 'b'], c=fixed(5))
+    calls.clear()
+    precomputed = w.precompute(processes=0)
+    assert len(calls) == len(precomputed.outputs) == 12
+    assert precomputed.control_traits == ('value', 'value', 'index')
+    assert precomputed.domains == ([0, 1, 2], [False, True], [0, 1])
+    assert precomputed.output is w.out
+
+    calls.clear()
+    x, flag, choice = w.kwargs_widgets[:3]
+    x.value = 2
+    flag.value = True
+    choice.value = 'b'
+    # The precomputed outputs are shown instead of calling the function
+    assert calls == []
+    assert w.out.outputs == (
+        {'output_type': 'stream', 'name': 'stdout', 'text': '2 True b 5\n'},)
+    assert precomputed.lookup() is precomputed.outputs[-1]
+
+
+def test_interact_precompute_miss():
+    calls = []
+    def f(x):
+        calls.append(x)
+        print(x)
+    slider = widgets.IntSlider(min=0, max=4, step=2)
+    w = interactive(f, x=slider)
+    w.precompute(processes=0)
+    calls.clear()
+    # The slider can take values which were not precomputed
+    slider.value = 3
+    assert calls == [3]
+
+
+def test_interact_precompute_float():
+    w = interactive(lambda x: x, {'auto_display': True}, x=(0.0, 1.0, 0.25))
+    precomputed = w.precompute(processes=0)
+    assert precomputed.domains == ([0.0, 0.25, 0.5, 0.75, 1.0],)
+    assert precomputed.outputs[1][0]['data']['text/plain'] == '0.25'
+
+
+def test_interact_precompute_infinite():
+    w = interactive(f, text='hello')
+    with pytest.raises(ValueError):
+        w.precompute(processes=0)
+    w = interactive(f, x=(0, 100))
+    with pytest.raises(ValueError):
+        w.precompute(processes=0, max_outputs=10)
+
+
+def _double(x):
+    return 2 * x
+
+
+def test_interact_precompute_processes():
+    w = interactive(_double, {'auto_display': True}, x=(0, 3))
+    precomputed = w.precompute(processes=2)
+    assert [o[0]['data']['text/plain'] for o in precomputed.outputs] == ['0', '2', '4', '6']
@@ -1,11 +1,20 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 
-from traitlets import Bool, Tuple, List
+import asyncio
+import copy
+import threading
+import time
+import uuid
 
-from .utils import setup
+import pytest
+from traitlets import Bool, Dict, Int, Tuple, List, Unicode
 
-from ..widget import Widget
+from .utils import setup, DummyComm
+
+from .. import widget
+from ..widget import Widget, _apply_patch, _make_patch
+from ..widget_layout import Layout
 
 from ..._version import __control_protocol_version__
 
@@ -29,3 +38,431 @@ def test_empty_hold_sync():
     with w.hold_sync():
         pass
     assert w.comm.messages == []
+
+
+class CoalescingWidget(SimpleWidget):
+    _coalesce_sync = True
+
+
+def test_coalesce_without_event_loop():
+    w = CoalescingWidget()
+    w.a = True
+    w.c = [True]
+    assert len(w.comm.messages) == 2
+
+
+def test_coalesce_sends_one_update():
+    async def run():
+        w = CoalescingWidget()
+        w.a = True
+        w.b = (True, False, True)
+        w.c = [True]
+        assert w.comm.messages == []
+        await asyncio.sleep(0)
+        return w
+
+    w = asyncio.run(run())
+    assert len(w.comm.messages) == 1
+    msg = w.comm.messages[0][1]['data']
+    assert msg['method'] == 'update'
+    assert msg['state'] == {'a': True, 'b': (True, False, True), 'c': [True]}
+
+
+def test_coalesce_global_setting(monkeypatch):
+    monkeypatch.setattr(widget, 'JUPYTER_WIDGETS_COALESCE', True)
+
+    async def run():
+        w = SimpleWidget()
+        w.a = True
+        w.a = False
+        w.a = True
+        await asyncio.sleep(0)
+        return w
+
+    w = asyncio.run(run())
+    assert len(w.comm.messages) == 1
+    msg = w.comm.messages[0][1]['data']
+    assert msg['state'] == {'a': True}
+
+
+def test_coalesce_within_hold_sync():
+    async def run():
+        w = CoalescingWidget()
+        w.a = True
+        with w.hold_sync():
+            w.c = [True]
+        assert len(w.comm.messages) == 1
+        await asyncio.sleep(0)
+        return w
+
+    w = asyncio.run(run())
+    assert len(w.comm.messages) == 1
+    msg = w.comm.messages[0][1]['data']
+    assert msg['state'] == {'a': True, 'c': [True]}
+
+
+class ThrottledWidget(Widget):
+    value = Int().tag(sync=True, max_rate=20)
+
+
+def test_throttle_sends_latest_value():
+    async def run():
+        w = ThrottledWidget()
+        for i in range(1, 101):
+            w.value = i
+        assert len(w.comm.messages) == 1
+        await asyncio.sleep(0.1)
+        return w
+
+    w = asyncio.run(run())
+    states = [kwargs['data']['state'] for args, kwargs in w.comm.messages]
+    assert states == [{'value': 1}, {'value': 100}]
+
+
+def test_throttle_does_not_delay_spaced_updates():
+    async def run():
+        w = ThrottledWidget()
+        w.value = 1
+        await asyncio.sleep(0.06)
+        w.value = 2
+        return w
+
+    w = asyncio.run(run())
+    states = [kwargs['data']['state'] for args, kwargs in w.comm.messages]
+    assert states == [{'value': 1}, {'value': 2}]
+
+
+def test_throttle_in_thread():
+    # Without an event loop, the trailing update is sent by a timer thread
+    w = ThrottledWidget()
+
+    def work():
+        for i in range(1, 2001):
+            w.value = i
+
+    start = time.monotonic()
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    elapsed = time.monotonic() - start
+    time.sleep(0.2)
+    states = [kwargs['data']['state'] for args, kwargs in w.comm.messages]
+    assert states[0] == {'value': 1}
+    assert states[-1] == {'value': 2000}
+    assert len(states) <= 2 + elapsed * 20
+
+
+def test_throttle_blocked_event_loop():
+    # Updates are still sent at the rate while a loop blocks the event loop
+    async def run():
+        w = ThrottledWidget()
+        start = time.monotonic()
+        i = 0
+        while time.monotonic() - start < 0.5:
+            i += 1
+            w.value = i
+        sent = len(w.comm.messages)
+        await asyncio.sleep(0.1)
+        return w, sent, i
+
+    w, sent, last = asyncio.run(run())
+    assert 5 <= sent <= 12
+    assert w.comm.messages[-1][1]['data']['state'] == {'value': last}
+
+
+class PatchWidget(Widget):
+    items = List().tag(sync=True, patch=True)
+    mapping = Dict().tag(sync=True, patch=True)
+
+
+@pytest.fixture
+def patch_capability(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'patch'})
+
+
+def update_messages(w):
+    return [kwargs['data'] for args, kwargs in w.comm.messages]
+
+
+def test_make_patch():
+    assert _make_patch([1, 2, 3], [1, 2, 3]) == []
+    assert _make_patch([1, 2, 3], [1, 2, 3, 4]) == [
+        {'op': 'splice', 'index': 3, 'remove': 0, 'insert': [4]}]
+    assert _make_patch([1, 2, 3, 4], [1, 4]) == [
+        {'op': 'splice', 'index': 1, 'remove': 2, 'insert': []}]
+    assert _make_patch([1, 1, 1], [1, 1]) == [
+        {'op': 'splice', 'index': 2, 'remove': 1, 'insert': []}]
+    assert _make_patch([1, 2], [3, 4]) is None
+    assert _make_patch({'a': 1, 'b': 2, 'c': 3, 'd': 4}, {'a': 1, 'b': 3, 'd': 4}) == [
+        {'op': 'delete', 'key': 'c'}, {'op': 'set', 'key': 'b', 'value': 3}]
+    assert _make_patch({'a': 1}, {'b': 1}) is None
+    assert _make_patch([1], {'a': 1}) is None
+
+
+def test_make_patch_append():
+    assert _make_patch({'a': 1, 'text': 'ab'}, {'a': 1, 'text': 'abcd'}) == [
+        {'op': 'append', 'key': 'text', 'value': 'cd'}]
+    assert _make_patch({'text': 'ab'}, {'text': 'abc'}) == [
+        {'op': 'append', 'key': 'text', 'value': 'c'}]
+    assert _make_patch({'a': 1, 'text': 'ab'}, {'a': 1, 'text': 'ba'}) == [
+        {'op': 'set', 'key': 'text', 'value': 'ba'}]
+    old = [{'name': 'stdout', 'text': 'a'}, {'name': 'stderr', 'text': 'b'}]
+    new = [old[0], {'name': 'stderr', 'text': 'bc'}]
+    assert _make_patch(old, new) == [{'op': 'patch', 'index': 1, 'ops': [
+        {'op': 'append', 'key': 'text', 'value': 'c'}]}]
+    new = [old[0], {'name': 'stdout', 'text': 'c'}]
+    assert _make_patch(old, new) == [
+        {'op': 'splice', 'index': 1, 'remove': 1, 'insert': [new[1]]}]
+
+
+def test_apply_patch():
+    for old, new in [([1, 2, 3], [1, 4]), ([1, 2, 3, 4], [3, 4, 5]),
+                     ({'a': 1, 'b': 2, 'c': 3, 'd': 4}, {'a': 1, 'b': 3, 'd': 4}),
+                     ([{'text': 'a'}, 1], [{'text': 'ab'}, 1])]:
+        base = copy.deepcopy(old)
+        assert _apply_patch(base, _make_patch(old, new)) == new
+    nested = {'text': 'a'}
+    base = [nested]
+    _apply_patch(base, [{'op': 'patch', 'index': 0, 'ops': [
+        {'op': 'append', 'key': 'text', 'value': 'b'}]}])
+    assert base == [{'text': 'ab'}]
+    assert nested == {'text': 'a'}
+
+
+def test_patch_without_capability():
+    w = PatchWidget(items=[1, 2])
+    w.items = [1, 2, 3]
+    assert update_messages(w) == [
+        {'method': 'update', 'state': {'items': [1, 2, 3]}, 'buffer_paths': []}]
+
+
+def test_patch_list(patch_capability):
+    w = PatchWidget(items=[1, 2])
+    w.items = [1, 2, 3]
+    w.items = [0, 1, 2, 3]
+    assert update_messages(w) == [
+        {'method': 'update', 'state': {'items': [1, 2, 3]}, 'buffer_paths': [],
+         'versions': {'items': 1}},
+        {'method': 'update', 'state': {}, 'buffer_paths': [],
+         'patches': {'items': {'base': 1, 'version': 2, 'ops': [
+             {'op': 'splice', 'index': 0, 'remove': 0, 'insert': [0]}]}}},
+    ]
+
+
+def test_patch_dict(patch_capability):
+    w = PatchWidget()
+    w.mapping = {'a': 1, 'b': 2}
+    w.mapping = {'a': 1, 'b': 2, 'c': 3}
+    assert update_messages(w)[-1]['patches'] == {
+        'mapping': {'base': 1, 'version': 2, 'ops': [{'op': 'set', 'key': 'c', 'value': 3}]}}
+
+
+def test_patch_request_state_sends_full_values(patch_capability):
+    w = PatchWidget()
+    w.items = [1]
+    w.comm.messages.clear()
+    w._handle_msg({'content': {'data': {'method': 'request_state'}}})
+    msg, = update_messages(w)
+    assert msg['state']['items'] == [1]
+    assert msg['versions'] == {'items': 2, 'mapping': 1}
+
+
+def test_patch_against_frontend_value(patch_capability):
+    w = PatchWidget()
+    w.items = [1]
+    w.set_state({'items': [1, 2]})
+    w.items = [1, 2, 3]
+    echo, update = update_messages(w)[1:]
+    assert echo['method'] == 'echo_update'
+    assert echo['versions'] == {'items': 2}
+    assert update['patches'] == {'items': {'base': 2, 'version': 3, 'ops': [
+        {'op': 'splice', 'index': 2, 'remove': 0, 'insert': [3]}]}}
+
+
+def test_patch_without_echo(patch_capability, monkeypatch):
+    monkeypatch.setattr(widget, 'JUPYTER_WIDGETS_ECHO', False)
+    w = PatchWidget()
+    w.items = [1]
+    w.set_state({'items': [1, 2]})
+    w.items = [1, 2, 3]
+    msg = update_messages(w)[-1]
+    assert msg['state'] == {'items': [1, 2, 3]}
+    assert msg['versions'] == {'items': 2}
+
+
+class ControlComm(DummyComm):
+    """A comm recording its arguments and callbacks."""
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.comm_id = uuid.uuid4().hex
+        self.kwargs = kwargs
+        self.msg_callbacks = []
+        self.close_callbacks = []
+
+    def on_msg(self, callback):
+        self.msg_callbacks.append(callback)
+
+    def on_close(self, callback):
+        self.close_callbacks.append(callback)
+
+
+@pytest.fixture
+def control_comms(monkeypatch):
+    """Record the comms created by the kernel."""
+    monkeypatch.setattr(Widget, '_frontend_capabilities', None)
+    monkeypatch.setattr(Widget, '_control_comm', None)
+    monkeypatch.setattr(Widget, '_capabilities_comm', None)
+    monkeypatch.setattr(Widget, '_capabilities_replied', None)
+    comms = []
+
+    def create_comm(**kwargs):
+        comms.append(ControlComm(**kwargs))
+        return comms[-1]
+
+    monkeypatch.setattr(widget.comm, 'create_comm', create_comm)
+    return comms
+
+
+def reply_capabilities(control_comm, capabilities):
+    for callback in control_comm.msg_callbacks:
+        callback({'content': {'data': {
+            'method': 'capabilities', 'capabilities': capabilities}}})
+
+
+def test_capabilities_requested_at_import(control_comms, monkeypatch):
+    import ipywidgets
+    targets = {}
+
+    class CommManager:
+        def register_target(self, name, callback):
+            targets[name] = callback
+
+    # A frontend connected to the kernel before ipywidgets is imported
+    monkeypatch.setattr(ipywidgets, 'get_ipython', lambda: type('Shell', (), {'kernel': object()})())
+    monkeypatch.setattr(ipywidgets.comm, 'get_comm_manager', CommManager)
+    ipywidgets.register_comm_target()
+    assert set(targets) == {'jupyter.widget', 'jupyter.widget.control'}
+    request = control_comms[-1]
+    assert request.kwargs['target_name'] == 'jupyter.widget.control'
+    assert request.kwargs['data'] == {'method': 'request_capabilities'}
+    assert Widget._frontend_capabilities is None
+    reply_capabilities(request, ['patch', 'drop_defaults'])
+
+    # Default values are left out of the state opening the models
+    layout = Layout(width='10px')
+    state = control_comms[-1].kwargs['data']['state']
+    assert state['width'] == '10px' and 'height' not in state
+    # and changes are sent as patches
+    w = PatchWidget()
+    w.items = [1, 2]
+    w.items = [1, 2, 3]
+    assert update_messages(w)[-1]['patches'] == {'items': {'base': 1, 'version': 2, 'ops': [
+        {'op': 'splice', 'index': 2, 'remove': 0, 'insert': [3]}]}}
+
+
+def test_capabilities_request_closed(control_comms):
+    Widget._request_capabilities()
+    request = control_comms[-1]
+    reply_capabilities(request, ['patch'])
+    assert Widget._frontend_capabilities == {'patch'}
+    # A frontend without the control comm target closes the comm
+    for callback in request.close_callbacks:
+        callback(None)
+    assert Widget._frontend_capabilities == set()
+
+
+def test_capabilities_forgotten(control_comms):
+    def open_control_comm(capabilities):
+        metadata = {'version': __control_protocol_version__, 'capabilities': capabilities}
+        Widget.handle_control_comm_opened(DummyComm(), {'metadata': metadata})
+
+    open_control_comm([])
+    open_control_comm(['patch'])
+    # The frontend without the capability is gone when only the others reply
+    assert Widget._frontend_capabilities == set()
+    request = control_comms[-1]
+    reply_capabilities(request, ['patch', 'drop_defaults'])
+    assert Widget._frontend_capabilities == {'patch'}
+    # Replies to previous requests are ignored
+    reply_capabilities(control_comms[-2], [])
+    assert Widget._frontend_capabilities == {'patch'}
+
+
+def test_control_comm_capabilities(control_comms):
+
+    def open_control_comm(capabilities=None):
+        metadata = {'version': __control_protocol_version__}
+        if capabilities is not None:
+            metadata['capabilities'] = capabilities
+        Widget.handle_control_comm_opened(DummyComm(), {'metadata': metadata})
+
+    open_control_comm(['patch'])
+    assert Widget._frontend_capabilities == {'patch'}
+    # A frontend without the capability disables it for all frontends
+    open_control_comm()
+    assert Widget._frontend_capabilities == set()
+    open_control_comm(['patch'])
+    assert Widget._frontend_capabilities == set()
+
+
+def test_request_states_drops_defaults(control_comms, monkeypatch):
+    monkeypatch.setattr(widget, '_instances', {})
+    layout = Layout(width='10px')
+    frontend = ControlComm()
+    metadata = {'version': __control_protocol_version__, 'capabilities': ['drop_defaults']}
+    Widget.handle_control_comm_opened(frontend, {'metadata': metadata})
+
+    def request_states():
+        for callback in frontend.msg_callbacks:
+            callback({'content': {'data': {'method': 'request_states'}}})
+        (msg,), kwargs = frontend.messages[-1]
+        return msg['states'][layout.model_id]
+
+    # The frontend announced the capability when opening the control comm
+    state = request_states()
+    assert state['drop_defaults'] is True
+    assert state['state']['width'] == '10px' and 'height' not in state['state']
+    # Another frontend replies to the request of the kernel without it
+    reply_capabilities(control_comms[-1], ['patch'])
+    state = request_states()
+    assert 'drop_defaults' not in state
+    assert state['state']['height'] is None
+
+
+def test_open_state_without_capability():
+    w = SimpleWidget()
+    assert w._get_open_state() == w.get_state()
+
+
+def test_open_state_drops_core_defaults(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'drop_defaults'})
+    layout = Layout(width='10px')
+    state = layout._get_open_state()
+    assert state == {
+        '_model_module': '@jupyter-widgets/base',
+        '_model_module_version': '2.0.0',
+        '_model_name': 'LayoutModel',
+        '_view_module': '@jupyter-widgets/base',
+        '_view_module_version': '2.0.0',
+        '_view_name': 'LayoutView',
+        'width': '10px',
+    }
+
+
+def test_open_state_keeps_custom_defaults(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'drop_defaults'})
+
+    class CustomLayout(Layout):
+        __module__ = 'custom'
+        extra = Int(1).tag(sync=True)
+
+    class CustomWidget(SimpleWidget):
+        _model_module = Unicode('custom').tag(sync=True)
+
+    class CustomWidgetWithDefaults(CustomWidget):
+        _frontend_defaults = True
+
+    assert CustomLayout()._get_open_state()['extra'] == 1
+    assert 'width' not in CustomLayout()._get_open_state()
+    assert CustomWidget()._get_open_state() == CustomWidget().get_state()
+    assert 'a' not in CustomWidgetWithDefaults()._get_open_state()
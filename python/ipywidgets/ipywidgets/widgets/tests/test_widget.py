@@ -6,6 +6,7 @@
 import inspect
 
 import pytest
+from traitlets import Int, Unicode
 from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import display
 from IPython.utils.capture import capture_output
@@ -88,4 +89,108 @@ def test_widget_copy():
     with pytest.raises(NotImplementedError):
         copy.copy(button)
     with pytest.raises(NotImplementedError):
-        copy.deepcopy(button)
\ No newline at end of file
+        copy.deepcopy(button)
+
+def test_sync_plan():
+    class A(Widget):
+        a = Int().tag(sync=True)
+        b = Int()
+
+    class B(A):
+        c = Unicode().tag(sync=True, echo_update=False)
+
+    plan = B._get_sync_plan()
+    assert B._get_sync_plan() is plan
+    assert A._get_sync_plan() is not plan
+    assert plan.keys == list(B.class_traits(sync=True))
+    assert 'c' in plan.keys and 'c' not in A._get_sync_plan().keys
+    assert 'c' not in plan.echo_update
+    assert B().keys == plan.keys
+
+
+def test_sync_plan_add_traits():
+    w = Widget()
+    w.add_traits(x=Int(1).tag(sync=True))
+    assert 'x' in w.keys
+    assert w.get_state('x') == {'x': 1}
+    w.set_state({'x': 2})
+    assert w.x == 2
+
+
+def test_default_layout_is_deferred():
+    from .utils import setup_test_comm, teardown_test_comm
+    setup_test_comm()
+    try:
+        w = Button()
+        assert w.layout.comm is None
+        assert w.style.comm is None
+        assert w.get_state()['layout'] is None
+
+        w.layout.width = '10px'
+        assert w.layout.comm is not None
+        ref = 'IPY_MODEL_' + w.layout.model_id
+        assert w.get_state()['layout'] == ref
+        # The owner points its frontend model at the newly opened layout.
+        assert w.comm.messages[-1][1]['data']['state'] == {'layout': ref}
+
+        assert w.style.model_id
+        assert w.style.comm is not None
+    finally:
+        teardown_test_comm()
+
+
+def test_deferred_layout_in_non_core_widget():
+    from .utils import setup_test_comm, teardown_test_comm
+    from ..domwidget import DOMWidget
+    setup_test_comm()
+    try:
+        class Custom(DOMWidget):
+            _model_module = Unicode('custom').tag(sync=True)
+
+        w = Custom()
+        assert w.layout.comm is not None
+        assert w.get_state()['layout'] == 'IPY_MODEL_' + w.layout.model_id
+    finally:
+        teardown_test_comm()
+
+
+def test_deferred_layout_set_state_none():
+    from .utils import setup_test_comm, teardown_test_comm
+    setup_test_comm()
+    try:
+        w = Button()
+        layout = w.layout
+        w.set_state({'layout': None})
+        assert w.layout is layout
+        assert layout.comm is None
+    finally:
+        teardown_test_comm()
+
+
+def test_shared_layout():
+    from traitlets import TraitError
+    from ..widget_layout import Layout
+    from ..widget_button import ButtonStyle
+    from .utils import setup_test_comm, teardown_test_comm
+    setup_test_comm()
+    try:
+        a = Layout.shared(width='100%')
+        assert Layout.shared(width='100%') is a
+        assert Layout.shared(width='50%') is not a
+        assert ButtonStyle.shared(button_color='red') is ButtonStyle.shared(button_color='red')
+        assert a.comm is not None
+
+        buttons = [Button(layout=a) for _ in range(3)]
+        assert all(b.layout is a for b in buttons)
+        with pytest.raises(TraitError):
+            buttons[0].layout.width = '50%'
+        assert a.width == '100%'
+
+        # Assigning a new layout detaches one widget from the shared one.
+        buttons[0].layout = Layout.shared(width='50%')
+        assert buttons[1].layout.width == '100%'
+
+        a.close()
+        assert Layout.shared(width='100%') is not a
+    finally:
+        teardown_test_comm()
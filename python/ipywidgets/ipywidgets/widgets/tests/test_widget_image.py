@@ -4,15 +4,22 @@
 """Test Image widget"""
 
 import io
+import mmap
 import os
 
-from ipywidgets import Image
+import pytest
+
+from ipywidgets import Image, TiledImage
+from ipywidgets.widgets.widget import _remove_buffers
+
+from .utils import setup_test_comm, teardown_test_comm
 
 import hashlib
 
 import pkgutil
 
 import tempfile
+import weakref
 from contextlib import contextmanager
 
 # Data
@@ -84,6 +91,56 @@ def test_set_value_from_file():
             assert_equal_hash(img.value, LOGO_PNG_DIGEST)
 
 
+def test_from_filename_mmap():
+    with get_logo_png() as LOGO_PNG:
+        img = Image.from_file(LOGO_PNG, mmap=True)
+        assert isinstance(img.value.obj, mmap.mmap)
+        assert img.value.readonly
+        assert_equal_hash(img.value, LOGO_PNG_DIGEST)
+
+        # The mapped memory is sent as a buffer, without copies
+        state, buffer_paths, buffers = _remove_buffers(img.get_state())
+        assert buffer_paths == [['value']]
+        assert buffers[0].obj is img.value.obj
+
+        mapped = weakref.ref(img.value.obj)
+        img.close()
+        assert img.value.nbytes == 0
+        del state, buffers
+        assert mapped() is None
+
+
+def test_set_value_from_file_mmap():
+    img = Image()
+    with get_logo_png() as LOGO_PNG:
+        with open(LOGO_PNG, 'rb') as f:
+            img.set_value_from_file(f, mmap=True)
+        assert isinstance(img.value.obj, mmap.mmap)
+        assert_equal_hash(img.value, LOGO_PNG_DIGEST)
+        img.close()
+
+    # The value starts at the position of the file
+    with tempfile.TemporaryFile() as f:
+        data = bytes(range(256)) * (2 * mmap.ALLOCATIONGRANULARITY // 256 + 1)
+        f.write(data)
+        for position in (1, mmap.ALLOCATIONGRANULARITY + 3, len(data)):
+            f.seek(position)
+            img.set_value_from_file(f, mmap=True)
+            assert img.value == data[position:]
+            assert f.tell() == len(data)
+
+    # Streams without a file descriptor are read
+    img.set_value_from_file(io.BytesIO(b'abc'), mmap=True)
+    assert img.value == b'abc'
+
+    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
+        name = f.name
+    try:
+        assert Image.from_file(name, mmap=True).value == b''
+    finally:
+        os.remove(name)
+
+
 def test_from_url_unicode():
     img = Image.from_url('https://jupyter.org/assets/main-logo.svg')
     assert img.value == b'https://jupyter.org/assets/main-logo.svg'
@@ -171,3 +228,108 @@ def get_hash_hex(byte_str):
 
 def assert_equal_hash(byte_str, digest):
     assert get_hash_hex(byte_str) == digest
+
+
+def _custom_msgs(img):
+    return [(kwargs['data']['content'], kwargs['buffers'])
+            for args, kwargs in img.comm.messages
+            if kwargs['data']['method'] == 'custom']
+
+
+def _ack(img, frame_id):
+    img._handle_msg({'content': {'data': {'method': 'custom', 'content': {
+        'event': 'frame_ack', 'id': frame_id}}}, 'buffers': []})
+
+
+def test_push_frame():
+    setup_test_comm()
+    try:
+        img = Image()
+        img.push_frame(b'frame 1')
+        img.push_frame(b'frame 2')
+        img.push_frame(b'frame 3')
+        # Frames wait for the acknowledgement of the first one
+        msgs = _custom_msgs(img)
+        assert [content for content, buffers in msgs] == [{'event': 'frame', 'id': 1}]
+        assert msgs[0][1][0] == b'frame 1'
+        assert img.frames_dropped == 1
+
+        # Stale acknowledgements are ignored
+        _ack(img, 0)
+        assert len(_custom_msgs(img)) == 1
+        _ack(img, 1)
+        content, buffers = _custom_msgs(img)[-1]
+        assert content == {'event': 'frame', 'id': 2}
+        assert buffers[0] == b'frame 3'
+        _ack(img, 2)
+        assert img.fps > 0
+        assert img.value == b''
+
+        img.push_frame(b'frame 4')
+        assert _custom_msgs(img)[-1][1][0] == b'frame 4'
+    finally:
+        teardown_test_comm()
+
+
+def test_push_frame_timeout():
+    setup_test_comm()
+    try:
+        img = Image(frame_timeout=0)
+        img.push_frame(b'frame 1')
+        img.push_frame(b'frame 2')
+        assert len(_custom_msgs(img)) == 2
+        assert img.frames_dropped == 0
+    finally:
+        teardown_test_comm()
+
+
+def test_tiled_image():
+    np = pytest.importorskip('numpy')
+    setup_test_comm()
+    try:
+        img = TiledImage(tile_size=4)
+        pixels = np.zeros((6, 10, 3), dtype=np.uint8)
+        img.update_array(pixels)
+        assert img.shape == (6, 10)
+        content, buffers = _custom_msgs(img)[-1]
+        assert content['event'] == 'tiles'
+        assert content['channels'] == 3
+        assert content['tiles'] == [
+            [0, 0, 4, 4], [4, 0, 4, 4], [8, 0, 2, 4],
+            [0, 4, 4, 2], [4, 4, 4, 2], [8, 4, 2, 2]]
+        assert [b.nbytes for b in buffers] == [48, 48, 24, 24, 24, 12]
+
+        # Only the changed tiles are sent
+        pixels[5, 9] = [1, 2, 3]
+        img.update_array(pixels)
+        content, buffers = _custom_msgs(img)[-1]
+        assert content['tiles'] == [[8, 4, 2, 2]]
+        assert buffers[0].tobytes() == bytes(9) + bytes([1, 2, 3])
+        count = len(_custom_msgs(img))
+        img.update_array(pixels)
+        assert len(_custom_msgs(img)) == count
+
+        # New frontends request all the tiles
+        img._handle_msg({'content': {'data': {'method': 'custom', 'content': {
+            'event': 'request_tiles'}}}, 'buffers': []})
+        assert len(_custom_msgs(img)[-1][0]['tiles']) == 6
+
+        with pytest.raises(ValueError):
+            img.update_array(np.zeros((2, 2), dtype=float))
+    finally:
+        teardown_test_comm()
+
+
+def test_tiled_image_png():
+    np = pytest.importorskip('numpy')
+    PILImage = pytest.importorskip('PIL.Image')
+    setup_test_comm()
+    try:
+        img = TiledImage(encoding='png')
+        img.update_array(np.full((3, 2), 7, dtype=np.uint8))
+        content, buffers = _custom_msgs(img)[-1]
+        assert content['encoding'] == 'png'
+        decoded = np.asarray(PILImage.open(io.BytesIO(buffers[0])))
+        assert (decoded == 7).all() and decoded.shape == (3, 2)
+    finally:
+        teardown_test_comm()
@@ -1,9 +1,16 @@
+import asyncio
 import sys
+import threading
 from unittest import TestCase
+from unittest.mock import patch
 from contextlib import contextmanager
 
 from IPython.display import Markdown, Image
 from ipywidgets import widget_output
+from ipywidgets.widgets import Widget
+from ipywidgets.widgets.widget import _apply_patch
+
+from .utils import setup
 
 
 class TestOutputWidget(TestCase):
@@ -163,9 +170,9 @@ def test_append_stdout():
     expected = (_make_stream_output("snakes!", "stdout"),)
     assert widget.outputs == expected, repr(widget.outputs)
 
-    # Try appending a second message.
+    # Try appending a second message, which is merged into the first one.
     widget.append_stdout("more snakes!")
-    expected += (_make_stream_output("more snakes!", "stdout"),)
+    expected = (_make_stream_output("snakes!more snakes!", "stdout"),)
     assert widget.outputs == expected, repr(widget.outputs)
 
 
@@ -177,12 +184,97 @@ def test_append_stderr():
     expected = (_make_stream_output("snakes!", "stderr"),)
     assert widget.outputs == expected, repr(widget.outputs)
 
-    # Try appending a second message.
+    # Try appending a second message, which is merged into the first one.
     widget.append_stderr("more snakes!")
-    expected += (_make_stream_output("more snakes!", "stderr"),)
+    expected = (_make_stream_output("snakes!more snakes!", "stderr"),)
     assert widget.outputs == expected, repr(widget.outputs)
 
 
+def test_append_stream_interleaved():
+    widget = widget_output.Output()
+    widget.append_stdout("a")
+    widget.append_stderr("b")
+    widget.append_stdout("c")
+    widget.append_stdout("d")
+    assert widget.outputs == (
+        _make_stream_output("a", "stdout"),
+        _make_stream_output("b", "stderr"),
+        _make_stream_output("cd", "stdout"),
+    )
+
+
+def test_append_stdout_sends_new_text(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'patch'})
+    widget = widget_output.Output()
+    widget.append_stdout("line 1\n")
+    widget.comm.messages.clear()
+    widget.append_stdout("line 2\n")
+    widget.append_stderr("oops\n")
+    patches = [kwargs['data']['patches']['outputs']
+               for args, kwargs in widget.comm.messages]
+    assert patches == [
+        {'base': 1, 'version': 2, 'ops': [{'op': 'patch', 'index': 0, 'ops': [
+            {'op': 'append', 'key': 'text', 'value': 'line 2\n'}]}]},
+        {'base': 2, 'version': 3, 'ops': [{'op': 'splice', 'index': 1, 'remove': 0,
+            'insert': [_make_stream_output("oops\n", "stderr")]}]},
+    ]
+    assert widget.outputs[0]['text'] == "line 1\nline 2\n"
+
+
+def test_append_stream_in_place(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'patch'})
+    widget = widget_output.Output()
+    widget.append_stdout("a")
+    state = list(widget.comm.messages[-1][1]['data']['state']['outputs'])
+    widget.comm.messages.clear()
+    for i in range(3):
+        widget.append_stderr("b")
+        widget.append_stdout("c")
+        widget.append_stdout("d")
+    assert widget._output_list_changed
+    for args, kwargs in widget.comm.messages:
+        assert kwargs['data']['state'] == {}
+        _apply_patch(state, kwargs['data']['patches']['outputs']['ops'])
+    assert state == list(widget.outputs)
+    assert not widget._output_list_changed
+
+    # Setting the outputs as a whole discards the appended list
+    widget.outputs = ()
+    widget.append_stdout("e")
+    assert widget.outputs == (_make_stream_output("e", "stdout"),)
+
+
+def test_append_stream_lines(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'patch'})
+    widget = widget_output.Output()
+    widget.append_stdout("start\n")
+    state = list(widget.comm.messages[-1][1]['data']['state']['outputs'])
+    widget.comm.messages.clear()
+    lines = ['line %d\n' % i for i in range(5000)]
+    for line in lines:
+        widget.append_stdout(line)
+    for args, kwargs in widget.comm.messages:
+        _apply_patch(state, kwargs['data']['patches']['outputs']['ops'])
+    assert state == list(widget.outputs)
+    # The stream is split, so that each append copies a bounded text
+    texts = [output['text'] for output in widget.outputs]
+    assert ''.join(texts) == 'start\n' + ''.join(lines)
+    assert len(texts) > 1
+    assert max(map(len, texts)) < widget_output._STREAM_MERGE_SIZE + 16
+
+
+def test_append_stream_observed():
+    widget = widget_output.Output()
+    changes = []
+    widget.observe(changes.append, 'outputs')
+    widget.append_stdout("a")
+    widget.append_stdout("b")
+    assert [change['new'] for change in changes] == [
+        (_make_stream_output("a", "stdout"),),
+        (_make_stream_output("ab", "stdout"),),
+    ]
+
+
 def test_append_display_data():
     widget = widget_output.Output()
 
@@ -237,3 +329,163 @@ def test_append_display_data():
         },
     )
     assert widget.outputs == expected1 or widget.outputs == expected2
+
+
+def test_max_outputs():
+    widget = widget_output.Output(max_outputs=10)
+    for i in range(25):
+        widget.append_display_data(Markdown(str(i)))
+        assert len(widget.outputs) <= 10
+    # The oldest outputs are evicted down to 90% of the limit
+    assert [o['data']['text/markdown'] for o in widget.outputs] == [
+        str(i) for i in range(16, 25)]
+    assert widget._spilled_count == 0
+
+
+def test_max_bytes_trims_stream():
+    widget = widget_output.Output(max_bytes=100)
+    for i in range(100):
+        widget.append_stdout('line %d\n' % i)
+    assert len(widget.outputs) == 1
+    text = widget.outputs[0]['text']
+    assert len(text) <= 100
+    assert text.endswith('line 99\n')
+    assert text.startswith('line ')
+
+
+def test_spill():
+    widget = widget_output.Output(max_outputs=4, spill=True)
+    widget.append_stdout('a')
+    for i in range(10):
+        widget.append_display_data(Markdown(str(i)))
+    spilled = widget.spilled_outputs()
+    assert widget._spilled_count == len(spilled) == 7
+    assert spilled[0] == _make_stream_output('a', 'stdout')
+    assert [o['data']['text/markdown'] for o in spilled[1:]] + [
+        o['data']['text/markdown'] for o in widget.outputs] == [
+        str(i) for i in range(10)]
+    assert widget.spilled_outputs(2, 2) == spilled[2:4]
+    assert widget.spilled_outputs(6, 5) == spilled[6:]
+
+    widget._handle_msg({'content': {'data': {'method': 'custom', 'content': {
+        'event': 'request_spilled', 'offset': 5, 'limit': 1}}}, 'buffers': []})
+    msg = widget.comm.messages[-1][1]['data']
+    assert msg == {'method': 'custom', 'content': {
+        'event': 'spilled', 'offset': 5, 'outputs': spilled[5:6]}}
+
+    widget.outputs = ()
+    assert widget._spilled_count == 0
+    assert widget.spilled_outputs() == []
+
+
+def test_eviction_patch(monkeypatch):
+    monkeypatch.setattr(Widget, '_frontend_capabilities', {'patch'})
+    widget = widget_output.Output(max_outputs=10)
+    for i in range(10):
+        widget.append_display_data(Markdown(str(i)))
+    widget.comm.messages.clear()
+    widget.append_display_data(Markdown('10'))
+    ops = widget.comm.messages[-1][1]['data']['patches']['outputs']['ops']
+    assert ops[0] == {'op': 'splice', 'index': 0, 'remove': 2, 'insert': []}
+    assert ops[1]['index'] == 8 and len(ops[1]['insert']) == 1
+
+
+def test_threads_route_output():
+    outputs = [widget_output.Output() for i in range(4)]
+
+    def work(out, i):
+        with out:
+            for j in range(100):
+                print('worker %d line %d' % (i, j))
+
+    threads = [threading.Thread(target=work, args=(out, i))
+               for i, out in enumerate(outputs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for i, out in enumerate(outputs):
+        assert out.outputs == (_make_stream_output(
+            ''.join('worker %d line %d\n' % (i, j) for j in range(100)),
+            'stdout'),)
+
+
+def test_thread_error_is_routed():
+    out = widget_output.Output()
+
+    def work():
+        with out:
+            raise ValueError('oops')
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    assert out.outputs[0]['name'] == 'stderr'
+    assert 'ValueError: oops' in out.outputs[0]['text']
+
+
+def test_tasks_route_output(capsys):
+    first, second = widget_output.Output(), widget_output.Output()
+
+    async def task(out, name):
+        with out:
+            for j in range(3):
+                print(name, j)
+                await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.gather(task(first, 'first'), task(second, 'second'))
+
+    asyncio.run(run())
+    # The first task owns the frontend capture, its output goes to stdout
+    assert capsys.readouterr().out == 'first 0\nfirst 1\nfirst 2\n'
+    assert first.outputs == ()
+    assert second.outputs == (
+        _make_stream_output('second 0\nsecond 1\nsecond 2\n', 'stdout'),)
+
+
+def test_routing_restores_streams():
+    stdout, stderr = sys.stdout, sys.stderr
+    out = widget_output.Output()
+    entered, release = threading.Event(), threading.Event()
+
+    def work():
+        with out:
+            entered.set()
+            release.wait()
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    entered.wait()
+    # Streams are only wrapped while a routed context is active
+    assert isinstance(sys.stdout, widget_output._RoutedStream)
+    assert isinstance(sys.stderr, widget_output._RoutedStream)
+    release.set()
+    thread.join()
+    assert sys.stdout is stdout
+    assert sys.stderr is stderr
+
+
+def test_thread_routes_display_and_clear():
+    from IPython.core.interactiveshell import InteractiveShell
+    from IPython.display import HTML, display
+    ip = InteractiveShell.instance()
+    display_pub = ip.display_pub
+    out = widget_output.Output()
+    out.append_stdout('old\n')
+
+    def work():
+        with out:
+            display(HTML('<b>lost</b>'))
+            out.clear_output()
+            print('a')
+            out.clear_output(wait=True)
+            display(HTML('<b>new</b>'))
+
+    with patch.object(display_pub, 'publish') as publish, \
+            patch.object(display_pub, 'clear_output') as clear:
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    assert not publish.called and not clear.called
+    assert [o['data']['text/html'] for o in out.outputs] == ['<b>new</b>']
@@ -1,12 +1,16 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 
+import asyncio
 import inspect
 from unittest import TestCase
 
+import pytest
 from traitlets import TraitError
 
-from ipywidgets import Dropdown, SelectionSlider, Select
+from ipywidgets import Dropdown, SelectionSlider, Select, SelectMultiple
+
+from .utils import setup
 
 
 class TestDropdown(TestCase):
@@ -105,3 +109,154 @@ class TestSelection(TestCase):
         assert select.value == 'dup'
         assert select.label == 'dup'
         assert observations == [3, 2, 0, 2]
+
+    def test_unhashable_values(self):
+        select = Select(options=[('a', [1]), ('b', 2), ('c', [3]), ('d', 2.0)])
+        select.value = [3]
+        assert select.index == 2
+        select.value = 2.0
+        assert select.index == 1
+        select.label = 'c'
+        assert select.value == [3]
+        with self.assertRaises(TraitError):
+            select.value = [4]
+
+    def test_equals(self):
+        select = Select(options=['a', 'B', 'c'], equals=lambda x, y: x.lower() == y.lower())
+        select.value = 'b'
+        assert select.index == 1
+        assert select.value == 'B'
+
+
+class TestSelectMultiple(TestCase):
+
+    def test_lookup(self):
+        select = SelectMultiple(options=[('x', 1), ('y', [2]), ('z', 3)])
+        select.value = (3, [2])
+        assert select.index == (2, 1)
+        assert select.label == ('z', 'y')
+        select.label = ('x',)
+        assert select.value == (1,)
+        with self.assertRaises(TraitError):
+            select.value = (4,)
+        with self.assertRaises(TraitError):
+            select.label = ('w',)
+
+
+def _custom_msgs(widget):
+    return [kwargs['data']['content'] for args, kwargs in widget.comm.messages
+            if kwargs['data']['method'] == 'custom']
+
+
+def test_paged_labels():
+    select = Select(options=[str(i) for i in range(10)], page_size=4)
+    assert select.get_state('_options_labels') == {'_options_labels': ()}
+    assert select._options_length == 10
+    assert select._options_labels[9] == '9'
+
+    select._handle_msg({'content': {'data': {'method': 'custom', 'content': {
+        'event': 'request_labels', 'offset': 8, 'limit': 4}}}, 'buffers': []})
+    assert _custom_msgs(select)[-1] == {
+        'event': 'labels', 'offset': 8, 'labels': ['8', '9'], 'reset': False}
+
+    # New options replace the labels cached by the frontend
+    select.options = ['a', 'b']
+    assert select._options_length == 2
+    assert _custom_msgs(select)[-1] == {
+        'event': 'labels', 'offset': 0, 'labels': ['a', 'b'], 'reset': True}
+
+    select.page_size = 0
+    assert select.comm.messages[-1][1]['data']['state'] == {
+        '_options_labels': ('a', 'b')}
+
+
+def test_paged_multiple_selection():
+    select = SelectMultiple(options=[str(i) for i in range(10)], page_size=2)
+    select.value = ('7', '3')
+    assert select.index == (7, 3)
+    assert select.get_state('_options_labels') == {'_options_labels': ()}
+
+
+def test_search():
+    dropdown = Dropdown(options=['Apple', 'banana', 'Pineapple', 'apricot', 'grape'])
+    assert dropdown.search('ap') == [0, 3, 2, 4]
+    assert dropdown.search('AP') == [0, 3, 2, 4]
+    assert dropdown.search('x') == []
+    dropdown.search_limit = 2
+    assert dropdown.search('ap') == [0, 3]
+
+    dropdown.options = ['zap', 'apex']
+    dropdown._handle_msg({'content': {'data': {'method': 'custom', 'content': {
+        'event': 'search', 'query': 'ap', 'id': 3}}}, 'buffers': []})
+    assert _custom_msgs(dropdown)[-1] == {
+        'event': 'search_results', 'id': 3, 'indices': [1, 0], 'labels': ['apex', 'zap']}
+
+
+def test_search_answers_latest_query():
+    def search_msg(query, id):
+        return {'content': {'data': {'method': 'custom', 'content': {
+            'event': 'search', 'query': query, 'id': id}}}, 'buffers': []}
+
+    async def run():
+        select = Select(options=['a', 'ab', 'abc'])
+        select._handle_msg(search_msg('a', 1))
+        select._handle_msg(search_msg('abc', 2))
+        assert _custom_msgs(select) == []
+        await asyncio.sleep(0)
+        return select
+
+    select = asyncio.run(run())
+    assert _custom_msgs(select) == [
+        {'event': 'search_results', 'id': 2, 'indices': [2], 'labels': ['abc']}]
+
+
+def test_array_options():
+    np = pytest.importorskip('numpy')
+    values = np.array([0.5, 1.5, 2.5, 1.5])
+    select = Select(options=values)
+    assert select.options is values
+    assert select._options_values is values
+    assert select._options_labels == ('0.5', '1.5', '2.5', '1.5')
+    assert select.value == 0.5
+    select.value = 1.5
+    assert select.index == 1
+    select.label = '2.5'
+    assert select.value == 2.5
+    with pytest.raises(TraitError):
+        select.value = 3.5
+
+    multiple = SelectMultiple(options=np.arange(5))
+    multiple.value = (4, 2)
+    assert multiple.index == (4, 2)
+    assert multiple.label == ('4', '2')
+
+    # Values are looked up by hash, unless they include NaN
+    index = multiple._options_index
+    assert index.array_index == {i: i for i in range(5)}
+    nan = np.array([1.0, np.nan, 1.0])
+    select.options = nan
+    select.value = 1.0
+    assert select.index == 0
+    with pytest.raises(TraitError):
+        select.value = np.nan
+    assert select._options_index.array_index is False
+
+    # Arrays of (label, value) pairs use the generic code path
+    pairs = np.empty(2, dtype=object)
+    pairs[:] = [('a', 1), ('b', 2)]
+    select.options = pairs
+    assert select._options_labels == ('a', 'b')
+    assert select.value == 1
+
+
+def test_pandas_options():
+    pd = pytest.importorskip('pandas')
+    dropdown = Dropdown(options=pd.Index(['x', 'y', 'z']))
+    assert dropdown._options_labels == ('x', 'y', 'z')
+    dropdown.value = 'z'
+    assert dropdown.index == 2
+
+    dropdown.options = pd.Series([10, 20], index=[1, 0])
+    assert dropdown._options_labels == ('10', '20')
+    dropdown.value = 20
+    assert dropdown.index == 1
@@ -2,12 +2,18 @@
 # Distributed under the terms of the Modified BSD License.
 
 import datetime as dt
+import hashlib
+import os
+import tempfile
 from unittest import TestCase
 from unittest.mock import MagicMock
 
 from traitlets import TraitError
 
 from ipywidgets import FileUpload
+from ipywidgets.widgets.widget_upload import _UploadCache, _UploadContent, _upload_cache
+
+from .utils import setup_test_comm, teardown_test_comm
 
 
 FILE_UPLOAD_FRONTEND_CONTENT = {
@@ -116,3 +122,235 @@ class TestFileUpload(TestCase):
         assert entry['size'] == 561
         assert entry['last_modified'] == 1578578296434
         assert entry['content'] == content
+
+
+def _upload_msg(uploader, content, buffers=()):
+    uploader._handle_msg({'content': {'data': {'method': 'custom', 'content': content}},
+                          'buffers': list(buffers)})
+
+
+def _custom_msgs(uploader):
+    return [kwargs['data']['content'] for args, kwargs in uploader.comm.messages
+            if kwargs['data']['method'] == 'custom']
+
+
+def test_chunked_upload():
+    setup_test_comm()
+    try:
+        uploader = FileUpload(chunked=True)
+        files = [
+            {'id': 0, 'name': 'a.txt', 'type': 'text/plain', 'size': 6,
+             'last_modified': 1578578296434},
+            {'id': 1, 'name': 'b.txt', 'type': 'text/plain', 'size': 2,
+             'last_modified': 1578578296434},
+        ]
+        _upload_msg(uploader, {'event': 'upload_start', 'files': files})
+        assert uploader.progress == 0
+        _upload_msg(uploader, {'event': 'upload_chunk', 'id': 0, 'offset': 0},
+                    [memoryview(b'abcd')])
+        assert uploader.progress == 0.5
+        _upload_msg(uploader, {'event': 'upload_chunk', 'id': 0, 'offset': 4},
+                    [memoryview(b'ef')])
+        _upload_msg(uploader, {'event': 'upload_chunk', 'id': 1, 'offset': 0},
+                    [memoryview(b'gh')])
+        assert uploader.progress == 1
+        assert _custom_msgs(uploader) == [
+            {'event': 'upload_ack', 'id': 0, 'received': 4},
+            {'event': 'upload_ack', 'id': 0, 'received': 6},
+            {'event': 'upload_ack', 'id': 1, 'received': 2},
+        ]
+        assert uploader.value == ()
+
+        _upload_msg(uploader, {'event': 'upload_end'})
+        first, second = uploader.value
+        assert first.name == 'a.txt'
+        assert first.size == 6
+        assert first.last_modified == dt.datetime(
+            2020, 1, 9, 13, 58, 16, 434000, tzinfo=dt.timezone.utc)
+        assert first.file.read() == b'abcdef'
+        assert second.file.read() == b'gh'
+        assert 'content' not in first
+        # The frontend is sent the metadata of the files
+        assert uploader.get_state('value')['value'][0] == {
+            'name': 'a.txt', 'type': 'text/plain', 'size': 6,
+            'last_modified': 1578578296434}
+    finally:
+        teardown_test_comm()
+
+
+def _upload_files():
+    return {name for name in os.listdir(tempfile.gettempdir())
+            if name.startswith('ipywidgets-upload-')}
+
+
+def test_chunked_upload_unnamed_file(monkeypatch):
+    monkeypatch.setattr('ipywidgets.widgets.widget_upload._SPOOL_MAX_SIZE', 2)
+
+    def remove(path):
+        # Like on Windows, where open files cannot be removed
+        raise PermissionError(path)
+
+    monkeypatch.setattr('ipywidgets.widgets.widget_upload.os.remove', remove)
+    setup_test_comm()
+    try:
+        before = _upload_files()
+        uploader = FileUpload(chunked=True)
+        _upload_msg(uploader, {'event': 'upload_start', 'files': [
+            {'id': 0, 'name': 'a.txt', 'type': 'text/plain', 'size': 6,
+             'last_modified': 1578578296434}]})
+        _upload_msg(uploader, {'event': 'upload_chunk', 'id': 0, 'offset': 0},
+                    [memoryview(b'abcdef')])
+        _upload_msg(uploader, {'event': 'upload_end'})
+        (uploaded_file,) = uploader.value
+        # The file is not cached, so it has no name to leak
+        assert uploaded_file.path is None
+        assert _upload_files() == before
+        assert uploaded_file.file.read() == b'abcdef'
+        uploaded_file.file.close()
+    finally:
+        teardown_test_comm()
+
+
+def test_chunked_upload_unexpected_chunk():
+    setup_test_comm()
+    try:
+        uploader = FileUpload(chunked=True)
+        _upload_msg(uploader, {'event': 'upload_start', 'files': [
+            {'id': 0, 'name': 'a.txt', 'type': 'text/plain', 'size': 6,
+             'last_modified': 1578578296434}]})
+        _upload_msg(uploader, {'event': 'upload_chunk', 'id': 0, 'offset': 4},
+                    [memoryview(b'ef')])
+        assert _custom_msgs(uploader)[-1]['event'] == 'upload_error'
+        _upload_msg(uploader, {'event': 'upload_end'})
+        assert uploader.value == ()
+    finally:
+        teardown_test_comm()
+
+
+def _digest(*chunks, chunk_size=4):
+    hashes = b''.join(hashlib.sha256(chunk).digest() for chunk in chunks)
+    return '%d:%s' % (chunk_size, hashlib.sha256(hashes).hexdigest())
+
+
+def test_dedupe_upload():
+    setup_test_comm()
+    try:
+        uploader = FileUpload(chunk_size=4, dedupe=True)
+        digest = _digest(b'dedu', b'pe')
+        _upload_msg(uploader, {'event': 'lookup', 'digests': [digest]})
+        assert _custom_msgs(uploader)[-1] == {'event': 'lookup_result', 'known': [False]}
+
+        uploader.set_state({'value': [dict(FILE_UPLOAD_FRONTEND_CONTENT,
+                                           content=memoryview(b'dedupe'))]})
+        _upload_msg(uploader, {'event': 'lookup', 'digests': [digest]})
+        assert _custom_msgs(uploader)[-1] == {'event': 'lookup_result', 'known': [True]}
+
+        # The front-end sends the digest instead of the content
+        entry = dict(FILE_UPLOAD_FRONTEND_CONTENT, digest=digest)
+        del entry['content']
+        uploader.comm.messages.clear()
+        uploader.set_state({'value': [entry]})
+        (uploaded_file,) = uploader.value
+        assert uploaded_file.content.tobytes() == b'dedupe'
+        assert uploaded_file.digest == digest
+        # The content is not sent back to the front-end
+        assert uploader.comm.messages == []
+        assert uploader.get_state('value')['value'] == [entry]
+    finally:
+        teardown_test_comm()
+
+
+def test_dedupe_upload_evicted():
+    setup_test_comm()
+    try:
+        uploader = FileUpload(chunk_size=4, dedupe=True)
+        # The content was evicted between the lookup and the upload
+        entry = dict(FILE_UPLOAD_FRONTEND_CONTENT, digest='4:evicted')
+        del entry['content']
+        uploader.set_state({'value': [entry]})
+        assert uploader.value == ()
+        assert uploader.error == "The content of 'file-name.txt' is no longer cached"
+        assert _custom_msgs(uploader)[-1] == {
+            'event': 'upload_error', 'digest': '4:evicted', 'message': uploader.error}
+
+        # The front-end sends the content again
+        uploader.set_state({'value': [dict(FILE_UPLOAD_FRONTEND_CONTENT,
+                                           content=memoryview(b'evicted'))],
+                            'error': ''})
+        (uploaded_file,) = uploader.value
+        assert uploaded_file.content.tobytes() == b'evicted'
+        assert uploader.error == ''
+    finally:
+        teardown_test_comm()
+
+
+def test_upload_not_kept_without_dedupe():
+    setup_test_comm()
+    try:
+        uploader = FileUpload(chunk_size=4)
+        uploader.set_state({'value': [dict(FILE_UPLOAD_FRONTEND_CONTENT,
+                                           content=memoryview(b'unique'))]})
+        _upload_msg(uploader, {'event': 'lookup', 'digests': [_digest(b'uniq', b'ue')]})
+        assert _custom_msgs(uploader)[-1] == {'event': 'lookup_result', 'known': [False]}
+    finally:
+        teardown_test_comm()
+
+
+def test_chunked_upload_dedupe():
+    setup_test_comm()
+    try:
+        uploader = FileUpload(chunked=True, chunk_size=4, dedupe=True)
+        file = {'id': 0, 'name': 'a.txt', 'type': 'text/plain', 'size': 6,
+                'last_modified': 1578578296434}
+        _upload_msg(uploader, {'event': 'upload_start', 'files': [file]})
+        _upload_msg(uploader, {'event': 'upload_chunk', 'id': 0, 'offset': 0},
+                    [memoryview(b'chun')])
+        _upload_msg(uploader, {'event': 'upload_chunk', 'id': 0, 'offset': 4},
+                    [memoryview(b'ks')])
+        _upload_msg(uploader, {'event': 'upload_end'})
+        digest = _digest(b'chun', b'ks')
+        assert digest in _upload_cache
+
+        # The same file is uploaded again without its chunks
+        _upload_msg(uploader, {'event': 'upload_start',
+                               'files': [dict(file, digest=digest)]})
+        assert uploader.progress == 1
+        _upload_msg(uploader, {'event': 'upload_end'})
+        (uploaded_file,) = uploader.value
+        assert uploaded_file.file.read() == b'chunks'
+        assert uploaded_file.path is None
+        assert uploaded_file.digest == digest
+
+        # The kernel reports contents it no longer holds
+        _upload_msg(uploader, {'event': 'upload_start',
+                               'files': [dict(file, digest='4:unknown')]})
+        assert _custom_msgs(uploader)[-1]['event'] == 'upload_error'
+    finally:
+        teardown_test_comm()
+
+
+def test_upload_cache_eviction(monkeypatch):
+    monkeypatch.setattr('ipywidgets.widgets.widget_upload._SPOOL_MAX_SIZE', 2)
+    cache = _UploadCache(max_size=8)
+    contents = []
+    for data in [b'abc', b'defg', b'hij']:
+        content = _UploadContent(len(data))
+        content.write(data)
+        cache.add(content.finish(4), content)
+        contents.append(content)
+    # The least recently used content is evicted, and its file deleted
+    assert cache.size == 7
+    assert not os.path.exists(contents[0].path)
+    assert _digest(b'abc') not in cache
+    assert cache.get(_digest(b'defg')) is contents[1]
+    with contents[2].open() as f:
+        assert f.read() == b'hij'
+
+    # The most recent content is kept, even if it is too big
+    big = _UploadContent(10)
+    big.write(b'0123456789')
+    cache.add(big.finish(4), big)
+    assert cache.size == 10
+    assert not os.path.exists(contents[1].path)
+    cache.clear()
+    assert not os.path.exists(big.path)
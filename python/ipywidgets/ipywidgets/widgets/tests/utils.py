@@ -28,6 +28,9 @@ class DummyComm():
     def on_msg(self, *args, **kwargs):
         pass
 
+    def on_close(self, *args, **kwargs):
+        pass
+
     def send(self, *args, **kwargs):
         self.messages.append((args, kwargs))
 
@@ -397,7 +397,8 @@ class InstanceDict(traitlets.Instance):
     to initialize the instance.
 
     Also, we default to a trivial instance, even if args and kwargs
-    is not specified."""
+    is not specified. A default widget instance opens its comm only when
+    it is changed or referenced, see Widget._open_deferred."""
 
     def validate(self, obj, value):
         if isinstance(value, dict):
@@ -406,8 +407,11 @@ class InstanceDict(traitlets.Instance):
             return super().validate(obj, value)
 
     def make_dynamic_default(self):
-        return self.klass(*(self.default_args or ()),
-                          **(self.default_kwargs or {}))
+        from .widget import Widget
+        kwargs = dict(self.default_kwargs or {})
+        if issubclass(self.klass, Widget):
+            kwargs['_defer_open'] = True
+        return self.klass(*(self.default_args or ()), **kwargs)
 
 
 # The regexp is taken
@@ -456,6 +460,13 @@ class TypedTuple(traitlets.Container):
     klass = tuple
     _cast_types = (list,)
 
+    def validate_elements(self, obj, value):
+        # Validating each string of a long tuple (e.g. the labels of a
+        # selection widget) one by one is slow and would not change them.
+        if type(self._trait) is traitlets.Unicode and set(map(type, value)) <= {str}:
+            return value
+        return super().validate_elements(obj, value)
+
 
 def bytes_from_json(js, obj):
     return None if js is None else js.tobytes()
@@ -5,15 +5,19 @@
 """Base Widget class.  Allows user to create widgets in the back-end that render
 in the Jupyter notebook front-end.
 """
+import asyncio
 import os
 import sys
+import threading
+import time
 import typing
+import weakref
 from contextlib import contextmanager
 from collections.abc import Iterable
 from IPython import get_ipython
 from traitlets import (
     Any, HasTraits, Unicode, Dict, Instance, List, Int, Set, Bytes, observe, default, Container,
-    Undefined)
+    Undefined, TraitError)
 from json import loads as jsonloads, dumps as jsondumps
 from .. import comm
 
@@ -41,9 +45,17 @@ def envset(name, default):
 PROTOCOL_VERSION_MAJOR = __protocol_version__.split('.')[0]
 CONTROL_PROTOCOL_VERSION_MAJOR = __control_protocol_version__.split('.')[0]
 JUPYTER_WIDGETS_ECHO = envset('JUPYTER_WIDGETS_ECHO', default=True)
+JUPYTER_WIDGETS_COALESCE = envset('JUPYTER_WIDGETS_COALESCE', default=False)
 # we keep a strong reference for every widget created, for a discussion on using weak references see:
 #  https://github.com/jupyter-widgets/ipywidgets/issues/1345
 _instances : typing.MutableMapping[str, "Widget"] = {}
+# The model modules of the core widgets, whose frontend models have the same
+# defaults as the widget classes.
+_core_model_modules = frozenset(['@jupyter-widgets/base', '@jupyter-widgets/controls',
+                                 '@jupyter-widgets/output'])
+# The traits used to instantiate the frontend model, which are always sent.
+_model_identity_keys = ('_model_name', '_model_module', '_model_module_version',
+                        '_view_name', '_view_module', '_view_module_version')
 
 def _widget_to_json(x, obj):
     if isinstance(x, dict):
@@ -51,6 +63,11 @@ def _widget_to_json(x, obj):
     elif isinstance(x, (list, tuple)):
         return [_widget_to_json(v, obj) for v in x]
     elif isinstance(x, Widget):
+        if x._open_deferred and getattr(obj, '_model_module', None) in _core_model_modules:
+            # The core models fall back to defaults for a missing layout or
+            # style, so the widget is referenced once it opens.
+            x._deferred_owners.add(obj)
+            return None
         return "IPY_MODEL_" + x.model_id
     else:
         return x
@@ -71,6 +88,7 @@ widget_serialization = {
 }
 
 _binary_types = (memoryview, bytearray, bytes)
+_nested_types = (dict, list, tuple) + _binary_types
 
 def _put_buffers(state, buffer_paths, buffers):
     """The inverse of _remove_buffers, except here we modify the existing dict/lists.
@@ -92,6 +110,10 @@ def _separate_buffers(substate, path, buffer_paths, buffers):
     # will result in {'x': {}, 'y': [None, None]}, [ar, ar2, ar3], [['x', 'ar'], ['y', 0], ['y', 1]]
     # instead of removing elements from the list, this will make replacing the buffers on the js side much easier
     if isinstance(substate, (list, tuple)):
+        # Checking the element types in bulk skips the scan of long flat
+        # lists, e.g. of strings or numbers.
+        if not any(issubclass(t, _nested_types) for t in set(map(type, substate))):
+            return substate
         is_cloned = False
         for i, v in enumerate(substate):
             if isinstance(v, _binary_types):
@@ -144,6 +166,140 @@ def _remove_buffers(state):
     state = _separate_buffers(state, [], buffer_paths, buffers)
     return state, buffer_paths, buffers
 
+def _list_patch(old, new):
+    """Return the ops turning the list old into the list new.
+
+    A single splice op replaces the elements between the common prefix and
+    the common suffix of the two lists. When a single dict is replaced by
+    another dict, a nested patch op is used instead, so that e.g. appending
+    text to the last output of an Output widget only sends the new text.
+    Elements removed from the head of the list, like the outputs evicted
+    by a bounded Output widget, are removed by a separate splice op.
+    """
+    if old and new and old[0] is not new[0]:
+        for k in range(1, len(old)):
+            if old[k] is new[0]:
+                return ([{'op': 'splice', 'index': 0, 'remove': k, 'insert': []}]
+                        + _list_patch(old[k:], new))
+    n = min(len(old), len(new))
+    start = 0
+    while start < n and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < n - start and old[len(old) - 1 - end] == new[len(new) - 1 - end]:
+        end += 1
+    if start == len(old) == len(new):
+        return []
+    remove, insert = len(old) - start - end, list(new[start:len(new) - end])
+    if (remove == len(insert) == 1 and isinstance(old[start], dict)
+            and isinstance(insert[0], dict)):
+        ops = _dict_patch(old[start], insert[0])
+        if not _replaces_all(ops, insert[0]):
+            return [{'op': 'patch', 'index': start, 'ops': ops}]
+    return [{'op': 'splice', 'index': start, 'remove': remove,
+             'insert': insert}]
+
+def _dict_patch(old, new):
+    """Return the ops turning the dict old into the dict new.
+
+    A string value which extends the previous one is patched with an append
+    op sending only the new text.
+    """
+    ops = [{'op': 'delete', 'key': k} for k in old if k not in new]
+    for k, v in new.items():
+        if k not in old:
+            ops.append({'op': 'set', 'key': k, 'value': v})
+            continue
+        previous = old[k]
+        if previous == v:
+            continue
+        if (isinstance(v, str) and isinstance(previous, str) and previous
+                and v.startswith(previous)):
+            ops.append({'op': 'append', 'key': k, 'value': v[len(previous):]})
+        else:
+            ops.append({'op': 'set', 'key': k, 'value': v})
+    return ops
+
+def _replaces_all(ops, new):
+    """Whether the ops of a dict patch replace all the values of the dict new."""
+    return sum(op['op'] != 'append' for op in ops) >= len(new) > 0
+
+def _make_patch(old, new):
+    """Return the patch ops turning the JSON state old into new.
+
+    Returns None when the new value should be sent in full instead, i.e. when
+    the values are not both lists or both dicts, or when the patch would
+    replace all of the new value.
+    """
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        ops = _list_patch(old, new)
+        inserted = sum(len(op['insert']) for op in ops if op['op'] == 'splice')
+        if inserted >= len(new) > 0:
+            return None
+        return ops
+    elif isinstance(old, dict) and isinstance(new, dict):
+        ops = _dict_patch(old, new)
+        if _replaces_all(ops, new):
+            return None
+        return ops
+    return None
+
+def _patch_base(value):
+    """Shallow copy of a JSON state value, kept as the base of the next patch."""
+    if isinstance(value, dict):
+        return dict(value)
+    elif isinstance(value, (list, tuple)):
+        return list(value)
+    return value
+
+def _apply_patch(base, ops):
+    """Apply patch ops to a patch base in place, and return it.
+
+    Nested values are copied before they are patched, since the base shares
+    them with the trait value it was made from.
+    """
+    for op in ops:
+        kind = op['op']
+        if kind == 'splice':
+            base[op['index']:op['index'] + op['remove']] = op['insert']
+        elif kind == 'patch':
+            base[op['index']] = _apply_patch(_patch_base(base[op['index']]), op['ops'])
+        elif kind == 'set':
+            base[op['key']] = op['value']
+        elif kind == 'delete':
+            del base[op['key']]
+        elif kind == 'append':
+            base[op['key']] += op['value']
+    return base
+
+def _call_soon(callback):
+    """Schedule a callback on the next iteration of the running event loop.
+
+    When no event loop is running in the current thread (e.g. a plain Python
+    session or a background thread), the callback is called right away.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        callback()
+    else:
+        loop.call_soon(callback)
+
+def _call_later(delay, callback):
+    """Schedule a callback to be called after delay seconds.
+
+    When no event loop is running in the current thread (e.g. a background
+    thread), the callback is called from a timer thread.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
+    else:
+        loop.call_later(delay, callback)
+
 def _buffer_list_equal(a, b):
     """Compare two lists of buffers for equality.
 
@@ -297,6 +453,46 @@ class _staticproperty(object):
         return self.fget()
 
 
+class _SyncPlan:
+    """The sync metadata of the traits of a widget class.
+
+    It is compiled once per class, so that the state synchronization does not
+    have to look up the traits and their metadata for every key.
+    """
+
+    def __init__(self, cls):
+        self.traits = cls.class_traits()
+        # The synced traits, in the order of Widget.traits(sync=True)
+        self.keys = []
+        self.to_json = {}
+        self.from_json = {}
+        self.default_values = {}
+        self.echo_update = set()
+        self.patch = set()
+        self.max_rate = {}
+        # The synced traits defined in this package
+        self.core_keys = set()
+        for name, trait in self.traits.items():
+            metadata = dict(trait.metadata)
+            # traitlets allows overriding metadata with a _<name>_metadata dict
+            metadata.update(getattr(cls, '_%s_metadata' % name, {}))
+            if metadata.get('sync') == True:
+                self.keys.append(name)
+                defined_in = getattr(trait.this_class, '__module__', '')
+                if defined_in.split('.')[0] == 'ipywidgets':
+                    self.core_keys.add(name)
+            self.to_json[name] = metadata.get('to_json', cls._trait_to_json)
+            self.from_json[name] = metadata.get('from_json', cls._trait_from_json)
+            self.default_values[name] = trait.default_value
+            if metadata.get('echo_update', True):
+                self.echo_update.add(name)
+            if metadata.get('patch'):
+                self.patch.add(name)
+            if metadata.get('max_rate'):
+                self.max_rate[name] = metadata['max_rate']
+        self.key_set = frozenset(self.keys)
+
+
 
 class Widget(LoggingHasTraits):
     #-------------------------------------------------------------------------
@@ -304,6 +500,13 @@ class Widget(LoggingHasTraits):
     #-------------------------------------------------------------------------
     _widget_construction_callback = None
     _control_comm = None
+    # The protocol capabilities supported by all the connected frontends, or
+    # None if no frontend announced its capabilities yet.
+    _frontend_capabilities = None
+    # The control comm of the latest request of the capabilities of the
+    # frontends, and the capabilities of the frontends which replied to it.
+    _capabilities_comm = None
+    _capabilities_replied = None
 
     @_staticproperty
     def widgets():
@@ -374,8 +577,59 @@ class Widget(LoggingHasTraits):
         if version.split('.')[0] != CONTROL_PROTOCOL_VERSION_MAJOR:
             raise ValueError("Incompatible widget control protocol versions: received version %r, expected version %r"%(version, __control_protocol_version__))
 
+        capabilities = set(msg.get('metadata', {}).get('capabilities', []))
+        if cls._frontend_capabilities is None:
+            Widget._frontend_capabilities = capabilities
+        else:
+            Widget._frontend_capabilities = Widget._frontend_capabilities & capabilities
+
         cls._control_comm = comm
         cls._control_comm.on_msg(cls._handle_control_comm_msg)
+        # Ask the other frontends again, forgetting those which are gone
+        cls._request_capabilities(capabilities)
+
+    @classmethod
+    def _request_capabilities(cls, capabilities=None):
+        """Ask the connected frontends for their protocol capabilities.
+
+        The kernel opens a control comm, on which each frontend replies with
+        its capabilities. This works for the frontends connected before
+        ipywidgets was imported, which could not open a control comm then.
+        The capabilities are those of the frontends which replied to the
+        latest request, starting from the given capabilities of the frontend
+        which connected. A frontend without the control comm target closes
+        the comm, which disables all the capabilities.
+        """
+        previous = Widget._capabilities_comm
+        control_comm = comm.create_comm(
+            target_name='jupyter.widget.control',
+            data={'method': 'request_capabilities'},
+            metadata={'version': __control_protocol_version__},
+        )
+        Widget._capabilities_comm = control_comm
+        Widget._capabilities_replied = capabilities
+        if previous is not None:
+            previous.close()
+        control_comm.on_msg(lambda msg: cls._handle_capabilities(control_comm, msg))
+        control_comm.on_close(lambda msg: cls._handle_capabilities(control_comm, None))
+
+    @classmethod
+    def _handle_capabilities(cls, control_comm, msg):
+        """Handle a reply to a request of the capabilities, or its close."""
+        if control_comm is not Widget._capabilities_comm:
+            return
+        if msg is None:
+            Widget._capabilities_comm = None
+            capabilities = set()
+        else:
+            data = msg['content']['data']
+            if data.get('method') != 'capabilities':
+                return
+            capabilities = set(data.get('capabilities', []))
+        if Widget._capabilities_replied is not None:
+            capabilities &= Widget._capabilities_replied
+        Widget._capabilities_replied = capabilities
+        Widget._frontend_capabilities = capabilities
 
     @classmethod
     def _handle_control_comm_msg(cls, msg):
@@ -391,14 +645,15 @@ class Widget(LoggingHasTraits):
             cls.get_manager_state()
             widgets = _instances.values()
             full_state = {}
-            drop_defaults = False
             for widget in widgets:
                 full_state[widget.model_id] = {
                     'model_name': widget._model_name,
                     'model_module': widget._model_module,
                     'model_module_version': widget._model_module_version,
-                    'state': widget.get_state(drop_defaults=drop_defaults),
+                    'state': widget._get_open_state(),
                 }
+                if widget._drops_open_defaults():
+                    full_state[widget.model_id]['drop_defaults'] = True
             full_state, buffer_paths, buffers = _remove_buffers(full_state)
             cls._control_comm.send(dict(
                 method='update_states',
@@ -461,6 +716,8 @@ class Widget(LoggingHasTraits):
         return state
 
     def get_view_spec(self):
+        if self._open_deferred:
+            self.open()
         return dict(version_major=2, version_minor=0, model_id=self._model_id)
 
     #-------------------------------------------------------------------------
@@ -487,23 +744,73 @@ class Widget(LoggingHasTraits):
 
     @default('keys')
     def _default_keys(self):
-        return [name for name in self.traits(sync=True)]
+        return list(self._get_sync_plan().keys)
+
+    @observe('keys')
+    def _keys_changed(self, change):
+        self._key_set = None
+
+    _key_set = None
 
     _property_lock = Dict()
     _holding_sync = False
     _states_to_send = Set()
+    # Coalesce trait updates into one message per event loop iteration.
+    # None means that the JUPYTER_WIDGETS_COALESCE setting is used.
+    _coalesce_sync = None
+    _sync_flush_scheduled = False
+    # Time of the last update of traits tagged with a max_rate, and the
+    # throttled traits for which a trailing update is scheduled.
+    _sync_last_sent = Dict()
+    _sync_throttled = Set()
+    # Version of the value last synced for traits tagged with patch=True,
+    # and the JSON value that the next patch is computed against.
+    _sync_patch_versions = Dict()
+    _sync_patch_bases = Dict()
+    # Patch ops of in place changes recorded with _patch_trait, which are sent
+    # instead of diffing the value against its patch base.
+    _sync_patch_ops = Dict()
+    # Whether the frontend model has the same default values as the synced
+    # traits, so that these can be left out of the comm_open state. None
+    # means that this is assumed for the traits of the core widget models
+    # defined in this package only.
+    _frontend_defaults = None
+    # A widget constructed with _defer_open=True (e.g. a default layout or
+    # style) opens its comm when a synced trait changes or its model id is
+    # used. Until then, the widgets referencing it are kept in _deferred_owners.
+    _open_deferred = False
     _msg_callbacks = Instance(CallbackDispatcher, ())
 
+    @classmethod
+    def _get_sync_plan(cls):
+        """Get the sync plan of the class, compiling it on first use."""
+        # Look in the class dict only, a subclass needs its own plan.
+        plan = cls.__dict__.get('_sync_plan')
+        if plan is None:
+            plan = _SyncPlan(cls)
+            cls._sync_plan = plan
+        return plan
+
+    def _get_key_set(self):
+        """Get the set of synced trait names, for membership tests."""
+        if self._key_set is None:
+            self._key_set = frozenset(self.keys)
+        return self._key_set
+
     #-------------------------------------------------------------------------
     # (Con/de)structor
     #-------------------------------------------------------------------------
     def __init__(self, **kwargs):
         """Public constructor"""
         self._model_id = kwargs.pop('model_id', None)
+        if kwargs.pop('_defer_open', False):
+            self._open_deferred = True
+            self._deferred_owners = weakref.WeakSet()
         super().__init__(**kwargs)
 
         Widget._call_widget_constructed(self)
-        self.open()
+        if not self._open_deferred:
+            self.open()
     
     def __copy__(self):
         raise NotImplementedError("Widgets cannot be copied; custom implementation required")
@@ -522,7 +829,7 @@ class Widget(LoggingHasTraits):
     def open(self):
         """Open a comm to the frontend if one isn't already open."""
         if self.comm is None:
-            state, buffer_paths, buffers = _remove_buffers(self.get_state())
+            state, buffer_paths, buffers = _remove_buffers(self._get_open_state())
 
             args = dict(target_name='jupyter.widget',
                         data={'state': state, 'buffer_paths': buffer_paths},
@@ -534,6 +841,12 @@ class Widget(LoggingHasTraits):
 
             self.comm = comm.create_comm(**args)
 
+            if self._open_deferred:
+                self._open_deferred = False
+                for owner in list(self._deferred_owners):
+                    owner._send_references_to(self)
+                self._deferred_owners = None
+
     @observe('comm')
     def _comm_changed(self, change):
         """Called when the comm is changed."""
@@ -549,6 +862,8 @@ class Widget(LoggingHasTraits):
         """Gets the model id of this widget.
 
         If a Comm doesn't exist yet, a Comm will be created automagically."""
+        if self._open_deferred:
+            self.open()
         return self.comm.comm_id
 
     #-------------------------------------------------------------------------
@@ -561,6 +876,7 @@ class Widget(LoggingHasTraits):
         Closes the underlying comm.
         When the comm is closed, all of the widget views are automatically
         removed from the front-end."""
+        self._open_deferred = False
         if self.comm is not None:
             _instances.pop(self.model_id, None)
             self.comm.close()
@@ -575,16 +891,106 @@ class Widget(LoggingHasTraits):
         key : unicode, or iterable (optional)
             A single property's name or iterable of property names to sync with the front-end.
         """
-        state = self.get_state(key=key)
-        if len(state) > 0:
+        keys = self._state_keys(key)
+        recorded = self._recorded_patches(keys)
+        if recorded:
+            keys = [k for k in keys if k not in recorded]
+        state = self.get_state(key=keys)
+        if len(state) > 0 or recorded:
             if self._property_lock:  # we need to keep this dict up to date with the front-end values
                 for name, value in state.items():
                     if name in self._property_lock:
                         self._property_lock[name] = value
+            patches, versions = self._make_patches(state)
+            patches.update(recorded)
             state, buffer_paths, buffers = _remove_buffers(state)
             msg = {'method': 'update', 'state': state, 'buffer_paths': buffer_paths}
+            if patches:
+                msg['patches'] = patches
+            if versions:
+                msg['versions'] = versions
             self._send(msg, buffers=buffers)
 
+    def _supports_capability(self, capability):
+        """Whether all frontends announced support for a protocol capability."""
+        return (Widget._frontend_capabilities is not None
+                and capability in Widget._frontend_capabilities)
+
+    def _make_patches(self, state):
+        """Replace the values of traits tagged with patch=True by patches.
+
+        The patched keys are removed from state. Returns the patches, and the
+        new versions of the patchable values which are still sent in full.
+        Patches are only made once all the frontends replied that they apply
+        them, so values are sent in full until then, e.g. in the cell which
+        imports ipywidgets.
+        """
+        patches, versions = {}, {}
+        if not self._supports_capability('patch'):
+            return patches, versions
+        patchable = self._get_sync_plan().patch
+        for k in list(state):
+            if k not in patchable:
+                continue
+            value = state[k]
+            version = self._sync_patch_versions.get(k, 0)
+            ops = None
+            if k in self._sync_patch_bases:
+                ops = _make_patch(self._sync_patch_bases[k], value)
+            self._sync_patch_versions[k] = version + 1
+            self._sync_patch_bases[k] = _patch_base(value)
+            if ops is None:
+                versions[k] = version + 1
+            else:
+                del state[k]
+                patches[k] = {'base': version, 'version': version + 1, 'ops': ops}
+        return patches, versions
+
+    def _recorded_patches(self, keys):
+        """Take the patches of the ops recorded with _patch_trait for keys.
+
+        The ops are dropped if the value must be sent in full instead, e.g.
+        because the frontend may not have the patch base.
+        """
+        patches = {}
+        if not self._sync_patch_ops:
+            return patches
+        for k in keys:
+            ops = self._sync_patch_ops.pop(k, None)
+            if (ops is None or k not in self._sync_patch_bases
+                    or not self._supports_capability('patch')):
+                continue
+            version = self._sync_patch_versions.get(k, 0)
+            _apply_patch(self._sync_patch_bases[k], ops)
+            self._sync_patch_versions[k] = version + 1
+            patches[k] = {'base': version, 'version': version + 1, 'ops': ops}
+        return patches
+
+    def _patch_trait(self, name, ops):
+        """Sync an in place change of the value of a trait tagged with patch=True.
+
+        ops are the patch ops of the change of the JSON value, which are sent
+        without serializing or diffing the whole value. No change notification
+        is fired, and the trait must not be locked by a state received from
+        the frontend.
+        """
+        if self._open_deferred:
+            # The frontend needs the model now, opening sends the whole state.
+            self.open()
+        elif self.comm is not None and getattr(self.comm, 'kernel', True) is not None:
+            self._sync_patch_ops.setdefault(name, []).extend(ops)
+            if self._should_send_property(name, None):
+                self.send_state(key=name)
+
+    def _state_keys(self, key):
+        """The list of keys of a state, given a key argument of get_state."""
+        if key is None:
+            return self.keys
+        elif isinstance(key, str):
+            return [key]
+        elif isinstance(key, Iterable):
+            return list(key)
+        raise ValueError("key must be a string, an iterable of keys, or None")
 
     def get_state(self, key=None, drop_defaults=False):
         """Gets the widget state, or a piece of it.
@@ -600,23 +1006,44 @@ class Widget(LoggingHasTraits):
         metadata : dict
             metadata for each field: {key: metadata}
         """
-        if key is None:
-            keys = self.keys
-        elif isinstance(key, str):
-            keys = [key]
-        elif isinstance(key, Iterable):
-            keys = key
-        else:
-            raise ValueError("key must be a string, an iterable of keys, or None")
+        keys = self._state_keys(key)
         state = {}
-        traits = self.traits()
+        plan = self._get_sync_plan()
+        to_json, default_values = plan.to_json, plan.default_values
         for k in keys:
-            to_json = self.trait_metadata(k, 'to_json', self._trait_to_json)
-            value = to_json(getattr(self, k), self)
-            if not drop_defaults or not self._compare(value, traits[k].default_value):
+            value = getattr(self, k)
+            # The default value itself (e.g. None) doesn't need to be serialized
+            if drop_defaults and value is default_values[k]:
+                continue
+            value = to_json[k](value, self)
+            if not drop_defaults or not self._compare(value, default_values[k]):
                 state[k] = value
         return state
 
+    def _drops_open_defaults(self):
+        """Whether default values are left out of the state that creates the
+        frontend model, which all frontends must support."""
+        if not self._supports_capability('drop_defaults'):
+            return False
+        if self._frontend_defaults is None:
+            return self._model_module in _core_model_modules
+        return self._frontend_defaults
+
+    def _get_open_state(self):
+        """Get the state to create the frontend model with."""
+        if not self._drops_open_defaults():
+            return self.get_state()
+        state = self.get_state(drop_defaults=True)
+        if self._frontend_defaults is None:
+            droppable = self._get_sync_plan().core_keys
+        else:
+            droppable = self._get_key_set()
+        missing = [k for k in self.keys
+                   if k not in state and (k not in droppable or k in _model_identity_keys)]
+        if missing:
+            state.update(self.get_state(key=missing))
+        return state
+
     def _is_numpy(self, x):
         return x.__class__.__name__ == 'ndarray' and x.__class__.__module__ == 'numpy'
 
@@ -630,29 +1057,55 @@ class Widget(LoggingHasTraits):
     def set_state(self, sync_data):
         """Called when a state is received from the front-end."""
         # Send an echo update message immediately
+        plan = self._get_sync_plan()
+        key_set = self._get_key_set()
+        echo_state = {}
         if JUPYTER_WIDGETS_ECHO:
-            echo_state = {}
             for attr, value in sync_data.items():
-                if attr in self.keys and self.trait_metadata(attr, 'echo_update', default=True):
+                if attr in key_set and attr in plan.echo_update:
                     echo_state[attr] = value
             if echo_state:
-                echo_state, echo_buffer_paths, echo_buffers = _remove_buffers(echo_state)
+                versions = self._echo_patch_versions(echo_state)
+                echo_msg_state, echo_buffer_paths, echo_buffers = _remove_buffers(echo_state)
                 msg = {
                     'method': 'echo_update',
-                    'state': echo_state,
+                    'state': echo_msg_state,
                     'buffer_paths': echo_buffer_paths,
                 }
+                if versions:
+                    msg['versions'] = versions
                 self._send(msg, buffers=echo_buffers)
+        # Patches can only be computed against values that all frontends have.
+        for attr in sync_data:
+            if attr not in echo_state:
+                self._sync_patch_bases.pop(attr, None)
 
         # The order of these context managers is important. Properties must
         # be locked when the hold_trait_notification context manager is
         # released and notifications are fired.
         with self._lock_property(**sync_data), self.hold_trait_notifications():
             for name in sync_data:
-                if name in self.keys:
-                    from_json = self.trait_metadata(name, 'from_json',
-                                                    self._trait_from_json)
-                    self.set_trait(name, from_json(sync_data[name], self))
+                if name in key_set:
+                    from_json = plan.from_json[name]
+                    value = from_json(sync_data[name], self)
+                    # A widget whose comm is not open yet is referenced as None
+                    if value is None and getattr(getattr(self, name), '_open_deferred', False):
+                        continue
+                    self.set_trait(name, value)
+
+    def _echo_patch_versions(self, echo_state):
+        """Version the echoed values of patchable traits, which become the base
+        of the next patch."""
+        versions = {}
+        if not self._supports_capability('patch'):
+            return versions
+        patchable = self._get_sync_plan().patch
+        for k, value in echo_state.items():
+            if k in patchable:
+                versions[k] = self._sync_patch_versions.get(k, 0) + 1
+                self._sync_patch_versions[k] = versions[k]
+                self._sync_patch_bases[k] = _patch_base(value)
+        return versions
 
     def send(self, content, buffers=None):
         """Sends a custom msg to the widget model in the front-end.
@@ -686,16 +1139,29 @@ class Widget(LoggingHasTraits):
         for name, trait in traits.items():
             if 'sync' in trait.metadata:
                 self.keys.append(name)
+                self._key_set = None
                 self.send_state(name)
 
+    def _send_references_to(self, widget):
+        """Send the traits referencing a widget which was left out of the state
+        before it opened."""
+        keys = [k for k in self.keys if getattr(self, k) is widget]
+        if keys:
+            self.send_state(keys)
+
     def notify_change(self, change):
         """Called when a property has changed."""
         # Send the state to the frontend before the user-registered callbacks
         # are called.
         name = change['name']
-        if self.comm is not None and getattr(self.comm, 'kernel', True) is not None:
+        # Recorded ops do not apply to a value which was set as a whole.
+        self._sync_patch_ops.pop(name, None)
+        if self._open_deferred and name in self._get_key_set():
+            # The frontend needs the model now, opening sends the whole state.
+            self.open()
+        elif self.comm is not None and getattr(self.comm, 'kernel', True) is not None:
             # Make sure this isn't information that the front-end just sent us.
-            if name in self.keys and self._should_send_property(name, getattr(self, name)):
+            if name in self._get_key_set() and self._should_send_property(name, getattr(self, name)):
                 # Send new state to front-end
                 self.send_state(key=name)
         super().notify_change(change)
@@ -736,10 +1202,64 @@ class Widget(LoggingHasTraits):
                 self.send_state(self._states_to_send)
                 self._states_to_send.clear()
 
+    def _is_coalescing(self):
+        """Whether trait updates are coalesced until the next event loop iteration."""
+        if self._coalesce_sync is None:
+            return JUPYTER_WIDGETS_COALESCE
+        return self._coalesce_sync
+
+    def _schedule_sync_flush(self):
+        """Schedule sending the pending states on the next event loop iteration."""
+        if not self._sync_flush_scheduled:
+            self._sync_flush_scheduled = True
+            _call_soon(self._flush_sync)
+
+    def _flush_sync(self):
+        """Send the coalesced states as a single update message."""
+        self._sync_flush_scheduled = False
+        # If we are holding the sync, the states are sent when it is released.
+        if self._holding_sync or not self._states_to_send:
+            return
+        keys = set(self._states_to_send)
+        self._states_to_send.clear()
+        self.send_state(keys)
+
+    def _throttle_sync(self, key, max_rate):
+        """Rate limit the updates of a trait tagged with max_rate.
+
+        Returns True if the update is deferred. At most max_rate updates are
+        sent per second, and a trailing update always sends the latest value.
+        The rate is checked on every change rather than left to the trailing
+        update, which may be late when the event loop is blocked, e.g. by a
+        loop running in a cell.
+        """
+        now = time.monotonic()
+        wait = self._sync_last_sent.get(key, float('-inf')) + 1.0 / max_rate - now
+        if wait <= 0:
+            self._sync_last_sent[key] = now
+            # The scheduled trailing update has nothing left to send
+            self._sync_throttled.discard(key)
+            return False
+        if key not in self._sync_throttled:
+            self._sync_throttled.add(key)
+            _call_later(wait, lambda: self._flush_throttled(key))
+        return True
+
+    def _flush_throttled(self, key):
+        """Send the latest value of a throttled trait, unless it was sent."""
+        if key not in self._sync_throttled:
+            return
+        self._sync_throttled.discard(key)
+        self._sync_last_sent[key] = time.monotonic()
+        if self._holding_sync:
+            self._states_to_send.add(key)
+        else:
+            self.send_state(key)
+
     def _should_send_property(self, key, value):
         """Check the property lock (property_lock)"""
-        to_json = self.trait_metadata(key, 'to_json', self._trait_to_json)
         if key in self._property_lock:
+            to_json = self._get_sync_plan().to_json[key]
             # model_state, buffer_paths, buffers
             split_value = _remove_buffers({ key: to_json(value, self)})
             split_lock = _remove_buffers({ key: self._property_lock[key]})
@@ -749,12 +1269,18 @@ class Widget(LoggingHasTraits):
             if (jsonloads(jsondumps(split_value[0])) == split_lock[0]
                 and split_value[1] == split_lock[1]
                 and _buffer_list_equal(split_value[2], split_lock[2])):
-                if self._holding_sync:
-                    self._states_to_send.discard(key)
+                self._states_to_send.discard(key)
                 return False
         if self._holding_sync:
             self._states_to_send.add(key)
             return False
+        max_rate = self._get_sync_plan().max_rate.get(key)
+        if max_rate and self._throttle_sync(key, max_rate):
+            return False
+        elif self._is_coalescing():
+            self._states_to_send.add(key)
+            self._schedule_sync_flush()
+            return False
         else:
             return True
 
@@ -774,6 +1300,8 @@ class Widget(LoggingHasTraits):
 
         # Handle a state request.
         elif method == 'request_state':
+            # Send patchable values in full, the frontend may be out of sync.
+            self._sync_patch_bases.clear()
             self.send_state()
 
         # Handle a custom msg from the front-end.
@@ -800,6 +1328,8 @@ class Widget(LoggingHasTraits):
         return x
 
     def _repr_mimebundle_(self, **kwargs):
+        if self._open_deferred:
+            self.open()
         plaintext = repr(self)
         if len(plaintext) > 110:
             plaintext = plaintext[:110] + '…'
@@ -825,7 +1355,7 @@ class Widget(LoggingHasTraits):
             self.comm.send(data=msg, buffers=buffers)
 
     def _repr_keys(self):
-        traits = self.traits()
+        traits = self._get_sync_plan().traits
         for key in sorted(self.keys):
             # Exclude traits that start with an underscore
             if key[0] == '_':
@@ -849,3 +1379,41 @@ class Widget(LoggingHasTraits):
             for key in keys
         )
         return '{}({})'.format(class_name, signature)
+
+
+class SharedWidget(Widget):
+    """Base class for widgets that can be shared between many owners.
+
+    ``shared(**kwargs)`` returns one read-only instance per unique state, so
+    that e.g. hundreds of buttons with ``Layout.shared(width='100%')`` use a
+    single model in the frontend.
+    """
+
+    _shared = False
+    _shared_instances = weakref.WeakValueDictionary()
+
+    @classmethod
+    def shared(cls, **kwargs):
+        """Return the shared, read-only instance with the given properties.
+
+        A shared instance cannot be changed. To change the property of one
+        widget using it, assign a new instance to that widget instead.
+        """
+        candidate = cls(_defer_open=True, **kwargs)
+        key = (cls, jsondumps(candidate.get_state(drop_defaults=True),
+                              sort_keys=True, default=repr))
+        instance = cls._shared_instances.get(key)
+        if instance is None or instance.comm is None:
+            instance = candidate
+            instance.open()
+            instance._shared = True
+            cls._shared_instances[key] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        if self._shared and name in self._get_key_set():
+            raise TraitError(
+                'Shared {} instances are read-only, assign a new instance to '
+                'the widget instead, e.g. widget.layout = {}.shared(...)'.format(
+                    type(self).__name__, type(self).__name__))
+        super().__setattr__(name, value)
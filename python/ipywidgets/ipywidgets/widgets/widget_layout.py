@@ -4,13 +4,13 @@
 """Contains the Layout class"""
 
 from traitlets import Unicode, Instance, CaselessStrEnum, validate
-from .widget import Widget, register
+from .widget import SharedWidget, register
 from .._version import __jupyter_widgets_base_version__
 
 CSS_PROPERTIES=['inherit', 'initial', 'unset']
 
 @register
-class Layout(Widget):
+class Layout(SharedWidget):
     """Layout specification
 
     Defines a layout that can be expressed using CSS.  Supports a subset of
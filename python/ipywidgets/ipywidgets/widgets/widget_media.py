@@ -1,16 +1,42 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 
+import hashlib
+import io
 import mimetypes
+import mmap as _mmap
+import os
+import threading
+import time
+from collections import deque
 
 from .widget_core import CoreWidget
 from .domwidget import DOMWidget
 from .valuewidget import ValueWidget
 from .widget import register
-from traitlets import Unicode, CUnicode, Bool
+from traitlets import Unicode, CUnicode, Bool, Float, Int, CaselessStrEnum, Tuple, observe
 from .trait_types import CByteMemoryView
 
 
+def _mmap_file(f):
+    """Return a read-only memory view of the file object f, memory-mapped.
+
+    Like f.read(), the view starts at the current position of f, which is
+    moved to the end of the file. The mapping starts at the closest offset
+    allowed before the position. Files with nothing left to read, which
+    can't be memory-mapped, give an empty value.
+    """
+    fileno = f.fileno()
+    position = f.tell()
+    size = os.fstat(fileno).st_size
+    if position >= size:
+        return b''
+    offset = position - position % _mmap.ALLOCATIONGRANULARITY
+    mapped = _mmap.mmap(fileno, size - offset, access=_mmap.ACCESS_READ, offset=offset)
+    f.seek(size)
+    return memoryview(mapped)[position - offset:]
+
+
 @register
 class _Media(DOMWidget, ValueWidget, CoreWidget):
     """Base class for Image, Audio and Video widgets.
@@ -26,7 +52,7 @@ class _Media(DOMWidget, ValueWidget, CoreWidget):
     value = CByteMemoryView(help="The media data as a memory view of bytes.").tag(sync=True)
 
     @classmethod
-    def _from_file(cls, tag, filename, **kwargs):
+    def _from_file(cls, tag, filename, mmap=False, **kwargs):
         """
         Create an :class:`Media` from a local file.
 
@@ -35,12 +61,16 @@ class _Media(DOMWidget, ValueWidget, CoreWidget):
         filename: str
             The location of a file to read into the value from disk.
 
+        mmap: bool
+            If True, memory-map the file instead of reading it, see
+            :meth:`set_value_from_file`. Default: False
+
         **kwargs:
             The keyword arguments for `Media`
 
         Returns an `Media` with the value set from the filename.
         """
-        value = cls._load_file_value(filename)
+        value = cls._load_file_value(filename, mmap=mmap)
 
         if 'format' not in kwargs:
             format = cls._guess_format(tag, filename)
@@ -73,7 +103,7 @@ class _Media(DOMWidget, ValueWidget, CoreWidget):
 
         return cls(value=url, format='url', **kwargs)
 
-    def set_value_from_file(self, filename):
+    def set_value_from_file(self, filename, mmap=False):
         """
         Convenience method for reading a file into `value`.
 
@@ -81,19 +111,44 @@ class _Media(DOMWidget, ValueWidget, CoreWidget):
         ----------
         filename: str
             The location of a file to read into value from disk.
+
+        mmap: bool
+            If True, memory-map the file instead of reading it. The value is
+            then a read-only memory view of the mapped file, which is sent to
+            the frontend without being copied, and the file must not be
+            modified while the widget uses it. The mapping is released when
+            the widget is closed or its value replaced. Like with reading,
+            the value of a file object starts at its current position. File
+            objects without a file descriptor are read as usual.
+            Default: False
         """
-        value = self._load_file_value(filename)
+        value = self._load_file_value(filename, mmap=mmap)
 
         self.value = value
 
     @classmethod
-    def _load_file_value(cls, filename):
+    def _load_file_value(cls, filename, mmap=False):
         if getattr(filename, 'read', None) is not None:
+            if mmap:
+                try:
+                    return _mmap_file(filename)
+                except (AttributeError, OSError, ValueError):
+                    # e.g. io.BytesIO, which has no file descriptor
+                    pass
             return filename.read()
         else:
             with open(filename, 'rb') as f:
+                if mmap:
+                    return _mmap_file(f)
                 return f.read()
 
+    def close(self):
+        super().close()
+        # Drop the reference to a memory-mapped value, so that the file is
+        # unmapped once the messages being sent no longer use it
+        if isinstance(self.value.obj, _mmap.mmap):
+            self.set_trait('value', b'')
+
     @classmethod
     def _guess_format(cls, tag, filename):
         # file objects may have a .name parameter
@@ -142,6 +197,9 @@ class Image(_Media):
 
     If you pass `"url"` to the `"format"` trait, `value` will be interpreted
     as a URL as bytes encoded in UTF-8.
+
+    To show a live stream of images, e.g. from a camera or a simulation,
+    use :meth:`push_frame` instead of setting `value`.
     """
     _view_name = Unicode('ImageView').tag(sync=True)
     _model_name = Unicode('ImageModel').tag(sync=True)
@@ -153,17 +211,214 @@ class Image(_Media):
     height = CUnicode(help="Height of the image in pixels. Use layout.height "
                            "for styling the widget.").tag(sync=True)
 
+    frame_timeout = Float(1.0, min=0, help="The time in seconds after which "
+                          "a pushed frame is considered lost if the frontend "
+                          "did not acknowledge it.")
+    fps = Float(0, read_only=True, help="The rate of the pushed frames "
+                "acknowledged by the frontend, in frames per second.")
+    frames_dropped = Int(0, read_only=True, help="The number of pushed "
+                         "frames which were dropped.")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._frame_lock = threading.Lock()
+        self._frame_id = 0
+        self._frame_sent_at = None
+        self._pending_frame = None
+        self._frame_acks = deque(maxlen=30)
+        self.on_msg(self._handle_frame_msg)
+
+    def push_frame(self, frame):
+        """Show a new frame of a stream of images.
+
+        The frame is sent to the frontend as a binary message, without
+        updating `value`. While the frontend has not acknowledged showing
+        the previous frame, the frame waits to be sent and is replaced by
+        the next pushed frame, which drops it. Frames thus never queue up
+        when the frontend is slower than the pushes.
+
+        Acknowledgements are handled by the kernel like other widget
+        messages, so the frames should be pushed from a thread or an
+        asyncio task. Otherwise a frame is sent every `frame_timeout`
+        seconds at most.
+
+        Parameters
+        ----------
+        frame: bytes
+            The image data, in the image `format`.
+        """
+        frame = memoryview(frame).cast('B')
+        with self._frame_lock:
+            if (self._frame_sent_at is not None and
+                    time.monotonic() - self._frame_sent_at < self.frame_timeout):
+                if self._pending_frame is not None:
+                    self.set_trait('frames_dropped', self.frames_dropped + 1)
+                self._pending_frame = frame
+            else:
+                self._send_frame(frame)
+
+    def _send_frame(self, frame):
+        self._frame_id += 1
+        self._frame_sent_at = time.monotonic()
+        self._pending_frame = None
+        self.send({'event': 'frame', 'id': self._frame_id}, buffers=[frame])
+
+    def _handle_frame_msg(self, _, content, buffers):
+        """Handle a msg from the front-end.
+
+        Parameters
+        ----------
+        content: dict
+            Content of the msg.
+        """
+        if content.get('event', '') != 'frame_ack':
+            return
+        with self._frame_lock:
+            if content.get('id') != self._frame_id:
+                # The frame was considered lost and another one was sent
+                return
+            self._frame_acks.append(time.monotonic())
+            if len(self._frame_acks) > 1:
+                elapsed = self._frame_acks[-1] - self._frame_acks[0]
+                if elapsed > 0:
+                    self.set_trait('fps', (len(self._frame_acks) - 1) / elapsed)
+            self._frame_sent_at = None
+            if self._pending_frame is not None:
+                self._send_frame(self._pending_frame)
 
     @classmethod
-    def from_file(cls, filename, **kwargs):
-        return cls._from_file('image', filename, **kwargs)
+    def from_file(cls, filename, mmap=False, **kwargs):
+        return cls._from_file('image', filename, mmap=mmap, **kwargs)
 
     def __repr__(self):
         return self._get_repr(Image)
 
 
+@register
+class TiledImage(DOMWidget, CoreWidget):
+    """Displays an image given as an array of pixels, updated by tiles.
+
+    The image is split in square tiles of ``tile_size`` pixels. Each call to
+    :meth:`update_array` only sends the tiles whose content changed, which
+    the frontend draws over the previous image. This is much cheaper than
+    encoding and sending a whole image when a large image (e.g. a heatmap)
+    only changes in small regions.
+
+    The tiles are sent as raw pixels, or encoded in PNG or JPEG with the
+    ``encoding`` option, which requires the Pillow package.
+
+    Example::
+        import numpy as np
+        from ipywidgets import TiledImage
+        pixels = np.zeros((2160, 3840, 3), dtype=np.uint8)
+        image = TiledImage()
+        image.update_array(pixels)
+        pixels[100:200, 100:200] = 255
+        image.update_array(pixels)  # only sends one tile
+    """
+    _view_name = Unicode('TiledImageView').tag(sync=True)
+    _model_name = Unicode('TiledImageModel').tag(sync=True)
+
+    width = CUnicode(help="Width of the image in pixels. Use layout.width "
+                          "for styling the widget.").tag(sync=True)
+    height = CUnicode(help="Height of the image in pixels. Use layout.height "
+                           "for styling the widget.").tag(sync=True)
+    tile_size = Int(256, min=1, help="The size of the tiles in pixels.")
+    encoding = CaselessStrEnum(['raw', 'png', 'jpeg'], default_value='raw',
+        help="The encoding of the tiles sent to the frontend.")
+    shape = Tuple(Int(), Int(), default_value=(0, 0), read_only=True,
+        help="The height and width of the image in pixels.").tag(sync=True)
+
+    _array = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tile_hashes = {}
+        self.on_msg(self._handle_tiles_msg)
+
+    def update_array(self, array):
+        """Show an array of pixels, sending the tiles which changed.
+
+        Parameters
+        ----------
+        array: numpy.ndarray
+            The pixels, as an array of uint8 of shape (height, width) for
+            grayscale images, or (height, width, channels) with 3 (RGB) or
+            4 (RGBA) channels. The widget keeps a reference to the array
+            to send all the tiles to new frontends.
+        """
+        import numpy as np
+        array = np.asarray(array)
+        if array.dtype != np.uint8:
+            raise ValueError('expected an array of uint8, not %s' % array.dtype)
+        if array.ndim == 2:
+            array = array[:, :, np.newaxis]
+        if array.ndim != 3 or array.shape[2] not in (1, 3, 4):
+            raise ValueError('expected an array of shape (height, width), '
+                             '(height, width, 3) or (height, width, 4), '
+                             'not %r' % (array.shape,))
+        if self._array is None or self._array.shape != array.shape:
+            self._tile_hashes = {}
+        self._array = array
+        self.set_trait('shape', array.shape[:2])
+        self._send_tiles(self._changed_tiles())
+
+    @observe('tile_size')
+    def _tile_size_changed(self, change):
+        self._tile_hashes = {}
+
+    def _tiles(self):
+        """Iterate over the (x, y, tile) of the image array."""
+        size = self.tile_size
+        height, width = self._array.shape[:2]
+        for y in range(0, height, size):
+            for x in range(0, width, size):
+                yield x, y, self._array[y:y + size, x:x + size]
+
+    def _changed_tiles(self):
+        changed = []
+        for x, y, tile in self._tiles():
+            digest = hashlib.blake2b(tile.tobytes(), digest_size=16).digest()
+            if self._tile_hashes.get((x, y)) != digest:
+                self._tile_hashes[(x, y)] = digest
+                changed.append((x, y, tile))
+        return changed
+
+    def _encode_tile(self, tile):
+        if self.encoding == 'raw':
+            import numpy as np
+            return memoryview(np.ascontiguousarray(tile)).cast('B')
+        from PIL import Image as PILImage
+        if tile.shape[2] == 1:
+            tile = tile[:, :, 0]
+        elif self.encoding == 'jpeg' and tile.shape[2] == 4:
+            tile = tile[:, :, :3]
+        f = io.BytesIO()
+        PILImage.fromarray(tile).save(f, format=self.encoding)
+        return f.getvalue()
+
+    def _send_tiles(self, tiles):
+        if not tiles:
+            return
+        rects = [[x, y, tile.shape[1], tile.shape[0]] for x, y, tile in tiles]
+        buffers = [self._encode_tile(tile) for x, y, tile in tiles]
+        height, width, channels = self._array.shape
+        self.send({'event': 'tiles', 'shape': [height, width],
+                   'channels': channels, 'encoding': self.encoding,
+                   'tiles': rects}, buffers=buffers)
+
+    def _handle_tiles_msg(self, _, content, buffers):
+        """Handle a msg from the front-end.
+
+        Parameters
+        ----------
+        content: dict
+            Content of the msg.
+        """
+        if content.get('event', '') == 'request_tiles' and self._array is not None:
+            self._send_tiles(list(self._tiles()))
+
+
 @register
 class Video(_Media):
     """Displays a video as a widget.
@@ -188,8 +443,8 @@ class Video(_Media):
     controls = Bool(True, help="Specifies that video controls should be displayed (such as a play/pause button etc)").tag(sync=True)
 
     @classmethod
-    def from_file(cls, filename, **kwargs):
-        return cls._from_file('video', filename, **kwargs)
+    def from_file(cls, filename, mmap=False, **kwargs):
+        return cls._from_file('video', filename, mmap=mmap, **kwargs)
 
     def __repr__(self):
         return self._get_repr(Video)
@@ -217,8 +472,8 @@ class Audio(_Media):
     controls = Bool(True, help="Specifies that audio controls should be displayed (such as a play/pause button etc)").tag(sync=True)
 
     @classmethod
-    def from_file(cls, filename, **kwargs):
-        return cls._from_file('audio', filename, **kwargs)
+    def from_file(cls, filename, mmap=False, **kwargs):
+        return cls._from_file('audio', filename, mmap=mmap, **kwargs)
 
     def __repr__(self):
         return self._get_repr(Audio)
@@ -6,7 +6,13 @@
 Represents a widget that can be used to display output within the widget area.
 """
 
+import asyncio
+import contextvars
+import json
 import sys
+import tempfile
+import threading
+from array import array
 from functools import wraps
 
 from .domwidget import DOMWidget
@@ -14,12 +20,239 @@ from .trait_types import TypedTuple
 from .widget import register
 from .._version import __jupyter_widgets_output_version__
 
-from traitlets import Unicode, Dict
+from traitlets import All, Unicode, Dict, Int, Bool, observe, validate
 from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import clear_output
 from IPython import get_ipython
 import traceback
 
+# The stack of (output widget, routed) pairs entered in the current thread or
+# asyncio task. The stdout and stderr writes of a routed context are appended
+# to its output widget by the kernel, instead of being captured by frontends.
+_output_stack = contextvars.ContextVar('_output_stack', default=())
+
+# Frontends capture the outputs of the messages with the parent msg_id of an
+# Output widget, so this only works for one thread or task at a time: the one
+# owning the capture. Output widgets entered elsewhere route their output.
+_capture_lock = threading.Lock()
+_capture_owner = None
+_capture_depth = 0
+# The number of routed contexts, which need sys.stdout and sys.stderr to be
+# wrapped by a _RoutedStream, and the display publisher of the shell by a
+# _RoutedDisplayPublisher.
+_routing_count = 0
+
+
+# Text is merged into the last stream output while it has fewer characters,
+# so that appending to a stream copies a bounded amount of text.
+_STREAM_MERGE_SIZE = 8192
+
+
+def _context_id():
+    """Identify the thread and asyncio task the current code runs in."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), task
+
+
+def _acquire_capture():
+    """Whether the current context can use the msg_id capture of frontends."""
+    global _capture_owner, _capture_depth
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    context = _context_id()
+    with _capture_lock:
+        if _capture_owner is not None and _capture_owner != context:
+            return False
+        _capture_owner = context
+        _capture_depth += 1
+        return True
+
+
+def _release_capture():
+    global _capture_owner, _capture_depth
+    with _capture_lock:
+        _capture_depth -= 1
+        if _capture_depth == 0:
+            _capture_owner = None
+
+
+class _RoutedStream:
+    """Wrap sys.stdout or sys.stderr to route writes to output widgets."""
+
+    def __init__(self, stream, name):
+        self._stream = stream
+        self._name = name
+
+    def write(self, text):
+        stack = _output_stack.get()
+        if stack and stack[-1][1]:
+            stack[-1][0]._write_routed(self._name, text)
+            return len(text)
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _routed_target(method):
+    """The target of the innermost context, if it is routed and has method."""
+    stack = _output_stack.get()
+    if stack and stack[-1][1] and hasattr(stack[-1][0], method):
+        return stack[-1][0]
+    return None
+
+
+class _RoutedDisplayPublisher:
+    """Wrap the display publisher of the shell to route displayed outputs.
+
+    The outputs are collected by the targets of routed contexts which have
+    `_display_routed` and `_clear_routed` methods, i.e. output widgets and
+    the runs of interact functions. Other outputs are published as usual.
+    """
+
+    def __init__(self, display_pub):
+        self._display_pub = display_pub
+
+    def publish(self, data, metadata=None, *args, **kwargs):
+        target = _routed_target('_display_routed')
+        if target is None:
+            return self._display_pub.publish(data, metadata, *args, **kwargs)
+        target._display_routed(data, metadata or {})
+
+    def clear_output(self, wait=False):
+        target = _routed_target('_clear_routed')
+        if target is None:
+            return self._display_pub.clear_output(wait)
+        target._clear_routed(wait)
+
+    def __getattr__(self, name):
+        return getattr(self._display_pub, name)
+
+
+def _install_routing():
+    """Wrap sys.stdout, sys.stderr and the display publisher for a routed context.
+
+    Calls must be paired with calls to `_uninstall_routing`, which restores
+    the original streams when the last routed context exits.
+    """
+    global _routing_count
+    with _capture_lock:
+        _routing_count += 1
+        if not isinstance(sys.stdout, _RoutedStream):
+            sys.stdout = _RoutedStream(sys.stdout, 'stdout')
+        if not isinstance(sys.stderr, _RoutedStream):
+            sys.stderr = _RoutedStream(sys.stderr, 'stderr')
+        ip = get_ipython()
+        if ip is not None and not isinstance(ip.display_pub, _RoutedDisplayPublisher):
+            ip.display_pub = _RoutedDisplayPublisher(ip.display_pub)
+
+
+def _uninstall_routing():
+    global _routing_count
+    with _capture_lock:
+        _routing_count -= 1
+        if _routing_count:
+            return
+        # Streams replaced since, e.g. by contextlib.redirect_stdout, are kept
+        if isinstance(sys.stdout, _RoutedStream):
+            sys.stdout = sys.stdout._stream
+        if isinstance(sys.stderr, _RoutedStream):
+            sys.stderr = sys.stderr._stream
+        ip = get_ipython()
+        if ip is not None and isinstance(ip.display_pub, _RoutedDisplayPublisher):
+            ip.display_pub = ip.display_pub._display_pub
+
+
+def _call_on_io_loop(callback):
+    """Call callback on the IO loop of the kernel, or right away without it."""
+    ip = get_ipython()
+    io_loop = getattr(getattr(ip, 'kernel', None), 'io_loop', None)
+    if io_loop is not None and hasattr(io_loop, 'add_callback'):
+        io_loop.add_callback(callback)
+    else:
+        callback()
+
+
+def _output_size(value):
+    """Approximate size of an output in bytes, counting its strings."""
+    if isinstance(value, str):
+        return len(value)
+    elif isinstance(value, dict):
+        return sum(len(k) + _output_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return sum(_output_size(v) for v in value)
+    return 8
+
+
+def _trim_stream(output, size):
+    """Split a stream output, keeping at most size characters of its text.
+
+    The text is cut after a newline when possible. Returns the kept output
+    and the output with the text cut off.
+    """
+    text = output['text']
+    cut = len(text) - size
+    newline = text.find('\n', cut, len(text) - 1)
+    if newline != -1:
+        cut = newline + 1
+    return dict(output, text=text[cut:]), dict(output, text=text[:cut])
+
+
+def _evict_outputs(outputs, max_outputs, max_bytes):
+    """Return the outputs kept within the limits, and the evicted outputs.
+
+    The limits are checked like in a ring buffer, but the outputs are
+    evicted down to 90% of the limits so that the frontends, which redraw
+    the output area when outputs are evicted, only do it once in a while.
+    """
+    evict = 0
+    if max_outputs is not None and len(outputs) > max_outputs:
+        evict = len(outputs) - max_outputs + max_outputs // 10
+    kept, evicted = outputs[evict:], outputs[:evict]
+    if max_bytes is None:
+        return kept, evicted
+    sizes = [_output_size(output) for output in kept]
+    total = sum(sizes)
+    if total <= max_bytes:
+        return kept, evicted
+    target = max_bytes - max_bytes // 10
+    i = 0
+    while i < len(kept) - 1 and total > target:
+        total -= sizes[i]
+        i += 1
+    evicted += kept[:i]
+    kept = kept[i:]
+    last = kept[-1]
+    if (total > target and last.get('output_type') == 'stream'
+            and isinstance(last.get('text'), str)):
+        # A single stream output merging many writes can still be too big
+        size = max(len(last['text']) - (total - target), 0)
+        last, cut = _trim_stream(last, size)
+        kept = (last,)
+        evicted += (cut,)
+    return kept, evicted
+
+
+class _Outputs(TypedTuple):
+    """The outputs of an Output widget.
+
+    The tuple is built when it is read, from the list of outputs which
+    Output._append_stream_output appends to in place.
+    """
+
+    def get(self, obj, cls=None):
+        obj._build_outputs()
+        return super().get(obj, cls)
+
+    def set(self, obj, value):
+        obj._build_outputs()
+        obj._output_list = None
+        super().set(obj, value)
+
+
 @register
 class Output(DOMWidget):
     """Widget used as a context manager to display output.
@@ -49,6 +282,16 @@ class Output(DOMWidget):
         @out.capture()
         def func():
             print('prints to output widget')
+
+    Output widgets can be used by several threads or asyncio tasks at the
+    same time. The frontend captures the output of the first one as usual,
+    while the stdout, stderr and displayed outputs of the others are routed
+    by the kernel to the output widget they are in.
+
+    The outputs kept by the widget can be bounded with ``max_outputs`` and
+    ``max_bytes``, which evict the oldest outputs. With ``spill=True``, the
+    evicted outputs are written to a temporary file instead, from which the
+    frontend can load them back on demand.
     """
     _view_name = Unicode('OutputView').tag(sync=True)
     _model_name = Unicode('OutputModel').tag(sync=True)
@@ -58,9 +301,113 @@ class Output(DOMWidget):
     _model_module_version = Unicode(__jupyter_widgets_output_version__).tag(sync=True)
 
     msg_id = Unicode('', help="Parent message id of messages to capture").tag(sync=True)
-    outputs = TypedTuple(trait=Dict(), help="The output messages synced from the frontend.").tag(sync=True)
+    outputs = _Outputs(trait=Dict(), help="The output messages synced from the frontend.").tag(sync=True, patch=True)
+
+    max_outputs = Int(None, allow_none=True, min=1,
+        help="The maximum number of outputs kept, or None for no limit.")
+    max_bytes = Int(None, allow_none=True, min=1,
+        help="The approximate maximum size of the outputs kept, or None for no limit.")
+    spill = Bool(False,
+        help="Write the evicted outputs to a temporary file, instead of discarding them.")
+    _spilled_count = Int(0, read_only=True,
+        help="The number of outputs written to the spill file.").tag(sync=True)
 
     __counter = 0
+    _spill_file = None
+    _spill_offsets = None
+    # The outputs appended to in place since outputs was last set, and
+    # whether the outputs tuple must be built from them.
+    _output_list = None
+    _output_list_changed = False
+    # Whether a routed context cleared the outputs with wait=True
+    _routed_clear_pending = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._routed_buffer = []
+        self._routed_lock = threading.Lock()
+        self._routed_flush_lock = threading.Lock()
+        self.on_msg(self._handle_spill_msg)
+
+    def close(self):
+        super().close()
+        self._discard_spill()
+
+    @validate('outputs')
+    def _validate_outputs(self, proposal):
+        outputs = proposal.value
+        if not outputs:
+            # Clearing the outputs also discards the spilled ones
+            self._discard_spill()
+            return outputs
+        if self.max_outputs is None and self.max_bytes is None:
+            return outputs
+        kept, evicted = _evict_outputs(outputs, self.max_outputs, self.max_bytes)
+        if evicted and self.spill:
+            self._spill_outputs(evicted)
+        return kept
+
+    @observe('max_outputs', 'max_bytes')
+    def _limits_changed(self, change):
+        self.outputs = self.outputs
+
+    def _spill_outputs(self, outputs):
+        """Append outputs to the spill file."""
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile()
+            self._spill_offsets = array('q')
+        f = self._spill_file
+        f.seek(0, 2)
+        for output in outputs:
+            self._spill_offsets.append(f.tell())
+            f.write(json.dumps(output).encode('utf-8') + b'\n')
+        self.set_trait('_spilled_count', len(self._spill_offsets))
+
+    def _discard_spill(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = self._spill_offsets = None
+        if self._spilled_count:
+            self.set_trait('_spilled_count', 0)
+
+    def spilled_outputs(self, offset=0, limit=None):
+        """Return a list of the outputs written to the spill file.
+
+        Parameters
+        ----------
+
+        offset: int
+            The index of the first spilled output returned, the oldest
+            evicted output having index 0.
+        limit: int
+            The maximum number of outputs returned. Default: all of them.
+        """
+        count = self._spilled_count
+        offset = min(max(offset, 0), count)
+        end = count if limit is None else min(offset + max(limit, 0), count)
+        if offset >= end:
+            return []
+        f = self._spill_file
+        f.seek(self._spill_offsets[offset])
+        if end < count:
+            data = f.read(self._spill_offsets[end] - self._spill_offsets[offset])
+        else:
+            data = f.read()
+        return [json.loads(line) for line in data.splitlines()]
+
+    def _handle_spill_msg(self, _, content, buffers):
+        """Handle a msg from the front-end.
+
+        Parameters
+        ----------
+        content: dict
+            Content of the msg.
+        """
+        if content.get('event', '') == 'request_spilled':
+            offset = max(int(content.get('offset', 0)), 0)
+            limit = max(int(content.get('limit', 0)), 0)
+            self.send({'event': 'spilled', 'offset': offset,
+                       'outputs': self.spilled_outputs(offset, limit)})
 
     def clear_output(self, *pargs, **kwargs):
         """
@@ -107,6 +454,11 @@ class Output(DOMWidget):
     def __enter__(self):
         """Called upon entering output widget context manager."""
         self._flush()
+        routed = not _acquire_capture()
+        _output_stack.set(_output_stack.get() + ((self, routed),))
+        if routed:
+            _install_routing()
+            return
         ip = get_ipython()
         kernel = None
         if ip and getattr(ip, "kernel", None) is not None:
@@ -128,6 +480,16 @@ class Output(DOMWidget):
 
     def __exit__(self, etype, evalue, tb):
         """Called upon exiting output widget context manager."""
+        stack = _output_stack.get()
+        _output_stack.set(stack[:-1])
+        if stack[-1][1]:
+            _uninstall_routing()
+            if etype is None:
+                return None
+            self._write_routed('stderr', ''.join(
+                traceback.format_exception(etype, evalue, tb)))
+            return True if get_ipython() else None
+        _release_capture()
         kernel = None
         if etype is not None:
             ip = get_ipython()
@@ -159,11 +521,108 @@ class Output(DOMWidget):
         sys.stdout.flush()
         sys.stderr.flush()
 
+    def _buffer_routed(self, kind, value):
+        """Buffer an output of a routed context.
+
+        The buffered outputs are applied in batches, on the IO loop of the
+        kernel, so that threads only take a lock to write.
+        """
+        with self._routed_lock:
+            scheduled = bool(self._routed_buffer)
+            self._routed_buffer.append((kind, value))
+        if not scheduled:
+            _call_on_io_loop(self._flush_routed)
+
+    def _write_routed(self, stream_name, text):
+        """Buffer text written to stdout or stderr in a routed context."""
+        self._buffer_routed(stream_name, text)
+
+    def _display_routed(self, data, metadata):
+        """Buffer an output displayed in a routed context."""
+        self._buffer_routed('display', {
+            'output_type': 'display_data', 'data': data, 'metadata': metadata})
+
+    def _clear_routed(self, wait):
+        """Buffer clearing the outputs in a routed context."""
+        self._buffer_routed('clear', wait)
+
+    def _flush_routed(self):
+        """Apply the buffered outputs of routed contexts."""
+        with self._routed_lock:
+            buffer, self._routed_buffer = self._routed_buffer, []
+        chunks = []
+        for kind, value in buffer:
+            if chunks and chunks[-1][0] == kind and kind in ('stdout', 'stderr'):
+                chunks[-1][1].append(value)
+            else:
+                chunks.append((kind, [value]))
+        with self._routed_flush_lock:
+            for kind, values in chunks:
+                if kind == 'clear':
+                    self._routed_clear_pending = True
+                    if values[0]:
+                        # Wait until the next output to clear
+                        continue
+                if self._routed_clear_pending:
+                    self._routed_clear_pending = False
+                    self.outputs = ()
+                if kind == 'display':
+                    self.outputs += tuple(values)
+                elif kind != 'clear':
+                    self._append_stream_output(''.join(values), stream_name=kind)
+
+    def _build_outputs(self):
+        if self._output_list_changed:
+            self._trait_values['outputs'] = tuple(self._output_list)
+            self._output_list_changed = False
+
+    def _appends_in_place(self):
+        """Whether outputs can be appended to a list, instead of setting a
+        new outputs tuple which is validated and diffed with the previous
+        one, taking a time proportional to the number of outputs."""
+        if self.max_outputs is not None or self.max_bytes is not None:
+            return False
+        if 'outputs' in self._property_lock:
+            return False
+        notifiers = self._trait_notifiers
+        return not any(notifiers.get(name, {}).get(kind)
+                       for name in ('outputs', All) for kind in ('change', All))
+
     def _append_stream_output(self, text, stream_name):
-        """Append a stream output."""
-        self.outputs += (
-            {'output_type': 'stream', 'name': stream_name, 'text': text},
-        )
+        """Append a stream output.
+
+        The text is merged into the last output when it is a stream of the
+        same name, like frontends do with consecutive stream messages, until
+        its text reaches _STREAM_MERGE_SIZE characters. The frontend is then
+        sent a patch with the appended text only.
+
+        Unless the outputs are bounded or observed, the output is appended
+        to a list in place and the patch op is recorded directly, so that
+        appending takes a constant time.
+        """
+        in_place = self._appends_in_place()
+        if in_place and self._output_list is None:
+            self._output_list = list(self.outputs)
+        outputs = self._output_list if in_place else self.outputs
+        index = len(outputs)
+        output = {'output_type': 'stream', 'name': stream_name, 'text': text}
+        op = {'op': 'splice', 'index': index, 'remove': 0, 'insert': [output]}
+        if outputs:
+            last = outputs[-1]
+            if (last.get('output_type') == 'stream'
+                    and last.get('name') == stream_name
+                    and isinstance(last.get('text'), str)
+                    and len(last['text']) < _STREAM_MERGE_SIZE):
+                index -= 1
+                output = dict(last, text=last['text'] + text)
+                op = {'op': 'patch', 'index': index, 'ops': [
+                    {'op': 'append', 'key': 'text', 'value': text}]}
+        if not in_place:
+            self.outputs = outputs[:index] + (output,)
+            return
+        outputs[index:] = [output]
+        self._output_list_changed = True
+        self._patch_trait('outputs', [op])
 
     def append_stdout(self, text):
         """Append text to the stdout stream."""
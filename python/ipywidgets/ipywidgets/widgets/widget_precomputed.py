@@ -0,0 +1,54 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+"""PrecomputedOutputs class.
+
+Switch between precomputed outputs of an interact on the javascript side.
+"""
+
+import math
+
+from .widget import Widget, register, widget_serialization
+from .widget_core import CoreWidget
+from .widget_output import Output
+from .trait_types import TypedTuple
+
+from traitlets import Unicode, Instance, List
+
+
+@register
+class PrecomputedOutputs(CoreWidget):
+    """PrecomputedOutputs Widget
+
+    Show the outputs computed for the values of some controls in an output
+    widget, when they change. The outputs are switched by the front-end, so
+    that this works without a kernel, e.g. in embedded widgets.
+
+    controls: the control widgets
+    control_traits: the name of the synced trait of each control, e.g. 'value' or 'index'
+    domains: the list of the values of the trait of each control
+    output: the output widget
+    outputs: the outputs for each combination of the values of the controls,
+        where the values of the last control vary the fastest
+    """
+
+    _model_name = Unicode('PrecomputedOutputsModel').tag(sync=True)
+    controls = TypedTuple(trait=Instance(Widget), help="The control widgets").tag(sync=True, **widget_serialization)
+    control_traits = TypedTuple(trait=Unicode(), help="The synced trait of each control").tag(sync=True)
+    domains = TypedTuple(trait=List(), help="The values of the trait of each control").tag(sync=True)
+    output = Instance(Output, allow_none=True, help="The output widget").tag(sync=True, **widget_serialization)
+    outputs = TypedTuple(trait=List(), help="The outputs for each combination of values").tag(sync=True)
+
+    def lookup(self):
+        """Return the outputs for the current values of the controls, or None."""
+        index = 0
+        for control, trait, domain in zip(self.controls, self.control_traits, self.domains):
+            value = getattr(control, trait)
+            for position, candidate in enumerate(domain):
+                if candidate == value or (
+                        isinstance(value, float) and math.isclose(candidate, value)):
+                    break
+            else:
+                return None
+            index = index * len(domain) + position
+        return self.outputs[index]
@@ -6,7 +6,8 @@
 Represents an enumeration using a widget.
 """
 
-from collections.abc import Iterable, Mapping
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
 from itertools import chain
 
 from .widget_description import DescriptionWidget, DescriptionStyle
@@ -14,7 +15,7 @@ from .valuewidget import ValueWidget
 from .widget_core import CoreWidget
 from .widget_style import Style
 from .trait_types import InstanceDict, TypedTuple
-from .widget import register, widget_serialization
+from .widget import Widget, register, widget_serialization, _call_soon
 from .widget_int import SliderStyle
 from .docutils import doc_subst
 from traitlets import (Unicode, Bool, Int, Any, Dict, TraitError, CaselessStrEnum,
@@ -28,6 +29,8 @@ _doc_snippets['selection_params'] = """
         (label, value) pairs, e.g.
         ``[('Galileo', 0), ('Brahe', 1), ('Hubble', 2)]``, or a Mapping between
         labels and values, e.g., ``{'Galileo': 0, 'Brahe': 1, 'Hubble': 2}``.
+        A one dimensional NumPy array or pandas Index of values is used
+        as is, without converting its values to Python objects.
 
     index: int
         The index of the current selection.
@@ -60,6 +63,8 @@ _doc_snippets['multiple_selection_params'] = """
         labels and values, e.g., ``{'Galileo': 0, 'Brahe': 1, 'Hubble': 2}``.
         The labels are the strings that will be displayed in the UI,
         representing the actual Python choices, and should be unique.
+        A one dimensional NumPy array or pandas Index of values is used
+        as is, without converting its values to Python objects.
 
     index: iterable of int
         The indices of the options that are selected.
@@ -83,6 +88,20 @@ _doc_snippets['multiple_selection_params'] = """
         describing the widget.
 """
 
+_doc_snippets['paged_params'] = """
+    page_size: int
+        When nonzero, the option labels are left out of the widget state and
+        the frontend requests pages of this many labels as they are shown.
+        Use this for very long lists of options. Defaults to 0.
+
+    searchable: bool
+        Show a search box. The option labels are searched in the kernel, so
+        this also works with a nonzero ``page_size``. Defaults to ``False``.
+
+    search_limit: int
+        The maximum number of search results. Defaults to 20.
+"""
+
 _doc_snippets['slider_params'] = """
     orientation: str
         Either ``'horizontal'`` or ``'vertical'``. Defaults to ``horizontal``.
@@ -97,13 +116,78 @@ _doc_snippets['slider_params'] = """
 """
 
 
+def _is_array(x):
+    "Whether x is a one dimensional NumPy array, or pandas Index or Series."
+    return (type(x).__module__.partition('.')[0] in ('numpy', 'pandas')
+            and getattr(x, 'ndim', None) == 1)
+
+
 def _exhaust_iterable(x):
-    """Exhaust any non-mapping iterable into a tuple"""
-    if isinstance(x, Iterable) and not isinstance(x, Mapping):
+    """Exhaust any non-mapping iterable into a tuple, except arrays"""
+    if isinstance(x, Iterable) and not isinstance(x, Mapping) and not _is_array(x):
         return tuple(x)
     return x
 
 
+class _ArrayOptions(Sequence):
+    """The (label, value) pairs of options given as a one dimensional array.
+
+    The values stay in the array, and the labels are built in bulk.
+    """
+
+    def __init__(self, labels, values):
+        self.labels = labels
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        return (self.labels[i], self.values[i])
+
+
+def _make_array_options(x):
+    """Build the options of an array of values without a Python loop.
+
+    Returns None for arrays which need the generic code path, e.g. bytes or
+    arrays of (label, value) pairs.
+    """
+    values = x.to_numpy() if hasattr(x, 'to_numpy') else x
+    kind = values.dtype.kind
+    if kind == 'O':
+        if any(issubclass(t, (list, tuple)) for t in set(map(type, values))):
+            return None
+    elif kind not in 'biufU':
+        return None
+    return _ArrayOptions(tuple(values.astype(str).tolist()), values)
+
+
+def _split_options(options):
+    "Return the labels and the values of standardized options."
+    if isinstance(options, _ArrayOptions):
+        return options.labels, options.values
+    return tuple(i[0] for i in options), tuple(i[1] for i in options)
+
+
+def _array_find(array, value):
+    """Return the index of the first element of array equal to value.
+
+    Returns -1 if there is none, or None if the comparison cannot be
+    vectorized.
+    """
+    import numpy as np
+    if np.ndim(value) != 0:
+        return None
+    try:
+        equal = array == value
+    except Exception:
+        return None
+    if not isinstance(equal, np.ndarray) or equal.shape != array.shape:
+        return None
+    hits = np.flatnonzero(equal)
+    return int(hits[0]) if len(hits) else -1
+
+
 def _make_options(x):
     """Standardize the options tuple format.
 
@@ -113,7 +197,14 @@ def _make_options(x):
     * an iterable of (label, value) pairs
     * an iterable of values, and labels will be generated
     * a Mapping between labels and values
+
+    A one dimensional array of values is kept as is, see _ArrayOptions.
     """
+    if _is_array(x):
+        options = _make_array_options(x)
+        if options is not None:
+            return options
+
     if isinstance(x, Mapping):
         x = x.items()
 
@@ -134,6 +225,118 @@ def findvalue(array, value, compare = lambda x, y: x == y):
     except StopIteration:
         raise ValueError('%r not in array'%value)
 
+def _equals(x, y):
+    "The default ``equals`` predicate of selection widgets."
+    return x == y
+
+def _same(x, y):
+    "Identity or equality, as used by ``tuple.index``."
+    return x is y or x == y
+
+class _OptionsIndex:
+    """Positions of the option labels and values, for constant time lookups.
+
+    Values are indexed by hash when the default ``equals`` predicate is used,
+    or compared in bulk when they are an array of unhashable values or of
+    floats including NaN. Unhashable values and custom predicates fall back
+    to a linear scan.
+    """
+
+    def __init__(self, labels, values):
+        self.labels = labels
+        self.values = values
+        self.array = values if _is_array(values) else None
+        self._label_index = None
+        self._value_index = None
+        # False if the array cannot be indexed by hash.
+        self._array_index = None
+        # The position of the first unhashable value, later hits are only
+        # valid if none of the unhashable values before them match.
+        self.unhashable = len(values)
+
+    @property
+    def label_index(self):
+        if self._label_index is None:
+            # Building the dict from the end keeps the first index of duplicates.
+            n = len(self.labels)
+            self._label_index = dict(zip(reversed(self.labels), range(n - 1, -1, -1)))
+        return self._label_index
+
+    @property
+    def value_index(self):
+        if self._value_index is None:
+            n = len(self.values)
+            try:
+                self._value_index = dict(zip(reversed(self.values), range(n - 1, -1, -1)))
+            except TypeError:
+                self._value_index = {}
+                for i, value in enumerate(self.values):
+                    try:
+                        self._value_index.setdefault(value, i)
+                    except TypeError:
+                        self.unhashable = min(self.unhashable, i)
+        return self._value_index
+
+    @property
+    def array_index(self):
+        if self._array_index is None:
+            self._array_index = False
+            array = self.array
+            if array.dtype.kind == 'f':
+                import numpy as np
+                if np.isnan(array).any():
+                    # NaN keys would only match themselves by identity
+                    return False
+            values = array.tolist()
+            n = len(values)
+            try:
+                self._array_index = dict(zip(reversed(values), range(n - 1, -1, -1)))
+            except TypeError:
+                pass
+        return self._array_index
+
+    def has_label(self, label):
+        return label in self.label_index
+
+    def find_label(self, label):
+        "Return the index of the first option with the given label."
+        try:
+            return self.label_index[label]
+        except KeyError:
+            raise ValueError('%r not in options' % label) from None
+
+    def find_value(self, value, equals=_equals):
+        "Return the index of the first option value for which equals is true."
+        if (equals is _equals or equals is _same) and self.array is not None:
+            array_index = self.array_index
+            if array_index is not False:
+                try:
+                    return array_index[value]
+                except KeyError:
+                    raise ValueError('%r not in options' % value) from None
+                except TypeError:
+                    pass
+            i = _array_find(self.array, value)
+            if i == -1:
+                raise ValueError('%r not in options' % value)
+            elif i is not None:
+                return i
+        elif equals is _equals or equals is _same:
+            value_index = self.value_index
+            try:
+                i = value_index.get(value)
+            except TypeError:
+                i = None
+            else:
+                if i is None and self.unhashable == len(self.values):
+                    raise ValueError('%r not in options' % value)
+            if i is not None and i < self.unhashable and equals(self.values[i], value):
+                return i
+        for i, x in enumerate(self.values):
+            if equals(x, value):
+                return i
+        raise ValueError('%r not in options' % value)
+
 class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
     """Base class for Selection widgets
 
@@ -163,12 +366,12 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
     _options_full = None
 
     # This being read-only means that it cannot be changed by the user.
-    _options_labels = TypedTuple(trait=Unicode(), read_only=True, help="The labels for the options.").tag(sync=True)
+    _options_labels = TypedTuple(trait=Unicode(), read_only=True, help="The labels for the options.").tag(sync=True, patch=True)
 
     disabled = Bool(help="Enable or disable user changes").tag(sync=True)
 
     def __init__(self, *args, **kwargs):
-        self.equals = kwargs.pop('equals', lambda x, y: x == y)
+        self.equals = kwargs.pop('equals', _equals)
         # We have to make the basic options bookkeeping consistent
         # so we don't have errors the first time validators run
         self._initializing_traits_ = True
@@ -198,8 +401,9 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
     def _propagate_options(self, change):
         "Set the values and labels, and select the first option if we aren't initializing"
         options = self._options_full
-        self.set_trait('_options_labels', tuple(i[0] for i in options))
-        self._options_values = tuple(i[1] for i in options)
+        labels, self._options_values = _split_options(options)
+        self.set_trait('_options_labels', labels)
+        self._options_index = _OptionsIndex(self._options_labels, self._options_values)
 
         if self.index is None:
             # Do nothing, we don't want to force a selection if
@@ -239,7 +443,9 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
     def _validate_value(self, proposal):
         value = proposal.value
         try:
-            return findvalue(self._options_values, value, self.equals) if value is not None else None
+            if value is None:
+                return None
+            return self._options_values[self._options_index.find_value(value, self.equals)]
         except ValueError:
             raise TraitError('Invalid selection: value not found')
 
@@ -250,13 +456,17 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
         elif self.index is not None and self.equals(self._options_values[self.index], change.new):
             index = self.index
         else:
-            index = self._options_values.index(change.new)
+            index = self._options_index.find_value(change.new, _same)
         if self.index != index:
             self.index = index
 
     @validate('label')
     def _validate_label(self, proposal):
-        if (proposal.value is not None) and (proposal.value not in self._options_labels):
+        index, labels = self.index, self._options_labels
+        if index is not None and index < len(labels) and labels[index] == proposal.value:
+            # The label of the selected index, e.g. when propagating the index
+            return proposal.value
+        if (proposal.value is not None) and not self._options_index.has_label(proposal.value):
             raise TraitError('Invalid selection: label not found')
         return proposal.value
 
@@ -267,7 +477,7 @@ class _Selection(DescriptionWidget, ValueWidget, CoreWidget):
         elif self.index is not None and self._options_labels[self.index] == change.new:
             index = self.index
         else:
-            index = self._options_labels.index(change.new)
+            index = self._options_index.find_label(change.new)
         if self.index != index:
             self.index = index
 
@@ -309,12 +519,12 @@ class _MultipleSelection(DescriptionWidget, ValueWidget, CoreWidget):
     _options_full = None
 
     # This being read-only means that it cannot be changed from the frontend!
-    _options_labels = TypedTuple(trait=Unicode(), read_only=True, help="The labels for the options.").tag(sync=True)
+    _options_labels = TypedTuple(trait=Unicode(), read_only=True, help="The labels for the options.").tag(sync=True, patch=True)
 
     disabled = Bool(help="Enable or disable user changes").tag(sync=True)
 
     def __init__(self, *args, **kwargs):
-        self.equals = kwargs.pop('equals', lambda x, y: x == y)
+        self.equals = kwargs.pop('equals', _equals)
 
         # We have to make the basic options bookkeeping consistent
         # so we don't have errors the first time validators run
@@ -337,8 +547,9 @@ class _MultipleSelection(DescriptionWidget, ValueWidget, CoreWidget):
     def _propagate_options(self, change):
         "Unselect any option"
         options = self._options_full
-        self.set_trait('_options_labels', tuple(i[0] for i in options))
-        self._options_values = tuple(i[1] for i in options)
+        labels, self._options_values = _split_options(options)
+        self.set_trait('_options_labels', labels)
+        self._options_index = _OptionsIndex(self._options_labels, self._options_values)
         if self._initializing_traits_ is not True:
             self.index = ()
 
@@ -365,25 +576,29 @@ class _MultipleSelection(DescriptionWidget, ValueWidget, CoreWidget):
     def _validate_value(self, proposal):
         "Replace all values with the actual objects in the options list"
         try:
-            return tuple(findvalue(self._options_values, i, self.equals) for i in proposal.value)
+            find_value = self._options_index.find_value
+            values = self._options_values
+            return tuple(values[find_value(i, self.equals)] for i in proposal.value)
         except ValueError:
             raise TraitError('Invalid selection: value not found')
 
     @observe('value')
     def _propagate_value(self, change):
-        index = tuple(self._options_values.index(i) for i in change.new)
+        find_value = self._options_index.find_value
+        index = tuple(find_value(i, _same) for i in change.new)
         if self.index != index:
             self.index = index
 
     @validate('label')
     def _validate_label(self, proposal):
-        if any(i not in self._options_labels for i in proposal.value):
+        if not all(self._options_index.has_label(i) for i in proposal.value):
             raise TraitError('Invalid selection: label not found')
         return proposal.value
 
     @observe('label')
     def _propagate_label(self, change):
-        index = tuple(self._options_labels.index(i) for i in change.new)
+        find_label = self._options_index.find_label
+        index = tuple(find_label(i) for i in change.new)
         if self.index != index:
             self.index = index
 
@@ -393,6 +608,119 @@ class _MultipleSelection(DescriptionWidget, ValueWidget, CoreWidget):
         yield from sorted(chain(keys, ('options',)))
 
 
+def _labels_to_json(labels, widget):
+    "Leave out the labels of a paged selection widget."
+    return () if widget.page_size else labels
+
+
+class _LabelSearch:
+    """Case insensitive typeahead search over option labels.
+
+    Prefix matches are found by bisecting the sorted labels and come first,
+    the remaining results are substring matches in option order.
+    """
+
+    def __init__(self, labels):
+        self.folded = [label.casefold() for label in labels]
+        self.order = sorted(range(len(labels)), key=self.folded.__getitem__)
+        self.sorted = [self.folded[i] for i in self.order]
+
+    def search(self, query, limit):
+        "Return the indices of at most limit options matching query."
+        query = query.casefold()
+        results = []
+        for pos in range(bisect_left(self.sorted, query), len(self.sorted)):
+            if len(results) >= limit or not self.sorted[pos].startswith(query):
+                break
+            results.append(self.order[pos])
+        if len(results) < limit:
+            found = set(results)
+            for i, label in enumerate(self.folded):
+                if query in label and i not in found:
+                    results.append(i)
+                    if len(results) >= limit:
+                        break
+        return results
+
+
+class _PagedSelection(Widget):
+    """Mixin for selection widgets which can send their labels on demand.
+
+    When ``page_size`` is nonzero, ``_options_labels`` is not synced and the
+    frontend requests windows of labels with ``request_labels`` messages.
+    The labels can also be searched with ``search`` messages.
+    """
+
+    page_size = Int(0, min=0, help="The number of labels sent at a time, or 0 to sync all of them.").tag(sync=True)
+    searchable = Bool(False, help="Show a search box for the options.").tag(sync=True)
+    search_limit = Int(20, min=1, help="The maximum number of search results.")
+
+    _label_search = None
+    _pending_search = None
+
+    _options_labels = TypedTuple(trait=Unicode(), read_only=True, help="The labels for the options.").tag(
+        sync=True, patch=True, to_json=_labels_to_json)
+    _options_length = Int(0, read_only=True, help="The number of options.").tag(sync=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_msg(self._handle_labels_msg)
+
+    @observe('_options_labels')
+    def _labels_changed(self, change):
+        self.set_trait('_options_length', len(change.new))
+        self._label_search = None
+        if self.page_size:
+            # Replace the labels cached by the frontend
+            self._send_labels(0, self.page_size, reset=True)
+
+    @observe('page_size')
+    def _page_size_changed(self, change):
+        if bool(change.old) != bool(change.new):
+            self.send_state('_options_labels')
+
+    def _send_labels(self, offset, limit, reset=False):
+        labels = self._options_labels[offset:offset + limit]
+        self.send({'event': 'labels', 'offset': offset, 'labels': list(labels), 'reset': reset})
+
+    def _handle_labels_msg(self, _, content, buffers):
+        """Handle a msg from the front-end.
+
+        Parameters
+        ----------
+        content: dict
+            Content of the msg.
+        """
+        if content.get('event', '') == 'request_labels':
+            offset = max(int(content.get('offset', 0)), 0)
+            limit = max(int(content.get('limit', self.page_size)), 0)
+            self._send_labels(offset, limit)
+        elif content.get('event', '') == 'search':
+            # Only the latest of the queries received before the next event
+            # loop iteration is answered, the frontend drops stale results.
+            scheduled = self._pending_search is not None
+            self._pending_search = content
+            if not scheduled:
+                _call_soon(self._run_search)
+
+    def search(self, query):
+        """Return the indices of the options whose label matches query.
+
+        Labels starting with query come first, followed by the labels
+        containing it, up to ``search_limit`` results.
+        """
+        if self._label_search is None:
+            self._label_search = _LabelSearch(self._options_labels)
+        return self._label_search.search(query, self.search_limit)
+
+    def _run_search(self):
+        content, self._pending_search = self._pending_search, None
+        indices = self.search(str(content.get('query', '')))
+        labels = [self._options_labels[i] for i in indices]
+        self.send({'event': 'search_results', 'id': content.get('id'),
+                   'indices': indices, 'labels': labels})
+
+
 @register
 class ToggleButtonsStyle(DescriptionStyle, CoreWidget):
     """Button style widget.
@@ -453,12 +781,14 @@ class ToggleButtons(_Selection):
 
 @register
 @doc_subst(_doc_snippets)
-class Dropdown(_Selection):
+class Dropdown(_PagedSelection, _Selection):
     """Allows you to select a single item from a dropdown.
 
     Parameters
     ----------
     {selection_params}
+
+    {paged_params}
     """
     _view_name = Unicode('DropdownView').tag(sync=True)
     _model_name = Unicode('DropdownModel').tag(sync=True)
@@ -485,7 +815,7 @@ class RadioButtons(_Selection):
 
 @register
 @doc_subst(_doc_snippets)
-class Select(_Selection):
+class Select(_PagedSelection, _Selection):
     """
     Listbox that only allows one item to be selected at any given time.
 
@@ -493,6 +823,8 @@ class Select(_Selection):
     ----------
     {selection_params}
 
+    {paged_params}
+
     rows: int
         The number of rows to display in the widget.
     """
@@ -502,7 +834,7 @@ class Select(_Selection):
 
 @register
 @doc_subst(_doc_snippets)
-class SelectMultiple(_MultipleSelection):
+class SelectMultiple(_PagedSelection, _MultipleSelection):
     """
     Listbox that allows many items to be selected at any given time.
 
@@ -512,6 +844,8 @@ class SelectMultiple(_MultipleSelection):
     ----------
     {multiple_selection_params}
 
+    {paged_params}
+
     rows: int
         The number of rows to display in the widget.
     """
@@ -618,8 +952,9 @@ class SelectionRangeSlider(_MultipleSelectionNonempty):
     def _propagate_options(self, change):
         "Select the first range"
         options = self._options_full
-        self.set_trait('_options_labels', tuple(i[0] for i in options))
-        self._options_values = tuple(i[1] for i in options)
+        labels, self._options_values = _split_options(options)
+        self.set_trait('_options_labels', labels)
+        self._options_index = _OptionsIndex(self._options_labels, self._options_values)
         if self._initializing_traits_ is not True:
             self.index = (0, 0)
 
@@ -4,10 +4,10 @@
 """Contains the Style class"""
 
 from traitlets import Unicode
-from .widget import Widget
+from .widget import SharedWidget
 from .._version import __jupyter_widgets_base_version__
 
-class Style(Widget):
+class Style(SharedWidget):
     """Style specification"""
 
     _model_name = Unicode('StyleModel').tag(sync=True)
@@ -47,7 +47,7 @@ class TagsInput(TagsInputBase):
     _model_name = Unicode('TagsInputModel').tag(sync=True)
     _view_name = Unicode('TagsInputView').tag(sync=True)
 
-    value = List(Unicode(), help='List of string tags').tag(sync=True)
+    value = List(Unicode(), help='List of string tags').tag(sync=True, patch=True)
     tag_style = CaselessStrEnum(
         values=['primary', 'success', 'info', 'warning', 'danger', ''], default_value='',
         help="""Use a predefined styling for the tags.""").tag(sync=True)
@@ -61,7 +61,7 @@ class ColorsInput(TagsInputBase):
     _model_name = Unicode('ColorsInputModel').tag(sync=True)
     _view_name = Unicode('ColorsInputView').tag(sync=True)
 
-    value = List(Color(), help='List of string tags').tag(sync=True)
+    value = List(Color(), help='List of string tags').tag(sync=True, patch=True)
 
 
 class NumbersInputBase(TagsInput):
@@ -88,7 +88,7 @@ class FloatsInput(NumbersInputBase):
     _model_name = Unicode('FloatsInputModel').tag(sync=True)
     _view_name = Unicode('FloatsInputView').tag(sync=True)
 
-    value = List(CFloat(), help='List of float tags').tag(sync=True)
+    value = List(CFloat(), help='List of float tags').tag(sync=True, patch=True)
     format = NumberFormat('.1f').tag(sync=True)
 
 
@@ -100,7 +100,7 @@ class IntsInput(NumbersInputBase):
     _model_name = Unicode('IntsInputModel').tag(sync=True)
     _view_name = Unicode('IntsInputView').tag(sync=True)
 
-    value = List(CInt(), help='List of int tags').tag(sync=True)
+    value = List(CInt(), help='List of int tags').tag(sync=True, patch=True)
     format = NumberFormat('d').tag(sync=True)
     min = CInt(default_value=None, allow_none=True).tag(sync=True)
     max = CInt(default_value=None, allow_none=True).tag(sync=True)
@@ -5,10 +5,16 @@
 
 Represents a file upload button.
 """
+import atexit
+import collections
 import datetime as dt
+import hashlib
+import io
+import os
+import tempfile
 
 from traitlets import (
-    observe, default, Unicode, Dict, Int, Bool, Bytes, CaselessStrEnum
+    observe, default, Unicode, Dict, Int, Bool, Bytes, CaselessStrEnum, Float
 )
 
 from .widget_description import DescriptionWidget
@@ -20,25 +26,200 @@ from .trait_types import InstanceDict, TypedTuple
 from traitlets import Bunch
 
 
-def _deserialize_single_file(js):
+# Uploaded files bigger than this are written to disk by chunked uploads
+_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# The total size of the recent uploads kept by the kernel
+_UPLOAD_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+
+def _upload_digest(chunk_hashes, chunk_size):
+    """The digest identifying the content of an upload.
+
+    This is the SHA-256 hash of the SHA-256 hashes of the chunks of the
+    content, which the front-end computes without reading whole files into
+    memory, prefixed with the size of the chunks.
+    """
+    return '%d:%s' % (chunk_size, hashlib.sha256(b''.join(chunk_hashes)).hexdigest())
+
+
+def _content_digest(content, chunk_size):
+    content = memoryview(content).cast('B')
+    chunk_hashes = [hashlib.sha256(content[offset:offset + chunk_size]).digest()
+                    for offset in range(0, len(content), chunk_size)]
+    return _upload_digest(chunk_hashes, chunk_size)
+
+
+class _UploadContent:
+    """The content of an uploaded file.
+
+    Small files are kept in memory and big ones in a temporary file, which is
+    deleted by `delete`. The temporary file of a content which is not cached
+    has no name: `open` hands it over, and it is removed once closed.
+    """
+
+    def __init__(self, size, data=None, cached=True):
+        self.size = size
+        self.data = data
+        self.cached = cached
+        self.path = None
+        self._file = None
+        self._chunk_hashes = []
+        if data is not None:
+            return
+        if size <= _SPOOL_MAX_SIZE:
+            self._file = io.BytesIO()
+        elif cached:
+            fd, self.path = tempfile.mkstemp(prefix='ipywidgets-upload-')
+            self._file = os.fdopen(fd, 'wb')
+        else:
+            self._file = tempfile.TemporaryFile(prefix='ipywidgets-upload-')
+
+    def tell(self):
+        return self._file.tell()
+
+    def write(self, chunk):
+        self._chunk_hashes.append(hashlib.sha256(chunk).digest())
+        return self._file.write(chunk)
+
+    def finish(self, chunk_size):
+        """Finish writing the content and return its digest."""
+        if isinstance(self._file, io.BytesIO):
+            self.data = self._file.getvalue()
+            self._file.close()
+            self._file = None
+        elif self.path is not None:
+            self._file.close()
+            self._file = None
+        return _upload_digest(self._chunk_hashes, chunk_size)
+
+    def open(self):
+        """Open the content for reading."""
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        if self.path is None:
+            # The caller owns the unnamed temporary file
+            file, self._file = self._file, None
+            file.seek(0)
+            return file
+        return open(self.path, 'rb')
+
+    def read(self):
+        if self.data is not None:
+            return memoryview(self.data)
+        with self.open() as f:
+            return memoryview(f.read())
+
+    def delete(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class _UploadCache:
+    """A bounded, content-addressed cache of the recent uploads.
+
+    The least recently used contents are evicted when the total size goes
+    over `max_size`, except for the most recent one.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._contents = collections.OrderedDict()
+
+    def __contains__(self, digest):
+        return digest in self._contents
+
+    def get(self, digest):
+        content = self._contents.get(digest)
+        if content is not None:
+            self._contents.move_to_end(digest)
+        return content
+
+    def add(self, digest, content):
+        """Add a content to the cache and return the cached content."""
+        if digest in self._contents:
+            # The same content was uploaded again without being deduplicated
+            self._contents.move_to_end(digest)
+            if self._contents[digest] is not content:
+                content.delete()
+            return self._contents[digest]
+        self._contents[digest] = content
+        self.size += content.size
+        while self.size > self.max_size and len(self._contents) > 1:
+            _, evicted = self._contents.popitem(last=False)
+            self.size -= evicted.size
+            evicted.delete()
+        return content
+
+    def clear(self):
+        for content in self._contents.values():
+            content.delete()
+        self._contents.clear()
+        self.size = 0
+
+
+_upload_cache = _UploadCache(_UPLOAD_CACHE_MAX_SIZE)
+atexit.register(_upload_cache.clear)
+
+
+class _UploadEvicted(ValueError):
+    """The content of an uploaded file is no longer cached by the kernel."""
+
+    def __init__(self, name, digest):
+        super().__init__('The content of %r is no longer cached' % name)
+        self.digest = digest
+
+
+def _deserialize_single_file(js, widget):
     uploaded_file = Bunch()
-    for attribute in ['name', 'type', 'size', 'content']:
+    for attribute in ['name', 'type', 'size']:
         uploaded_file[attribute] = js[attribute]
-    uploaded_file['last_modified'] = dt.datetime.fromtimestamp(
+    if 'content' in js:
+        uploaded_file['content'] = js['content']
+        if widget.dedupe:
+            content = js['content']
+            _upload_cache.add(_content_digest(content, widget.chunk_size),
+                              _UploadContent(memoryview(content).nbytes, content))
+    else:
+        # The front-end found the content in the cache of the kernel
+        cached = _upload_cache.get(js['digest'])
+        if cached is None:
+            # Evicted since the lookup, the front-end has to send it
+            raise _UploadEvicted(js['name'], js['digest'])
+        uploaded_file['content'] = cached.read()
+        uploaded_file['digest'] = js['digest']
+    uploaded_file['last_modified'] = _deserialize_last_modified(js)
+    return uploaded_file
+
+
+def _deserialize_last_modified(js):
+    return dt.datetime.fromtimestamp(
         js['last_modified'] / 1000,
         tz=dt.timezone.utc
     )
-    return uploaded_file
 
 
-def _deserialize_value(js, _):
-    return [_deserialize_single_file(entry) for entry in js]
+def _deserialize_value(js, widget):
+    return [_deserialize_single_file(entry, widget) for entry in js]
 
 
 def _serialize_single_file(uploaded_file):
     js = {}
     for attribute in ['name', 'type', 'size', 'content']:
-        js[attribute] = uploaded_file[attribute]
+        # Files uploaded in chunks have a file instead of a content
+        if attribute in uploaded_file:
+            js[attribute] = uploaded_file[attribute]
+    if 'digest' in uploaded_file:
+        # The front-end did not send a content it knows the kernel holds
+        js.pop('content', None)
+        js['digest'] = uploaded_file['digest']
     js['last_modified'] = int(uploaded_file['last_modified'].timestamp() * 1000)
     return js
 
@@ -119,6 +300,28 @@ class FileUpload(DescriptionWidget, ValueWidget, CoreWidget):
 
     error: str, optional
         Whether the last upload triggered an error.
+
+    chunked: bool, optional
+        Whether to upload the files in chunks of `chunk_size` bytes, instead
+        of sending them in a single message. The files are then kept in
+        memory, or written to temporary files when they are big, and each
+        entry of the value has a `file` attribute holding the file object,
+        opened for reading, instead of a `content` attribute. Its `path`
+        attribute is the path of the temporary file while the kernel keeps
+        it in its cache of recent uploads, or None. The `progress` attribute
+        gives the fraction of the files received by the kernel during an
+        upload. Defaults to False.
+
+    chunk_size: int, optional
+        The size of the chunks of chunked uploads. Defaults to 1 MiB.
+
+    dedupe: bool, optional
+        Whether to skip sending files whose content the kernel already holds.
+        The front-end hashes the files and asks the kernel whether a recent
+        upload had the same content, in which case the entry of the value
+        reuses it and has a `digest` attribute. The kernel then keeps the
+        contents of the recent uploads of such widgets, up to 1 GiB in total.
+        Defaults to False.
     """
     _model_name = Unicode('FileUploadModel').tag(sync=True)
     _view_name = Unicode('FileUploadView').tag(sync=True)
@@ -134,6 +337,105 @@ class FileUpload(DescriptionWidget, ValueWidget, CoreWidget):
     error = Unicode(help='Error message').tag(sync=True)
     value = TypedTuple(Dict(), help='The file upload value').tag(
         sync=True, echo_update=False, **_value_serialization)
+    chunked = Bool(False, help='If True, upload the files in chunks').tag(sync=True)
+    chunk_size = Int(1024 * 1024, min=1, help='The size in bytes of the chunks of chunked uploads').tag(sync=True)
+    dedupe = Bool(False, help='If True, do not send files the kernel already holds').tag(sync=True)
+    progress = Float(0, read_only=True, help='The fraction of the files received by the current chunked upload')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._uploads = {}
+        self.on_msg(self._handle_upload_msg)
+
+    def set_state(self, sync_data):
+        try:
+            super().set_state(sync_data)
+        except _UploadEvicted as e:
+            # The front-end uploads the files again with their contents
+            self.error = str(e)
+            self.send({'event': 'upload_error', 'digest': e.digest, 'message': str(e)})
+
+    def _handle_upload_msg(self, _, content, buffers):
+        """Handle a msg from the front-end.
+
+        Parameters
+        ----------
+        content: dict
+            Content of the msg.
+        """
+        event = content.get('event', '')
+        if event == 'lookup':
+            self.send({'event': 'lookup_result',
+                       'known': [digest in _upload_cache for digest in content['digests']]})
+        elif event == 'upload_start':
+            self._start_upload(content['files'])
+        elif event == 'upload_chunk':
+            self._receive_chunk(content['id'], content['offset'], buffers[0])
+        elif event == 'upload_end':
+            self._end_upload()
+
+    def _start_upload(self, files):
+        self._close_uploads()
+        self._upload_total = 0
+        for js in files:
+            if 'digest' in js:
+                # The front-end found the content in the cache
+                content = _upload_cache.get(js['digest'])
+                if content is None:
+                    self._close_uploads()
+                    self.send({'event': 'upload_error', 'id': js['id'],
+                               'message': 'The content of %r is no longer cached' % js['name']})
+                    return
+                # Open it now, in case it is evicted before the upload ends
+                file = content.open()
+            else:
+                content = _UploadContent(js['size'], cached=self.dedupe)
+                file = None
+                self._upload_total += js['size']
+            self._uploads[js['id']] = (js, content, file)
+        self._upload_received = 0
+        self.set_trait('progress', 0.0 if self._upload_total else 1.0)
+
+    def _receive_chunk(self, upload_id, offset, chunk):
+        js, content, file = self._uploads.get(upload_id, (None, None, None))
+        if content is None or file is not None or content.tell() != offset:
+            self._close_uploads()
+            self.send({'event': 'upload_error', 'id': upload_id,
+                       'message': 'Unexpected chunk at offset %d' % offset})
+            return
+        self._upload_received += content.write(chunk)
+        self.set_trait('progress', self._upload_received / self._upload_total)
+        self.send({'event': 'upload_ack', 'id': upload_id,
+                   'received': content.tell()})
+
+    def _end_upload(self):
+        if not self._uploads:
+            # The upload failed
+            return
+        value = []
+        for js, content, file in self._uploads.values():
+            if file is None:
+                digest = content.finish(self.chunk_size)
+                if content.cached:
+                    content = _upload_cache.add(digest, content)
+                file = content.open()
+            uploaded_file = Bunch(name=js['name'], type=js['type'], size=js['size'],
+                                  last_modified=_deserialize_last_modified(js),
+                                  file=file, path=content.path)
+            if 'digest' in js:
+                uploaded_file['digest'] = js['digest']
+            value.append(uploaded_file)
+        self._uploads = {}
+        self.value = value
+
+    def _close_uploads(self):
+        """Discard the files of an unfinished upload."""
+        for js, content, file in self._uploads.values():
+            if file is None:
+                content.delete()
+            else:
+                file.close()
+        self._uploads = {}
 
     @default('description')
     def _default_description(self):
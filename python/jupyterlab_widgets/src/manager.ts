@@ -14,6 +14,7 @@ import {
 
 import {
   ManagerBase,
+  CONTROL_COMM_TARGET,
   serialize_state,
   IStateOptions,
 } from '@jupyter-widgets/base-manager';
@@ -81,10 +82,18 @@ export abstract class LabWidgetManager
   }: Session.ISessionConnection.IKernelChangedArgs): void {
     if (oldValue) {
       oldValue.removeCommTarget(this.comm_target_name, this._handleCommOpen);
+      oldValue.removeCommTarget(
+        CONTROL_COMM_TARGET,
+        this._handleControlCommOpen
+      );
     }
 
     if (newValue) {
       newValue.registerCommTarget(this.comm_target_name, this._handleCommOpen);
+      newValue.registerCommTarget(
+        CONTROL_COMM_TARGET,
+        this._handleControlCommOpen
+      );
     }
   }
 
@@ -315,6 +324,13 @@ export abstract class LabWidgetManager
     await this.handle_comm_open(oldComm, msg);
   };
 
+  protected _handleControlCommOpen = (
+    comm: Kernel.IComm,
+    msg: KernelMessage.ICommOpenMsg
+  ): void => {
+    this.handle_control_comm_open(new shims.services.Comm(comm), msg);
+  };
+
   protected _restored = new Signal<this, void>(this);
   protected _restoredStatus = false;
   protected _kernelRestoreInProgress = false;
@@ -5,7 +5,7 @@ import * as outputBase from '@jupyter-widgets/output';
 
 import { JupyterLuminoPanelWidget } from '@jupyter-widgets/base';
 
-import { Panel } from '@lumino/widgets';
+import { Panel, Widget } from '@lumino/widgets';
 
 import { LabWidgetManager, WidgetManager } from './manager';
 
@@ -19,6 +19,11 @@ import $ from 'jquery';
 
 export const OUTPUT_WIDGET_VERSION = outputBase.OUTPUT_WIDGET_VERSION;
 
+/**
+ * The number of spilled outputs loaded at a time.
+ */
+const SPILLED_PAGE_SIZE = 20;
+
 export class OutputModel extends outputBase.OutputModel {
   defaults(): Backbone.ObjectHash {
     return { ...super.defaults(), msg_id: '', outputs: [] };
@@ -109,7 +114,20 @@ export class OutputModel extends outputBase.OutputModel {
   }
 
   setOutputs(model?: any, value?: any, options?: any): void {
-    if (!(options && options.newMessage)) {
+    if (options && options.newMessage) {
+      return;
+    }
+    const previous = this.previous('outputs');
+    const added =
+      model && previous && previous.length === this._outputs.length
+        ? outputBase.appendedOutputs(previous, value)
+        : null;
+    if (added) {
+      // Only render the new outputs, e.g. text appended to a stream
+      for (const output of added) {
+        this._outputs.add(JSON.parse(JSON.stringify(output)));
+      }
+    } else {
       // fromJSON does not clear the existing output
       this.clear_output();
       // fromJSON does not copy the message, so we make a deep copy
@@ -155,17 +173,75 @@ export class OutputView extends outputBase.OutputView {
     // this._outputView.trusted = true;
     this.luminoWidget.insertWidget(0, this._outputView);
 
+    // Outputs evicted to the kernel spill file are shown on demand
+    this._spilledOutputs = new OutputAreaModel({ trusted: true });
+    this._spilledView = new OutputArea({
+      rendermime: this.model.widget_manager.rendermime,
+      contentFactory: OutputArea.defaultContentFactory,
+      model: this._spilledOutputs,
+    });
+    const button = document.createElement('button');
+    button.className = 'jupyter-button widget-button';
+    button.addEventListener('click', () => this._loadSpilled());
+    this._spilledButton = new Widget({ node: button });
+    this.luminoWidget.insertWidget(0, this._spilledView);
+    this.luminoWidget.insertWidget(0, this._spilledButton);
+    this._loaded = [];
+    this._loadedEnd = 0;
+    this.listenTo(this.model, 'change:_spilled_count', this._updateSpilled);
+    this._updateSpilled();
+
     this.luminoWidget.addClass('jupyter-widgets');
     this.luminoWidget.addClass('widget-output');
     this.update(); // Set defaults.
   }
 
+  /**
+   * Update the button showing the spilled outputs which are not loaded.
+   */
+  _updateSpilled(): void {
+    const count: number = this.model.get('_spilled_count');
+    if (this._loaded.length > 0 && count !== this._loadedEnd) {
+      // More outputs were evicted since the spilled outputs were loaded
+      this._loaded = [];
+      this._spilledOutputs.clear();
+    }
+    const hidden = count - this._loaded.length;
+    this._spilledButton.node.textContent = `Show ${hidden} earlier output${
+      hidden === 1 ? '' : 's'
+    }`;
+    this._spilledButton.setHidden(hidden <= 0);
+  }
+
+  /**
+   * Load the previous page of spilled outputs.
+   */
+  async _loadSpilled(): Promise<void> {
+    const end = this.model.get('_spilled_count') - this._loaded.length;
+    const offset = Math.max(end - SPILLED_PAGE_SIZE, 0);
+    const outputs = await this.model.requestSpilled(offset, end - offset);
+    if (end !== this.model.get('_spilled_count') - this._loaded.length) {
+      return;
+    }
+    this._loaded = outputs.concat(this._loaded);
+    this._loadedEnd = this.model.get('_spilled_count');
+    this._spilledOutputs.clear();
+    this._spilledOutputs.fromJSON(JSON.parse(JSON.stringify(this._loaded)));
+    this._updateSpilled();
+  }
+
   remove(): any {
     this._outputView.dispose();
+    this._spilledView.dispose();
     return super.remove();
   }
 
   model: OutputModel;
   _outputView: OutputArea;
   luminoWidget: Panel;
+  private _spilledOutputs: OutputAreaModel;
+  private _spilledView: OutputArea;
+  private _spilledButton: Widget;
+  private _loaded: nbformat.IOutput[];
+  private _loadedEnd: number;
 }
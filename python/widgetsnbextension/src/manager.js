@@ -3,7 +3,8 @@
 'use strict';
 
 var base = require('@jupyter-widgets/base');
-var ManagerBase = require('@jupyter-widgets/base-manager').ManagerBase;
+var base_manager = require('@jupyter-widgets/base-manager');
+var ManagerBase = base_manager.ManagerBase;
 var widgets = require('@jupyter-widgets/controls');
 var outputWidgets = require('./widget_output');
 var saveState = require('./save_state');
@@ -98,6 +99,10 @@ export class WidgetManager extends ManagerBase {
       this.comm_target_name,
       this.handle_comm_open.bind(this)
     );
+    this.comm_manager.register_target(
+      base_manager.CONTROL_COMM_TARGET,
+      this.handle_control_comm_open.bind(this)
+    );
 
     var that = this;
 
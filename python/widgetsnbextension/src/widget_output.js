@@ -105,7 +105,20 @@ export class OutputModel extends outputBase.OutputModel {
   }
 
   setOutputs(model, value, options) {
-    if (!(options && options.newMessage)) {
+    if (options && options.newMessage) {
+      return;
+    }
+    var previous = this.previous('outputs');
+    var added =
+      model && previous && previous.length === this.output_area.outputs.length
+        ? outputBase.appendedOutputs(previous, value)
+        : null;
+    if (added) {
+      // Only render the new outputs, e.g. text appended to a stream
+      for (var i = 0; i < added.length; i++) {
+        this.output_area.append_output(JSON.parse(JSON.stringify(added[i])));
+      }
+    } else {
       // fromJSON does not clear the existing output
       this.output_area.clear_output();
       // fromJSON does not copy the message, so we make a deep copy
@@ -153,7 +166,20 @@ export class OutputView extends outputBase.OutputView {
   }
 
   setOutputs(model, value, options) {
-    if (!(options && options.newMessage)) {
+    if (options && options.newMessage) {
+      return;
+    }
+    var previous = this.model.previous('outputs');
+    var added =
+      model && previous && previous.length === this.output_area.outputs.length
+        ? outputBase.appendedOutputs(previous, value)
+        : null;
+    if (added) {
+      // Only render the new outputs, e.g. text appended to a stream
+      for (var i = 0; i < added.length; i++) {
+        this.output_area.append_output(JSON.parse(JSON.stringify(added[i])));
+      }
+    } else {
       // fromJSON does not clear the existing output
       this.output_area.clear_output();
       // fromJSON does not copy the message, so we make a deep copy